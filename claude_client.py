@@ -5,23 +5,40 @@ Supports both direct Anthropic API and Google Cloud Vertex AI.
 """
 
 import os
-import base64
+import asyncio
 import json
-from io import BytesIO
-from pathlib import Path
-from typing import Optional, Dict, Any, Union
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple, Union
 
-from anthropic import Anthropic, AnthropicVertex
-from PIL import Image
+from anthropic import Anthropic, AnthropicVertex, AsyncAnthropic, AsyncAnthropicVertex
 from dotenv import load_dotenv
 
+from image_prep import prepare_image, prepare_image_async
+from vision_prompts import (
+    FACIAL_DESCRIPTION_PROMPT, DETECT_FACES_PROMPT, DETECT_FACES_BATCH_PROMPT,
+    build_comparison_prompt, build_batch_comparison_prompt,
+    parse_similarity, parse_batch_scores, split_batch_detection,
+)
+
+# Prefer the SIMD-accelerated encoder when available
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 # Load environment variables
 load_dotenv()
+USE_VERTEX_AI = os.getenv('USE_VERTEX_AI', 'false').lower() == 'true'
 
 # Constants
-MAX_IMAGE_SIZE_MB = 5.0
-MAX_IMAGE_DIMENSION = 8000
-SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic'}
+MAX_CONCURRENT_REQUESTS = 16
+MAX_OUTPUT_TOKENS_PER_IMAGE = 2048
+MAX_OUTPUT_TOKENS = 8192
+COMPARISON_BATCH_SIZE = 10
+CONFIG_FILE = 'config.json'
+
+# (mtime_ns, parsed config) of the last config.json read
+_config_cache: Optional[tuple] = None
 
 # Available Claude models for Anthropic API
 ANTHROPIC_MODELS = {
@@ -49,16 +66,46 @@ VERTEX_MODELS = {
 }
 
 
+def load_config() -> Optional[Dict[str, Any]]:
+    """
+    Load config.json, re-parsing it only when its modification time changes.
+
+    Returns:
+        Parsed config dictionary, or None if the file is missing or invalid
+    """
+    global _config_cache
+
+    try:
+        mtime_ns = os.stat(CONFIG_FILE).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+
+    if _config_cache is not None and _config_cache[0] == mtime_ns:
+        return _config_cache[1]
+
+    config = None
+    if mtime_ns is not None:
+        try:
+            with open(CONFIG_FILE, 'r') as f:
+                config = json.load(f)
+        except (OSError, ValueError):
+            config = None
+
+    _config_cache = (mtime_ns, config)
+    return config
+
+
+@lru_cache(maxsize=1)
 def get_model_name() -> str:
     """
     Get the Claude model to use from environment or config.
     Returns appropriate model identifier based on authentication method.
+    The result is cached for the lifetime of the process.
 
     Returns:
         Model identifier string
     """
-    # Check if using Vertex AI
-    use_vertex = os.getenv('USE_VERTEX_AI', 'false').lower() == 'true'
+    use_vertex = USE_VERTEX_AI
     model_map = VERTEX_MODELS if use_vertex else ANTHROPIC_MODELS
 
     # Check environment variable first
@@ -76,22 +123,18 @@ def get_model_name() -> str:
         return model_env
 
     # Try loading from config.json
-    try:
-        if os.path.exists('config.json'):
-            with open('config.json', 'r') as f:
-                config = json.load(f)
-                model_config = config.get('model', 'sonnet-3.5')
-
-                # If it's a short name, resolve it
-                if model_config in model_map:
-                    resolved_model = model_map[model_config]
-                    # Warn if using fallback on Vertex AI
-                    if use_vertex and model_config in ['sonnet-4.5', 'opus-4.5', 'sonnet-3.7', 'opus-3.5']:
-                        print(f"Note: {model_config} not yet available on Vertex AI. Using {resolved_model} instead.")
-                    return resolved_model
-                return model_config
-    except Exception:
-        pass
+    config = load_config()
+    if config is not None:
+        model_config = config.get('model', 'sonnet-3.5')
+
+        # If it's a short name, resolve it
+        if model_config in model_map:
+            resolved_model = model_map[model_config]
+            # Warn if using fallback on Vertex AI
+            if use_vertex and model_config in ['sonnet-4.5', 'opus-4.5', 'sonnet-3.7', 'opus-3.5']:
+                print(f"Note: {model_config} not yet available on Vertex AI. Using {resolved_model} instead.")
+            return resolved_model
+        return model_config
 
     # Default model based on auth method
     if use_vertex:
@@ -100,19 +143,20 @@ def get_model_name() -> str:
         return 'claude-sonnet-4-5-20250929'
 
 
-def get_claude_client() -> Union[Anthropic, AnthropicVertex]:
+@lru_cache(maxsize=1)
+def _client_kwargs() -> tuple[bool, Dict[str, Any]]:
     """
-    Initialize and return Claude client from environment.
-    Supports both Anthropic API and Vertex AI based on configuration.
+    Resolve authentication settings for the Claude client from environment.
+    The result is cached, so the settings are read and reported once per
+    process however many clients are created.
 
     Returns:
-        Anthropic or AnthropicVertex: Initialized client
+        Tuple of (use_vertex, client keyword arguments)
 
     Raises:
         ValueError: If required credentials not found in environment
     """
-    # Check if using Vertex AI
-    use_vertex = os.getenv('USE_VERTEX_AI', 'false').lower() == 'true'
+    use_vertex = USE_VERTEX_AI
 
     if use_vertex:
         # Vertex AI configuration
@@ -127,10 +171,7 @@ def get_claude_client() -> Union[Anthropic, AnthropicVertex]:
 
         print(f"Using Vertex AI authentication (Project: {project_id}, Region: {region})")
 
-        return AnthropicVertex(
-            project_id=project_id,
-            region=region
-        )
+        return True, {'project_id': project_id, 'region': region}
     else:
         # Direct Anthropic API
         api_key = os.getenv('ANTHROPIC_API_KEY')
@@ -141,7 +182,41 @@ def get_claude_client() -> Union[Anthropic, AnthropicVertex]:
                 "to use Vertex AI authentication."
             )
 
-        return Anthropic(api_key=api_key)
+        return False, {'api_key': api_key}
+
+
+@lru_cache(maxsize=1)
+def get_claude_client() -> Union[Anthropic, AnthropicVertex]:
+    """
+    Initialize and return Claude client from environment.
+    Supports both Anthropic API and Vertex AI based on configuration.
+    The client is created once and reused so its connection pool stays warm.
+
+    Returns:
+        Anthropic or AnthropicVertex: Initialized client
+
+    Raises:
+        ValueError: If required credentials not found in environment
+    """
+    use_vertex, kwargs = _client_kwargs()
+    return AnthropicVertex(**kwargs) if use_vertex else Anthropic(**kwargs)
+
+
+def get_async_claude_client() -> Union[AsyncAnthropic, AsyncAnthropicVertex]:
+    """
+    Initialize an async Claude client from environment.
+
+    Unlike get_claude_client() this is not cached: async clients are bound to
+    the event loop they are first used on, so each batch creates its own.
+
+    Returns:
+        AsyncAnthropic or AsyncAnthropicVertex: Initialized async client
+
+    Raises:
+        ValueError: If required credentials not found in environment
+    """
+    use_vertex, kwargs = _client_kwargs()
+    return AsyncAnthropicVertex(**kwargs) if use_vertex else AsyncAnthropic(**kwargs)
 
 
 def load_and_encode_image(file_path: str) -> tuple[str, str]:
@@ -158,81 +233,41 @@ def load_and_encode_image(file_path: str) -> tuple[str, str]:
         FileNotFoundError: If image file doesn't exist
         ValueError: If image format is not supported
     """
-    path = Path(file_path)
+    image_bytes, media_type = prepare_image(file_path)
+    return base64.standard_b64encode(image_bytes).decode('ascii'), media_type
 
-    if not path.exists():
-        raise FileNotFoundError(f"Image not found: {file_path}")
 
-    suffix = path.suffix.lower()
-    if suffix not in SUPPORTED_FORMATS:
-        raise ValueError(f"Unsupported image format: {suffix}")
+def _build_image_messages(encoded_image: str, media_type: str, prompt: str) -> List[Dict[str, Any]]:
+    """
+    Build the messages payload for a single-image prompt.
 
-    # Handle HEIC images
-    if suffix == '.heic':
-        try:
-            import pillow_heif
-            heif_file = pillow_heif.read_heif(file_path)
-            image = Image.frombytes(
-                heif_file.mode,
-                heif_file.size,
-                heif_file.data,
-                "raw",
-            )
-            media_type = "image/jpeg"  # Convert to JPEG
-        except ImportError:
-            raise ValueError(
-                "pillow-heif is required to process HEIC images. "
-                "Install it with: pip install pillow-heif"
-            )
-    else:
-        image = Image.open(file_path)
-        # Map file extension to media type
-        media_type_map = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp'
+    Args:
+        encoded_image: Base64-encoded image data
+        media_type: Image media type
+        prompt: Analysis prompt for Claude
+
+    Returns:
+        Messages list for client.messages.create
+    """
+    return [
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "image",
+                    "source": {
+                        "type": "base64",
+                        "media_type": media_type,
+                        "data": encoded_image,
+                    },
+                },
+                {
+                    "type": "text",
+                    "text": prompt
+                }
+            ],
         }
-        media_type = media_type_map.get(suffix, 'image/jpeg')
-
-    # Convert to RGB if necessary
-    if image.mode in ('RGBA', 'P', 'LA'):
-        rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-        if image.mode == 'P':
-            image = image.convert('RGBA')
-        rgb_image.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
-        image = rgb_image
-    elif image.mode != 'RGB':
-        image = image.convert('RGB')
-
-    # Resize if image is too large
-    width, height = image.size
-    if width > MAX_IMAGE_DIMENSION or height > MAX_IMAGE_DIMENSION:
-        # Maintain aspect ratio
-        ratio = min(MAX_IMAGE_DIMENSION / width, MAX_IMAGE_DIMENSION / height)
-        new_size = (int(width * ratio), int(height * ratio))
-        image = image.resize(new_size, Image.Resampling.LANCZOS)
-
-    # Compress to stay under size limit
-    buffer = BytesIO()
-    quality = 95
-
-    while quality > 20:
-        buffer.seek(0)
-        buffer.truncate()
-        image.save(buffer, format='JPEG', quality=quality, optimize=True)
-        size_mb = buffer.tell() / (1024 * 1024)
-
-        if size_mb <= MAX_IMAGE_SIZE_MB:
-            break
-        quality -= 10
-
-    # Encode to base64
-    buffer.seek(0)
-    encoded = base64.standard_b64encode(buffer.read()).decode('utf-8')
-
-    return encoded, media_type
+    ]
 
 
 def analyze_faces_in_image(image_path: str, prompt: str, model: Optional[str] = None) -> str:
@@ -261,25 +296,7 @@ def analyze_faces_in_image(image_path: str, prompt: str, model: Optional[str] =
         response = client.messages.create(
             model=model,
             max_tokens=2048,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": media_type,
-                                "data": encoded_image,
-                            },
-                        },
-                        {
-                            "type": "text",
-                            "text": prompt
-                        }
-                    ],
-                }
-            ],
+            messages=_build_image_messages(encoded_image, media_type, prompt),
         )
 
         return response.content[0].text
@@ -288,6 +305,106 @@ def analyze_faces_in_image(image_path: str, prompt: str, model: Optional[str] =
         raise Exception(f"Claude API error analyzing {image_path}: {str(e)}")
 
 
+async def analyze_faces_in_image_async(
+    image_path: str,
+    prompt: str,
+    model: Optional[str] = None,
+    client: Optional[Union[AsyncAnthropic, AsyncAnthropicVertex]] = None,
+    semaphore: Optional[asyncio.Semaphore] = None
+) -> str:
+    """
+    Async version of analyze_faces_in_image().
+
+    Image preparation runs in a worker process so it does not block the
+    event loop and several images can be encoded in parallel.
+
+    Args:
+        image_path: Path to image file
+        prompt: Analysis prompt for Claude
+        model: Claude model to use
+        client: Async client to reuse (created if not provided)
+        semaphore: Optional semaphore bounding concurrent API requests
+
+    Returns:
+        Claude's response text
+
+    Raises:
+        Exception: If API call fails
+    """
+    if client is None:
+        client = get_async_claude_client()
+
+    image_bytes, media_type = await prepare_image_async(image_path)
+    encoded_image = base64.standard_b64encode(image_bytes).decode('ascii')
+
+    if model is None:
+        model = get_model_name()
+
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    try:
+        async with semaphore:
+            response = await client.messages.create(
+                model=model,
+                max_tokens=2048,
+                messages=_build_image_messages(encoded_image, media_type, prompt),
+            )
+
+        return response.content[0].text
+
+    except Exception as e:
+        raise Exception(f"Claude API error analyzing {image_path}: {str(e)}")
+
+
+async def analyze_images_async(
+    image_paths: List[str],
+    prompt: str,
+    model: Optional[str] = None,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS
+) -> List[Union[str, Exception]]:
+    """
+    Analyze many images concurrently with the same prompt.
+
+    Args:
+        image_paths: Paths to image files
+        prompt: Analysis prompt for Claude
+        model: Claude model to use
+        max_concurrency: Maximum number of in-flight API requests
+
+    Returns:
+        List of response texts (or the raised exception) in input order
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async with get_async_claude_client() as client:
+        return await asyncio.gather(
+            *(analyze_faces_in_image_async(path, prompt, model, client, semaphore) for path in image_paths),
+            return_exceptions=True
+        )
+
+
+def analyze_images(
+    image_paths: List[str],
+    prompt: str,
+    model: Optional[str] = None,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS
+) -> List[Union[str, Exception]]:
+    """
+    Synchronous entry point for analyze_images_async().
+
+    Args:
+        image_paths: Paths to image files
+        prompt: Analysis prompt for Claude
+        model: Claude model to use
+        max_concurrency: Maximum number of in-flight API requests
+
+    Returns:
+        List of response texts (or the raised exception) in input order
+    """
+    return asyncio.run(analyze_images_async(image_paths, prompt, model, max_concurrency))
+
+
 def generate_facial_description(image_path: str) -> str:
     """
     Generate detailed facial description for database entry.
@@ -298,25 +415,7 @@ def generate_facial_description(image_path: str) -> str:
     Returns:
         Detailed facial description text
     """
-    prompt = """Analyze this image and provide a detailed description of the person's facial features.
-
-Focus on permanent, distinctive characteristics:
-- Face shape (oval, round, square, heart-shaped, etc.)
-- Eye color, shape, and spacing
-- Eyebrow shape and thickness
-- Nose shape and size
-- Mouth and lip characteristics
-- Chin and jawline
-- Skin tone
-- Hair color, texture, and style (note this may change)
-- Distinctive features (dimples, freckles, scars, etc.)
-- Approximate age range
-- Any other notable facial characteristics
-
-Be specific and detailed. This description will be used to identify this person in other photos.
-If multiple people are in the image, describe only the most prominent person."""
-
-    return analyze_faces_in_image(image_path, prompt)
+    return analyze_faces_in_image(image_path, FACIAL_DESCRIPTION_PROMPT)
 
 
 def detect_and_describe_all_faces(image_path: str) -> str:
@@ -329,57 +428,88 @@ def detect_and_describe_all_faces(image_path: str) -> str:
     Returns:
         Description of all detected faces
     """
-    prompt = """Analyze this image and identify all human faces present.
+    return analyze_faces_in_image(image_path, DETECT_FACES_PROMPT)
 
-For each face detected, provide:
-1. A brief description of their location in the image (e.g., "left side", "center", "background")
-2. Detailed facial features similar to a police description
 
-If no faces are detected, respond with "NO_FACES_DETECTED".
+def detect_and_describe_all_faces_concurrently(
+    image_paths: List[str],
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS
+) -> List[Union[str, Exception]]:
+    """
+    Detect and describe faces in many images, one request per image.
 
-Format your response as a JSON array:
-[
-  {
-    "position": "center of image",
-    "description": "detailed facial description..."
-  },
-  ...
-]
+    The requests share one async client and connection pool, with at most
+    max_concurrency of them in flight.
 
-If no faces found, return: {"faces": []}"""
+    Args:
+        image_paths: Paths to image files
+        max_concurrency: Maximum number of in-flight API requests
 
-    return analyze_faces_in_image(image_path, prompt)
+    Returns:
+        List of detection responses (or the raised exception) in input order
+    """
+    return analyze_images(image_paths, DETECT_FACES_PROMPT, max_concurrency=max_concurrency)
 
 
-def compare_face_descriptions(description1: str, description2: str) -> float:
+def detect_and_describe_all_faces_batch(image_paths: List[str]) -> List[Optional[str]]:
     """
-    Use Claude to compare two facial descriptions and return similarity score.
+    Detect and describe faces in several images with a single request.
 
     Args:
-        description1: First facial description
-        description2: Second facial description
+        image_paths: Paths to image files
 
     Returns:
-        Similarity score from 0.0 (completely different) to 1.0 (same person)
+        Per-image detection responses in input order; None for images the
+        reply did not cover
+
+    Raises:
+        Exception: If API call fails
     """
     client = get_claude_client()
+    model = get_model_name()
+
+    content: List[Dict[str, Any]] = []
+    for idx, image_path in enumerate(image_paths):
+        encoded_image, media_type = load_and_encode_image(image_path)
+        content.append({"type": "text", "text": f"Image {idx}:"})
+        content.append({
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": media_type,
+                "data": encoded_image,
+            },
+        })
+    content.append({"type": "text", "text": DETECT_FACES_BATCH_PROMPT})
 
-    prompt = f"""Compare these two facial descriptions and determine if they describe the same person.
+    try:
+        response = client.messages.create(
+            model=model,
+            max_tokens=min(MAX_OUTPUT_TOKENS_PER_IMAGE * len(image_paths), MAX_OUTPUT_TOKENS),
+            messages=[{"role": "user", "content": content}],
+        )
 
-Description 1:
-{description1}
+        return split_batch_detection(response.content[0].text, len(image_paths))
 
-Description 2:
-{description2}
+    except Exception as e:
+        raise Exception(f"Claude API error analyzing {len(image_paths)} images: {str(e)}")
 
-Analyze the permanent facial features (face shape, eye characteristics, nose, bone structure, etc.).
-Ignore temporary features like hair style, facial hair, or makeup unless they're very distinctive.
 
-Provide your response as a JSON object with:
-- "similarity": a number from 0.0 to 1.0 (0.0 = definitely different people, 1.0 = definitely same person)
-- "reasoning": brief explanation of your assessment
+def compare_face_descriptions(description1: str, description2: str) -> Optional[float]:
+    """
+    Use Claude to compare two facial descriptions and return similarity score.
 
-Example: {{"similarity": 0.85, "reasoning": "Very similar face shape, eye color, and nose structure. Minor differences could be due to age or photo angle."}}"""
+    Args:
+        description1: First facial description
+        description2: Second facial description
+
+    Returns:
+        Similarity score from 0.0 (completely different) to 1.0 (same person),
+        or None if the request or its reply failed
+    """
+    client = get_claude_client()
+
+    prompt = build_comparison_prompt(description1, description2)
 
     try:
         model = get_model_name()
@@ -395,22 +525,48 @@ Example: {{"similarity": 0.85, "reasoning": "Very similar face shape, eye color,
             ],
         )
 
-        result_text = response.content[0].text
-
-        # Extract JSON from response
-        # Claude might wrap it in markdown code blocks
-        if "```json" in result_text:
-            start = result_text.find("```json") + 7
-            end = result_text.find("```", start)
-            result_text = result_text[start:end].strip()
-        elif "```" in result_text:
-            start = result_text.find("```") + 3
-            end = result_text.find("```", start)
-            result_text = result_text[start:end].strip()
-
-        result = json.loads(result_text)
-        return float(result.get("similarity", 0.0))
+        return parse_similarity(response.content[0].text)
 
     except Exception as e:
         print(f"Warning: Error comparing descriptions: {e}")
-        return 0.0
+        return None
+
+
+def compare_face_descriptions_batch(pairs: List[Tuple[str, str]]) -> List[Optional[float]]:
+    """
+    Use Claude to score many description pairs with one request per chunk.
+
+    Pairs are sent COMPARISON_BATCH_SIZE at a time instead of one
+    round-trip each, as compare_face_descriptions() would need.
+
+    Args:
+        pairs: List of (description1, description2) tuples
+
+    Returns:
+        Similarity scores from 0.0 to 1.0, in the same order as pairs; None
+        for pairs whose request or reply failed
+    """
+    client = get_claude_client()
+    model = get_model_name()
+    scores: List[Optional[float]] = []
+
+    for start in range(0, len(pairs), COMPARISON_BATCH_SIZE):
+        chunk = pairs[start:start + COMPARISON_BATCH_SIZE]
+        try:
+            response = client.messages.create(
+                model=model,
+                max_tokens=1024,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": build_batch_comparison_prompt(chunk)
+                    }
+                ],
+            )
+            scores.extend(parse_batch_scores(response.content[0].text, len(chunk)))
+
+        except Exception as e:
+            print(f"Warning: Error comparing descriptions: {e}")
+            scores.extend([None] * len(chunk))
+
+    return scores
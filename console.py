@@ -0,0 +1,21 @@
+"""
+Console output helpers shared by the command-line scripts.
+"""
+
+import sys
+
+
+# Separator line for section headers
+SEPARATOR = "=" * 70
+
+
+def print_header(title, blank_line_before=False):
+    """
+    Print a section title between separator lines with a single write.
+
+    Args:
+        title: Section title
+        blank_line_before: Whether to print an empty line first
+    """
+    prefix = "\n" if blank_line_before else ""
+    sys.stdout.write(f"{prefix}{SEPARATOR}\n{title}\n{SEPARATOR}\n")
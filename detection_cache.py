@@ -0,0 +1,69 @@
+"""
+Persistent cache of face detection responses.
+Responses are keyed by model and a hash of the image content, so re-running
+the organizer on the same photos (even renamed or moved) skips the API.
+"""
+
+import hashlib
+from typing import Optional
+
+from json_cache import JsonCache
+
+
+# Cache file path
+DETECTION_CACHE_FILE = "face_cache.json"
+
+# Read size when hashing image files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_cache = JsonCache(DETECTION_CACHE_FILE)
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Hash a file's content.
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        128-bit BLAKE2b hex digest of the file content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_cache() -> None:
+    """
+    Write the detection cache to disk if it has new entries.
+    """
+    _cache.save()
+
+
+def get_detection(model: str, content_hash: str) -> Optional[str]:
+    """
+    Look up a cached detection response.
+
+    Args:
+        model: Model identifier
+        content_hash: Image content hash from hash_file()
+
+    Returns:
+        Raw detection response, or None if the image has not been analyzed
+    """
+    return _cache.get(f"{model}:{content_hash}")
+
+
+def set_detection(model: str, content_hash: str, response: str) -> None:
+    """
+    Store a detection response; the cache is written on save_cache() or exit.
+
+    Args:
+        model: Model identifier
+        content_hash: Image content hash from hash_file()
+        response: Raw detection response text
+    """
+    _cache.set(f"{model}:{content_hash}", response)
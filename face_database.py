@@ -15,6 +15,13 @@ from vision_client import generate_facial_description
 # Database file path
 DATABASE_FILE = "face_database.json"
 
+# Separator lines for printed listings
+_SEP = "=" * 70
+_HR = "-" * 70
+
+# ((mtime_ns, size), name -> description mapping) of the last database read
+_descriptions_cache: Optional[tuple] = None
+
 
 def load_database() -> Dict:
     """
@@ -167,9 +174,9 @@ def display_all_people() -> None:
         print("\nDatabase is empty. No people registered yet.")
         return
 
-    print(f"\n{'='*70}")
+    print(f"\n{_SEP}")
     print(f"Face Database - {len(people)} people registered")
-    print(f"{'='*70}\n")
+    print(f"{_SEP}\n")
 
     for i, person in enumerate(people, 1):
         print(f"{i}. {person['name']}")
@@ -196,9 +203,9 @@ def display_person_details(name: str) -> None:
         print(f"Person '{name}' not found in database.")
         return
 
-    print(f"\n{'='*70}")
+    print(f"\n{_SEP}")
     print(f"Details for: {person['name']}")
-    print(f"{'='*70}\n")
+    print(f"{_SEP}\n")
     print(f"Reference Image: {person['reference_image']}")
     print(f"Added: {person['added_date']}")
 
@@ -206,23 +213,37 @@ def display_person_details(name: str) -> None:
         print(f"Notes: {person['notes']}")
 
     print(f"\nFacial Description:")
-    print(f"{'-'*70}")
+    print(_HR)
     print(person['facial_description'])
-    print(f"{'-'*70}\n")
+    print(f"{_HR}\n")
 
 
 def get_all_facial_descriptions() -> Dict[str, str]:
     """
     Get mapping of names to facial descriptions for all people.
 
+    The mapping is only rebuilt when the database file changes.
+
     Returns:
         Dictionary mapping person names to their facial descriptions
     """
-    db = load_database()
-    return {
-        person['name']: person['facial_description']
-        for person in db['people']
-    }
+    global _descriptions_cache
+
+    try:
+        stat = os.stat(DATABASE_FILE)
+        file_key = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        file_key = None
+
+    if _descriptions_cache is None or _descriptions_cache[0] != file_key:
+        db = load_database()
+        descriptions = {
+            person['name']: person['facial_description']
+            for person in db['people']
+        }
+        _descriptions_cache = (file_key, descriptions)
+
+    return dict(_descriptions_cache[1])
 
 
 def database_stats() -> Dict:
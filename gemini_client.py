@@ -4,23 +4,37 @@ Supports both Google AI Studio (API key) and Vertex AI.
 """
 
 import os
-import json
+import asyncio
+import time
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 from google import genai
 from google.genai import types
-from PIL import Image
 from dotenv import load_dotenv
 
+from image_prep import prepare_image, prepare_image_async
+from vision_prompts import (
+    FACIAL_DESCRIPTION_PROMPT, DETECT_FACES_PROMPT, DETECT_FACES_BATCH_PROMPT,
+    build_comparison_prompt, build_batch_comparison_prompt,
+    parse_similarity, parse_batch_scores, split_batch_detection,
+)
+
 # Load environment variables
 load_dotenv()
 
 # Constants
-MAX_IMAGE_SIZE_MB = 5.0
-MAX_IMAGE_DIMENSION = 8000
-SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic'}
+MAX_CONCURRENT_REQUESTS = 16
+MAX_OUTPUT_TOKENS_PER_IMAGE = 2048
+MAX_OUTPUT_TOKENS = 8192
+COMPARISON_BATCH_SIZE = 10
+INLINE_REQUEST_MAX_BYTES = 18 * 1024 * 1024  # inline image data per request (API limit: 20 MB in total)
+UPLOADED_FILE_TTL_SECONDS = 47 * 3600  # Files API keeps uploads for 48 hours
+
+# Uploaded images keyed by (path, mtime_ns, size) -> (upload time, file)
+_uploaded_files: Dict[Tuple[str, int, int], Tuple[float, types.File]] = {}
 
 # Available Gemini models
 GEMINI_MODELS = {
@@ -31,9 +45,11 @@ GEMINI_MODELS = {
 }
 
 
+@lru_cache(maxsize=1)
 def get_model_name() -> str:
     """
     Get the Gemini model to use from environment or config.
+    The result is cached for the lifetime of the process.
 
     Returns:
         Model identifier string
@@ -47,13 +63,43 @@ def get_model_name() -> str:
     return model_env
 
 
+@lru_cache(maxsize=1)
 def get_gemini_client():
     """
     Initialize Gemini client with API key.
+    The client is created once and reused so its connection pool stays warm.
 
     Returns:
         Configured genai client
     """
+    client = genai.Client(api_key=_api_key())
+    print(f"Using Gemini API (model: {get_model_name()})")
+    return client
+
+
+def get_async_gemini_client():
+    """
+    Initialize a Gemini client for async requests.
+
+    Unlike get_gemini_client() this is not cached: the async transport is
+    bound to the event loop it is first used on, so each batch creates its own.
+
+    Returns:
+        Configured genai client (use its .aio interface)
+    """
+    return genai.Client(api_key=_api_key())
+
+
+def _api_key() -> str:
+    """
+    Read the Gemini API key from the environment.
+
+    Returns:
+        API key string
+
+    Raises:
+        ValueError: If GEMINI_API_KEY is not set
+    """
     api_key = os.getenv('GEMINI_API_KEY')
 
     if not api_key:
@@ -62,82 +108,122 @@ def get_gemini_client():
             "Get your API key from: https://aistudio.google.com/apikey"
         )
 
-    client = genai.Client(api_key=api_key)
-    print(f"Using Gemini API (model: {get_model_name()})")
-    return client
+    return api_key
 
 
 def load_and_prepare_image(file_path: str) -> bytes:
     """
-    Load image, handle HEIC conversion, resize if needed, and return bytes.
+    Load image, handle HEIC conversion, resize if needed.
 
     Args:
         file_path: Path to image file
 
     Returns:
         Image data as bytes
+
+    Raises:
+        FileNotFoundError: If image file doesn't exist
+        ValueError: If image format is not supported
     """
-    path = Path(file_path)
+    image_bytes, _ = prepare_image(file_path)
+    return image_bytes
 
-    if not path.exists():
-        raise FileNotFoundError(f"Image not found: {file_path}")
 
-    suffix = path.suffix.lower()
-    if suffix not in SUPPORTED_FORMATS:
-        raise ValueError(f"Unsupported image format: {suffix}")
+def _uploaded_file_key(image_path: str) -> Tuple[str, int, int]:
+    """
+    Build the upload cache key for an image file.
 
-    # Handle HEIC images
-    if suffix == '.heic':
-        try:
-            import pillow_heif
-            heif_file = pillow_heif.read_heif(file_path)
-            image = Image.frombytes(
-                heif_file.mode,
-                heif_file.size,
-                heif_file.data,
-                "raw",
-            )
-        except ImportError:
-            raise ValueError(
-                "pillow-heif is required to process HEIC images. "
-                "Install it with: pip install pillow-heif"
-            )
-    else:
-        image = Image.open(file_path)
-
-    # Convert to RGB if necessary
-    if image.mode in ('RGBA', 'P', 'LA'):
-        rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-        if image.mode == 'P':
-            image = image.convert('RGBA')
-        rgb_image.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
-        image = rgb_image
-    elif image.mode != 'RGB':
-        image = image.convert('RGB')
-
-    # Resize if image is too large
-    width, height = image.size
-    if width > MAX_IMAGE_DIMENSION or height > MAX_IMAGE_DIMENSION:
-        ratio = min(MAX_IMAGE_DIMENSION / width, MAX_IMAGE_DIMENSION / height)
-        new_size = (int(width * ratio), int(height * ratio))
-        image = image.resize(new_size, Image.Resampling.LANCZOS)
-
-    # Compress to stay under size limit
-    buffer = BytesIO()
-    quality = 95
-
-    while quality > 20:
-        buffer.seek(0)
-        buffer.truncate()
-        image.save(buffer, format='JPEG', quality=quality, optimize=True)
-        size_mb = buffer.tell() / (1024 * 1024)
-
-        if size_mb <= MAX_IMAGE_SIZE_MB:
-            break
-        quality -= 10
-
-    buffer.seek(0)
-    return buffer.read()
+    Args:
+        image_path: Path to image file
+
+    Returns:
+        Tuple of (absolute path, mtime in nanoseconds, size in bytes)
+    """
+    path = Path(image_path)
+    stat = path.stat()
+    return str(path.absolute()), stat.st_mtime_ns, stat.st_size
+
+
+def _get_uploaded_file(key: Tuple[str, int, int]) -> Optional[types.File]:
+    """
+    Look up a previous upload that the Files API still holds.
+
+    Args:
+        key: Upload cache key from _uploaded_file_key()
+
+    Returns:
+        Uploaded file, or None if never uploaded or expired
+    """
+    entry = _uploaded_files.get(key)
+    if entry is None:
+        return None
+    uploaded_at, uploaded = entry
+    if time.monotonic() - uploaded_at > UPLOADED_FILE_TTL_SECONDS:
+        del _uploaded_files[key]
+        return None
+    return uploaded
+
+
+def get_image_part(client, image_path: str,
+                   inline_budget: int = INLINE_REQUEST_MAX_BYTES) -> Union[types.Part, types.File]:
+    """
+    Get the request content for an image.
+
+    Images are sent inline, which needs no extra round trip. Only an image
+    that no longer fits in the request's inline budget is uploaded through
+    the Files API and referenced by URI; that upload is reused (without
+    preparing the image again) while this process runs.
+
+    Args:
+        client: Gemini client
+        image_path: Path to image file
+        inline_budget: Inline image bytes the request can still take
+
+    Returns:
+        Inline image part or uploaded file reference
+    """
+    key = _uploaded_file_key(image_path)
+    uploaded = _get_uploaded_file(key)
+    if uploaded is not None:
+        return uploaded
+
+    image_bytes = load_and_prepare_image(image_path)
+    if len(image_bytes) <= inline_budget:
+        return types.Part.from_bytes(data=image_bytes, mime_type="image/jpeg")
+
+    uploaded = client.files.upload(
+        file=BytesIO(image_bytes),
+        config=types.UploadFileConfig(mime_type="image/jpeg")
+    )
+    _uploaded_files[key] = (time.monotonic(), uploaded)
+    return uploaded
+
+
+async def get_image_part_async(client, image_path: str, image_bytes: bytes) -> Union[types.Part, types.File]:
+    """
+    Async version of get_image_part() for already prepared image bytes.
+
+    The caller checks for a previous upload (_get_uploaded_file) before
+    preparing the image.
+
+    Args:
+        client: Gemini client
+        image_path: Path to image file
+        image_bytes: Prepared JPEG bytes for the image
+
+    Returns:
+        Inline image part or uploaded file reference
+    """
+    if len(image_bytes) <= INLINE_REQUEST_MAX_BYTES:
+        return types.Part.from_bytes(data=image_bytes, mime_type="image/jpeg")
+
+    key = _uploaded_file_key(image_path)
+    uploaded = await client.aio.files.upload(
+        file=BytesIO(image_bytes),
+        config=types.UploadFileConfig(mime_type="image/jpeg")
+    )
+    _uploaded_files[key] = (time.monotonic(), uploaded)
+    return uploaded
 
 
 def analyze_faces_in_image(image_path: str, prompt: str, model: Optional[str] = None) -> str:
@@ -158,14 +244,8 @@ def analyze_faces_in_image(image_path: str, prompt: str, model: Optional[str] =
         model = get_model_name()
 
     try:
-        # Load image
-        image_bytes = load_and_prepare_image(image_path)
-
-        # Create image part
-        image_part = types.Part.from_bytes(
-            data=image_bytes,
-            mime_type="image/jpeg"
-        )
+        # Load image (inline unless it exceeds the request limit)
+        image_part = get_image_part(client, image_path)
 
         # Generate response
         response = client.models.generate_content(
@@ -183,6 +263,110 @@ def analyze_faces_in_image(image_path: str, prompt: str, model: Optional[str] =
         raise Exception(f"Gemini API error analyzing {image_path}: {str(e)}")
 
 
+async def analyze_faces_in_image_async(
+    image_path: str,
+    prompt: str,
+    model: Optional[str] = None,
+    client=None,
+    semaphore: Optional[asyncio.Semaphore] = None
+) -> str:
+    """
+    Async version of analyze_faces_in_image().
+
+    Image preparation runs in a worker process so it does not block the
+    event loop and several images can be encoded in parallel.
+
+    Args:
+        image_path: Path to image file
+        prompt: Analysis prompt for Gemini
+        model: Gemini model to use (optional)
+        client: Gemini client to reuse within this event loop (created if not provided)
+        semaphore: Optional semaphore bounding concurrent API requests
+
+    Returns:
+        Gemini's response text
+    """
+    if client is None:
+        client = get_async_gemini_client()
+
+    if model is None:
+        model = get_model_name()
+
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    try:
+        # A previous upload is reused without preparing the image again
+        image_part = _get_uploaded_file(_uploaded_file_key(image_path))
+        if image_part is None:
+            image_bytes, _ = await prepare_image_async(image_path)
+
+        async with semaphore:
+            if image_part is None:
+                image_part = await get_image_part_async(client, image_path, image_bytes)
+            response = await client.aio.models.generate_content(
+                model=model,
+                contents=[image_part, prompt],
+                config=types.GenerateContentConfig(
+                    temperature=0.4,
+                    max_output_tokens=2048,
+                )
+            )
+
+        return response.text
+
+    except Exception as e:
+        raise Exception(f"Gemini API error analyzing {image_path}: {str(e)}")
+
+
+async def analyze_images_async(
+    image_paths: List[str],
+    prompt: str,
+    model: Optional[str] = None,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS
+) -> List[Union[str, Exception]]:
+    """
+    Analyze many images concurrently with the same prompt.
+
+    Args:
+        image_paths: Paths to image files
+        prompt: Analysis prompt for Gemini
+        model: Gemini model to use (optional)
+        max_concurrency: Maximum number of in-flight API requests
+
+    Returns:
+        List of response texts (or the raised exception) in input order
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    client = get_async_gemini_client()
+
+    return await asyncio.gather(
+        *(analyze_faces_in_image_async(path, prompt, model, client, semaphore) for path in image_paths),
+        return_exceptions=True
+    )
+
+
+def analyze_images(
+    image_paths: List[str],
+    prompt: str,
+    model: Optional[str] = None,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS
+) -> List[Union[str, Exception]]:
+    """
+    Synchronous entry point for analyze_images_async().
+
+    Args:
+        image_paths: Paths to image files
+        prompt: Analysis prompt for Gemini
+        model: Gemini model to use (optional)
+        max_concurrency: Maximum number of in-flight API requests
+
+    Returns:
+        List of response texts (or the raised exception) in input order
+    """
+    return asyncio.run(analyze_images_async(image_paths, prompt, model, max_concurrency))
+
+
 def generate_facial_description(image_path: str) -> str:
     """
     Generate detailed facial description for database entry.
@@ -193,25 +377,7 @@ def generate_facial_description(image_path: str) -> str:
     Returns:
         Detailed facial description text
     """
-    prompt = """Analyze this image and provide a detailed description of the person's facial features.
-
-Focus on permanent, distinctive characteristics:
-- Face shape (oval, round, square, heart-shaped, etc.)
-- Eye color, shape, and spacing
-- Eyebrow shape and thickness
-- Nose shape and size
-- Mouth and lip characteristics
-- Chin and jawline
-- Skin tone
-- Hair color, texture, and style (note this may change)
-- Distinctive features (dimples, freckles, scars, etc.)
-- Approximate age range
-- Any other notable facial characteristics
-
-Be specific and detailed. This description will be used to identify this person in other photos.
-If multiple people are in the image, describe only the most prominent person."""
-
-    return analyze_faces_in_image(image_path, prompt)
+    return analyze_faces_in_image(image_path, FACIAL_DESCRIPTION_PROMPT)
 
 
 def detect_and_describe_all_faces(image_path: str) -> str:
@@ -224,58 +390,89 @@ def detect_and_describe_all_faces(image_path: str) -> str:
     Returns:
         Description of all detected faces in JSON format
     """
-    prompt = """Analyze this image and identify all human faces present.
+    return analyze_faces_in_image(image_path, DETECT_FACES_PROMPT)
 
-For each face detected, provide:
-1. A brief description of their location in the image (e.g., "left side", "center", "background")
-2. Detailed facial features similar to a police description
 
-If no faces are detected, respond with "NO_FACES_DETECTED".
+def detect_and_describe_all_faces_concurrently(
+    image_paths: List[str],
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS
+) -> List[Union[str, Exception]]:
+    """
+    Detect and describe faces in many images, one request per image.
 
-Format your response as a JSON array:
-[
-  {
-    "position": "center of image",
-    "description": "detailed facial description..."
-  },
-  ...
-]
+    The requests share one async client and connection pool, with at most
+    max_concurrency of them in flight.
 
-If no faces found, return: {"faces": []}"""
+    Args:
+        image_paths: Paths to image files
+        max_concurrency: Maximum number of in-flight API requests
 
-    return analyze_faces_in_image(image_path, prompt)
+    Returns:
+        List of detection responses (or the raised exception) in input order
+    """
+    return analyze_images(image_paths, DETECT_FACES_PROMPT, max_concurrency=max_concurrency)
 
 
-def compare_face_descriptions(description1: str, description2: str) -> float:
+def detect_and_describe_all_faces_batch(image_paths: List[str]) -> List[Optional[str]]:
     """
-    Use Gemini to compare two facial descriptions and return similarity score.
+    Detect and describe faces in several images with a single request.
 
     Args:
-        description1: First facial description
-        description2: Second facial description
+        image_paths: Paths to image files
 
     Returns:
-        Similarity score from 0.0 (completely different) to 1.0 (same person)
+        Per-image detection responses in input order; None for images the
+        reply did not cover
+
+    Raises:
+        Exception: If API call fails
     """
     client = get_gemini_client()
     model_name = get_model_name()
 
-    prompt = f"""Compare these two facial descriptions and determine if they describe the same person.
+    try:
+        # Images go inline until the request's inline budget is used up
+        contents = []
+        inline_budget = INLINE_REQUEST_MAX_BYTES
+        for idx, image_path in enumerate(image_paths):
+            image_part = get_image_part(client, image_path, inline_budget)
+            if getattr(image_part, 'inline_data', None) is not None:
+                inline_budget -= len(image_part.inline_data.data)
+            contents.append(f"Image {idx}:")
+            contents.append(image_part)
+        contents.append(DETECT_FACES_BATCH_PROMPT)
+
+        response = client.models.generate_content(
+            model=model_name,
+            contents=contents,
+            config=types.GenerateContentConfig(
+                temperature=0.4,
+                max_output_tokens=min(MAX_OUTPUT_TOKENS_PER_IMAGE * len(image_paths), MAX_OUTPUT_TOKENS),
+            )
+        )
+
+        return split_batch_detection(response.text, len(image_paths))
 
-Description 1:
-{description1}
+    except Exception as e:
+        raise Exception(f"Gemini API error analyzing {len(image_paths)} images: {str(e)}")
 
-Description 2:
-{description2}
 
-Analyze the permanent facial features (face shape, eye characteristics, nose, bone structure, etc.).
-Ignore temporary features like hair style, facial hair, or makeup unless they're very distinctive.
+def compare_face_descriptions(description1: str, description2: str) -> Optional[float]:
+    """
+    Use Gemini to compare two facial descriptions and return similarity score.
 
-Provide your response as a JSON object with:
-- "similarity": a number from 0.0 to 1.0 (0.0 = definitely different people, 1.0 = definitely same person)
-- "reasoning": brief explanation of your assessment
+    Args:
+        description1: First facial description
+        description2: Second facial description
 
-Example: {{"similarity": 0.85, "reasoning": "Very similar face shape, eye color, and nose structure. Minor differences could be due to age or photo angle."}}"""
+    Returns:
+        Similarity score from 0.0 (completely different) to 1.0 (same person),
+        or None if the request or its reply failed
+    """
+    client = get_gemini_client()
+    model_name = get_model_name()
+
+    prompt = build_comparison_prompt(description1, description2)
 
     try:
         response = client.models.generate_content(
@@ -287,21 +484,46 @@ Example: {{"similarity": 0.85, "reasoning": "Very similar face shape, eye color,
             )
         )
 
-        result_text = response.text
-
-        # Extract JSON from response
-        if "```json" in result_text:
-            start = result_text.find("```json") + 7
-            end = result_text.find("```", start)
-            result_text = result_text[start:end].strip()
-        elif "```" in result_text:
-            start = result_text.find("```") + 3
-            end = result_text.find("```", start)
-            result_text = result_text[start:end].strip()
-
-        result = json.loads(result_text)
-        return float(result.get("similarity", 0.0))
+        return parse_similarity(response.text)
 
     except Exception as e:
         print(f"Warning: Error comparing descriptions: {e}")
-        return 0.0
+        return None
+
+
+def compare_face_descriptions_batch(pairs: List[Tuple[str, str]]) -> List[Optional[float]]:
+    """
+    Use Gemini to score many description pairs with one request per chunk.
+
+    Pairs are sent COMPARISON_BATCH_SIZE at a time instead of one
+    round-trip each, as compare_face_descriptions() would need.
+
+    Args:
+        pairs: List of (description1, description2) tuples
+
+    Returns:
+        Similarity scores from 0.0 to 1.0, in the same order as pairs; None
+        for pairs whose request or reply failed
+    """
+    client = get_gemini_client()
+    model_name = get_model_name()
+    scores: List[Optional[float]] = []
+
+    for start in range(0, len(pairs), COMPARISON_BATCH_SIZE):
+        chunk = pairs[start:start + COMPARISON_BATCH_SIZE]
+        try:
+            response = client.models.generate_content(
+                model=model_name,
+                contents=build_batch_comparison_prompt(chunk),
+                config=types.GenerateContentConfig(
+                    temperature=0.4,
+                    max_output_tokens=1024,
+                )
+            )
+            scores.extend(parse_batch_scores(response.text, len(chunk)))
+
+        except Exception as e:
+            print(f"Warning: Error comparing descriptions: {e}")
+            scores.extend([None] * len(chunk))
+
+    return scores
@@ -0,0 +1,228 @@
+"""
+Shared image preparation for the Claude and Gemini clients.
+Loads any supported image (including HEIC), flattens and downsizes it, and
+produces JPEG bytes under the API size limit. Results are cached per file, so
+both providers share one cache and one set of scratch buffers.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+
+# Constants
+MAX_IMAGE_SIZE_MB = 5.0
+MAX_IMAGE_DIMENSION = 8000
+PREPARED_IMAGE_CACHE_SIZE = 32
+JPEG_QUALITY = 85
+MIN_JPEG_QUALITY = 20
+LARGE_SOURCE_BYTES = 50 * 1024 * 1024
+LARGE_SOURCE_DIMENSION = 4000
+SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic'}
+OUTPUT_MEDIA_TYPE = 'image/jpeg'  # every image is sent as JPEG
+
+# Per-thread scratch objects reused across image encodes
+_tls = threading.local()
+
+# Worker processes for CPU-bound preparation in async code (created on demand)
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_scratch_buffer() -> BytesIO:
+    """
+    Get this thread's reusable encode buffer, emptied and rewound.
+
+    Returns:
+        BytesIO ready for writing
+    """
+    buffer = getattr(_tls, 'buffer', None)
+    if buffer is None:
+        buffer = _tls.buffer = BytesIO()
+    buffer.seek(0)
+    buffer.truncate()
+    return buffer
+
+
+def _get_white_canvas(size: tuple) -> Image.Image:
+    """
+    Get this thread's reusable opaque white RGBA canvas of the given size.
+
+    The canvas is only reallocated when the requested size changes; it is
+    never modified, so it is always ready to composite onto.
+
+    Args:
+        size: (width, height) of the canvas
+
+    Returns:
+        White RGBA image of the given size
+    """
+    canvas = getattr(_tls, 'canvas', None)
+    if canvas is None or canvas.size != size:
+        canvas = _tls.canvas = Image.new('RGBA', size, (255, 255, 255, 255))
+    return canvas
+
+
+def prepare_image(file_path: str) -> tuple[bytes, str]:
+    """
+    Load image, handle HEIC conversion, resize and compress if needed.
+
+    Args:
+        file_path: Path to image file
+
+    Returns:
+        Tuple of (JPEG bytes, media_type)
+
+    Raises:
+        FileNotFoundError: If image file doesn't exist
+        ValueError: If image format is not supported
+    """
+    path = Path(file_path)
+
+    if not path.exists():
+        raise FileNotFoundError(f"Image not found: {file_path}")
+
+    suffix = path.suffix.lower()
+    if suffix not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported image format: {suffix}")
+
+    # Reuse the prepared result while the file is unchanged
+    stat = path.stat()
+    return _prepare_image_cached(str(path.absolute()), stat.st_mtime_ns, stat.st_size), OUTPUT_MEDIA_TYPE
+
+
+@lru_cache(maxsize=PREPARED_IMAGE_CACHE_SIZE)
+def _prepare_image_cached(file_path: str, mtime_ns: int, size: int) -> bytes:
+    """
+    Cached worker for prepare_image(), keyed by path, mtime and size.
+
+    Args:
+        file_path: Absolute path to image file
+        mtime_ns: File modification time in nanoseconds (cache key only)
+        size: File size in bytes (cache key only)
+
+    Returns:
+        JPEG image data as bytes
+    """
+    suffix = Path(file_path).suffix.lower()
+
+    # Handle HEIC images
+    if suffix == '.heic':
+        try:
+            import pillow_heif
+            # Decode HDR (10/12-bit) images straight to 8 bits per channel
+            # instead of materializing a 16-bit buffer
+            heif_file = pillow_heif.read_heif(file_path, convert_hdr_to_8bit=True)
+            image = Image.frombytes(
+                heif_file.mode,
+                heif_file.size,
+                heif_file.data,
+                "raw",
+            )
+        except ImportError:
+            raise ValueError(
+                "pillow-heif is required to process HEIC images. "
+                "Install it with: pip install pillow-heif"
+            )
+    else:
+        image = Image.open(file_path)
+        width, height = image.size
+        # JPEGs already within the limits are sent as-is: Image.open() only
+        # parsed the header, so this skips decoding and avoids generation loss
+        if (image.format == 'JPEG' and image.mode in ('RGB', 'L')
+                and size <= MAX_IMAGE_SIZE_MB * 1024 * 1024
+                and max(width, height) <= MAX_IMAGE_DIMENSION):
+            image.close()
+            with open(file_path, 'rb') as f:
+                return f.read()
+        # Let libjpeg scale down by 1/2, 1/4 or 1/8 while decoding when the
+        # image is far above the size limit; the final resize below then
+        # works on a much smaller buffer. Very large files (known from the
+        # stat size, before any decoding) get a smaller target to bound memory
+        target = LARGE_SOURCE_DIMENSION if size > LARGE_SOURCE_BYTES else MAX_IMAGE_DIMENSION
+        if image.format == 'JPEG' and max(width, height) > target:
+            ratio = min(target / width, target / height)
+            image.draft('RGB', (int(width * ratio), int(height * ratio)))
+
+    # Convert to RGB if necessary
+    if image.mode in ('RGBA', 'P', 'LA'):
+        # Flatten transparency onto white in a single blend
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+        image = Image.alpha_composite(_get_white_canvas(image.size), image).convert('RGB')
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    # Resize if image is too large
+    width, height = image.size
+    if width > MAX_IMAGE_DIMENSION or height > MAX_IMAGE_DIMENSION:
+        # Maintain aspect ratio
+        ratio = min(MAX_IMAGE_DIMENSION / width, MAX_IMAGE_DIMENSION / height)
+        new_size = (int(width * ratio), int(height * ratio))
+        # Detail finer than LANCZOS preserves is lost to JPEG quantization
+        # anyway; BOX averaging is cheapest for big reductions
+        method = Image.Resampling.BOX if ratio < 0.25 else Image.Resampling.BILINEAR
+        image = image.resize(new_size, method)
+
+    # Compress to stay under size limit. Encode once at the default quality;
+    # if too large, estimate the quality that fits from the size overshoot
+    # instead of stepping down one quality level per full re-encode.
+    buffer = _get_scratch_buffer()
+    quality = JPEG_QUALITY
+    image.save(buffer, format='JPEG', quality=quality, optimize=True)
+    size_mb = buffer.tell() / (1024 * 1024)
+
+    while size_mb > MAX_IMAGE_SIZE_MB and quality > MIN_JPEG_QUALITY:
+        estimated = int(quality * (MAX_IMAGE_SIZE_MB / size_mb) ** 0.7)
+        quality = max(MIN_JPEG_QUALITY, min(estimated, quality - 5))
+        buffer.seek(0)
+        buffer.truncate()
+        image.save(buffer, format='JPEG', quality=quality, optimize=True)
+        size_mb = buffer.tell() / (1024 * 1024)
+
+    return buffer.getvalue()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool used for image preparation.
+
+    Several images are prepared in parallel on all cores without competing
+    with the event loop thread for the GIL.
+
+    Returns:
+        ProcessPoolExecutor with one worker per CPU
+    """
+    global _process_pool
+
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        atexit.register(_process_pool.shutdown)
+    return _process_pool
+
+
+async def prepare_image_async(file_path: str) -> tuple[bytes, str]:
+    """
+    Run prepare_image() in the shared process pool.
+
+    Each worker keeps its own prepared-image cache.
+
+    Args:
+        file_path: Path to image file
+
+    Returns:
+        Tuple of (JPEG bytes, media_type)
+
+    Raises:
+        FileNotFoundError: If image file doesn't exist
+        ValueError: If image format is not supported
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), prepare_image, file_path)
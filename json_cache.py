@@ -0,0 +1,180 @@
+"""
+Dictionaries persisted to disk, shared by the on-disk caches.
+JsonCache rewrites one JSON file atomically when new entries are saved;
+JsonlCache appends new entries to a JSON-lines log. Both read their file on
+first use and save once more at exit.
+"""
+
+import atexit
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class JsonCache:
+    """
+    Thread-safe dictionary backed by a JSON file.
+
+    Args:
+        path: Cache file path
+        save_every: Write to disk after this many new entries (default: only
+                    on save() and at exit)
+    """
+
+    def __init__(self, path: str, save_every: Optional[int] = None):
+        self.path = path
+        self.save_every = save_every
+        self._data: Optional[Dict[str, Any]] = None
+        # Keys stored since the last save
+        self._pending: List[str] = []
+        # Guards loading, updating and writing the cache from worker threads
+        self._lock = threading.Lock()
+        atexit.register(self.save)
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load the cache from disk (once per process).
+
+        Returns:
+            Dictionary of cached entries
+        """
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    data = {}
+                    if os.path.exists(self.path):
+                        try:
+                            with open(self.path, 'r') as f:
+                                data = json.load(f)
+                        except json.JSONDecodeError:
+                            print(f"Warning: {self.path} is corrupted. Starting with empty cache.")
+                    self._data = data
+
+        return self._data
+
+    def save(self) -> None:
+        """
+        Write the cache to disk if it has new entries.
+        """
+        with self._lock:
+            if not self._pending or self._data is None:
+                return
+
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self._data, f)
+            os.replace(tmp_path, self.path)
+            self._pending = []
+
+    def get(self, key: str) -> Any:
+        """
+        Look up an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing
+        """
+        return self.load().get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store an entry; it is written on save(), every save_every entries or at exit.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+        """
+        data = self.load()
+        with self._lock:
+            data[key] = value
+            self._pending.append(key)
+            flush = self.save_every is not None and len(self._pending) >= self.save_every
+
+        if flush:
+            self.save()
+
+
+class JsonlCache(JsonCache):
+    """
+    Thread-safe dictionary backed by a JSON-lines log.
+
+    Saving appends one line per new entry instead of rewriting the file, so
+    large caches stay cheap to update. Later lines win on load, and a
+    truncated final line (from an interrupted run) is ignored.
+
+    Args:
+        path: Cache file path
+        save_every: Append to disk after this many new entries (default: only
+                    on save() and at exit)
+        legacy_path: JSON cache file imported once if the log does not exist
+    """
+
+    def __init__(self, path: str, save_every: Optional[int] = None, legacy_path: Optional[str] = None):
+        super().__init__(path, save_every)
+        self.legacy_path = legacy_path
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load the cache from disk (once per process).
+
+        Returns:
+            Dictionary of cached entries
+        """
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    self._data = self._read()
+
+        return self._data
+
+    def _read(self) -> Dict[str, Any]:
+        """
+        Read the log, or import the legacy JSON file if there is no log yet.
+
+        Returns:
+            Dictionary of cached entries
+        """
+        data = {}
+
+        if os.path.exists(self.path):
+            line = ''
+            with open(self.path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        data[entry['key']] = entry['value']
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue
+            # Terminate a truncated final line so new entries start on their own
+            if line and not line.endswith('\n'):
+                with open(self.path, 'a') as f:
+                    f.write('\n')
+        elif self.legacy_path and os.path.exists(self.legacy_path):
+            try:
+                with open(self.legacy_path, 'r') as f:
+                    data = json.load(f)
+                with open(self.path, 'w') as f:
+                    for key, value in data.items():
+                        f.write(json.dumps({'key': key, 'value': value}) + '\n')
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"Warning: Could not import {self.legacy_path}: {e}")
+
+        return data
+
+    def save(self) -> None:
+        """
+        Append the entries stored since the last save to the log.
+        """
+        with self._lock:
+            if not self._pending or self._data is None:
+                return
+
+            with open(self.path, 'a') as f:
+                f.write(''.join(
+                    json.dumps({'key': key, 'value': self._data[key]}) + '\n'
+                    for key in self._pending
+                ))
+            self._pending = []
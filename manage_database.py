@@ -17,12 +17,15 @@ from face_database import (
     validate_database
 )
 
+# Separator line for section headers
+_SEP = "=" * 70
+
 
 def print_menu():
     """Print the main menu."""
-    print("\n" + "="*70)
+    print("\n" + _SEP)
     print("Face Database Management")
-    print("="*70)
+    print(_SEP)
     print("\n1. Add person to database")
     print("2. Remove person from database")
     print("3. List all people")
@@ -50,10 +53,11 @@ def add_person_interactive():
         return
 
     # Expand user home directory if needed
-    ref_image = str(Path(ref_image).expanduser())
+    ref_path = Path(ref_image).expanduser()
+    ref_image = str(ref_path)
 
-    # Check if file exists
-    if not Path(ref_image).exists():
+    # Check if file exists (a directory is not a usable reference image)
+    if not ref_path.is_file():
         print(f"Error: File not found: {ref_image}")
         return
 
@@ -145,9 +149,9 @@ def show_database_stats():
     """Show database statistics."""
     stats = database_stats()
 
-    print("\n" + "="*70)
+    print("\n" + _SEP)
     print("Database Statistics")
-    print("="*70)
+    print(_SEP)
 
     if stats['total_people'] == 0:
         print("\nDatabase is empty.")
@@ -173,9 +177,9 @@ def validate_database_interactive():
 
 def main():
     """Main interactive loop."""
-    print("\n" + "="*70)
+    print("\n" + _SEP)
     print("Photo Organizer - Face Database Management")
-    print("="*70)
+    print(_SEP)
     print("\nThis tool manages the database of known people.")
     print("Add people with reference photos before organizing your photo library.")
 
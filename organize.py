@@ -10,6 +10,8 @@ import os
 from pathlib import Path
 
 from photo_organizer import (
+    DEFAULT_WORKERS,
+    DEFAULT_BATCH_SIZE,
     scan_directory_for_images,
     create_organization_plan,
     execute_organization_plan,
@@ -140,6 +142,9 @@ Examples:
   # Move files instead of copying
   python organize.py /path/to/photos --mode move
 
+  # Hard-link files instead of copying (same filesystem, no extra space)
+  python organize.py /path/to/photos --mode link
+
   # Preview organization without making changes
   python organize.py /path/to/photos --dry-run
 
@@ -149,6 +154,15 @@ Examples:
   # Adjust confidence threshold
   python organize.py /path/to/photos --confidence 0.8
 
+  # Analyze more photos concurrently
+  python organize.py /path/to/photos --workers 16
+
+  # Send 8 photos per face detection request
+  python organize.py /path/to/photos --batch-size 8
+
+  # Keep 32 face detection requests in flight on one async client
+  python organize.py /path/to/photos --async --workers 32
+
 Note: Run 'python manage_database.py' first to register known people.
         """
     )
@@ -167,9 +181,9 @@ Note: Run 'python manage_database.py' first to register known people.
 
     parser.add_argument(
         '--mode',
-        choices=['copy', 'move'],
+        choices=['copy', 'move', 'link'],
         default='copy',
-        help='Copy or move files (default: copy)'
+        help='Copy, move or hard-link files (default: copy)'
     )
 
     parser.add_argument(
@@ -185,6 +199,12 @@ Note: Run 'python manage_database.py' first to register known people.
         help='Scan subdirectories (default: True)'
     )
 
+    parser.add_argument(
+        '--sorted',
+        action='store_true',
+        help='Process photos in sorted path order (default: directory listing order)'
+    )
+
     parser.add_argument(
         '--confidence',
         type=float,
@@ -192,6 +212,27 @@ Note: Run 'python manage_database.py' first to register known people.
         help='Minimum confidence threshold for face matching (default: 0.7)'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Number of photos to analyze concurrently (default: {DEFAULT_WORKERS})'
+    )
+
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f'Number of photos sent per face detection request (default: {DEFAULT_BATCH_SIZE})'
+    )
+
+    parser.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help='Send face detection requests from one async client (batch size 1 only)'
+    )
+
     parser.add_argument(
         '--undo',
         action='store_true',
@@ -229,6 +270,8 @@ Note: Run 'python manage_database.py' first to register known people.
     print(f"Output: {args.output}")
     print(f"Mode: {args.mode.upper()}")
     print(f"Confidence threshold: {args.confidence}")
+    print(f"Workers: {args.workers}")
+    print(f"Batch size: {args.batch_size}")
 
     if args.dry_run:
         print("\n*** DRY RUN MODE - No files will be modified ***")
@@ -243,7 +286,7 @@ Note: Run 'python manage_database.py' first to register known people.
         print("Step 1: Scanning for images")
         print("="*70)
 
-        image_files = scan_directory_for_images(args.source_dir, args.recursive)
+        image_files = scan_directory_for_images(args.source_dir, args.recursive, args.sorted)
 
         if not image_files:
             print(f"\nNo supported image files found in {args.source_dir}")
@@ -266,7 +309,9 @@ Note: Run 'python manage_database.py' first to register known people.
         print("="*70)
         print("\nThis may take a while depending on the number of photos...")
 
-        plan = create_organization_plan(image_files, face_db, args.confidence)
+        plan = create_organization_plan(
+            image_files, face_db, args.confidence, args.workers, args.batch_size, args.use_async
+        )
 
         # Display plan summary
         print_plan_summary(plan)
@@ -303,7 +348,7 @@ Note: Run 'python manage_database.py' first to register known people.
         print(f"\nOrganized photos are in: {args.output}")
         print(f"Organization log: {args.output}/organization_log.json")
 
-        if args.mode == 'copy':
+        if args.mode in ('copy', 'link'):
             print(f"\nOriginal files remain in: {args.source_dir}")
         else:
             print(f"\nOriginal files have been moved from: {args.source_dir}")
@@ -4,22 +4,52 @@ Handles directory scanning, face identification, organization planning, and file
 """
 
 import os
+import errno
 import json
 import shutil
 import re
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Set
+from typing import Iterator, List, Dict, Tuple, Optional, Set, Union
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 
 from tqdm import tqdm
 
-from vision_client import detect_and_describe_all_faces, compare_face_descriptions
+from vision_client import (
+    detect_and_describe_all_faces, detect_and_describe_all_faces_batch,
+    detect_and_describe_all_faces_concurrently, compare_face_descriptions_batch, get_model_name,
+)
+from detection_cache import hash_file, get_detection, set_detection, save_cache as save_detection_cache
 from face_database import load_database, get_all_facial_descriptions
+from vision_prompts import extract_json_text, json_loads
+
+# Prefer orjson for writing logs when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # Supported image formats
 SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic'}
+_SUPPORTED_SUFFIXES = tuple(SUPPORTED_FORMATS)
+
+# ioctl request for a copy-on-write file clone (Linux FICLONE)
+FICLONE = 0x40049409
+
+# Number of concurrent file copies/moves (I/O bound)
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Number of images identified concurrently (API-latency bound)
+DEFAULT_WORKERS = 8
+
+# Number of images per face detection request (1 = one request per image)
+DEFAULT_BATCH_SIZE = 1
+
+# Write buffer size for JSON logs
+JSON_WRITE_BUFFER_SIZE = 1024 * 1024
 
 # Hidden/system file patterns to skip
 SKIP_PATTERNS = [
@@ -28,6 +58,29 @@ SKIP_PATTERNS = [
     r'Thumbs\.db$',
     r'\.DS_Store$',
 ]
+_SKIP_RE = re.compile('|'.join(SKIP_PATTERNS))
+
+# Characters not allowed in directory names
+_UNSAFE_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+
+
+def write_json(file_path: Union[str, Path], data: Dict, indent: bool = True) -> None:
+    """
+    Write data as JSON, using orjson when it is installed.
+
+    Args:
+        file_path: Output file path
+        data: JSON-serializable dictionary
+        indent: Pretty-print with 2-space indentation; use False for large
+            machine-read files to keep them compact and fast to write
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        with open(file_path, 'wb', buffering=JSON_WRITE_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(data, option=option))
+    else:
+        with open(file_path, 'w', buffering=JSON_WRITE_BUFFER_SIZE) as f:
+            json.dump(data, f, indent=2 if indent else None)
 
 
 def should_skip_file(file_path: str) -> bool:
@@ -40,27 +93,21 @@ def should_skip_file(file_path: str) -> bool:
     Returns:
         True if file should be skipped
     """
-    filename = os.path.basename(file_path)
-
-    for pattern in SKIP_PATTERNS:
-        if re.search(pattern, filename):
-            return True
-
-    return False
+    return _SKIP_RE.search(os.path.basename(file_path)) is not None
 
 
-def scan_directory_for_images(directory: str, recursive: bool = True) -> List[str]:
+def scan_directory_for_images(directory: str, recursive: bool = True, sort: bool = False) -> List[str]:
     """
     Scan directory for supported image files.
 
     Args:
         directory: Directory to scan
         recursive: Whether to scan subdirectories
+        sort: Sort the paths (otherwise they are in directory listing order)
 
     Returns:
         List of image file paths
     """
-    image_files = []
     directory = Path(directory)
 
     if not directory.exists():
@@ -69,22 +116,51 @@ def scan_directory_for_images(directory: str, recursive: bool = True) -> List[st
     if not directory.is_dir():
         raise ValueError(f"Not a directory: {directory}")
 
-    # Use glob for recursive or non-recursive scanning
-    pattern = "**/*" if recursive else "*"
+    image_files = list(_iter_image_files(os.path.abspath(directory), recursive))
+    if sort:
+        image_files.sort()
+    return image_files
 
-    for item in directory.glob(pattern):
-        if item.is_file():
-            if item.suffix.lower() in SUPPORTED_FORMATS:
-                if not should_skip_file(str(item)):
-                    image_files.append(str(item.absolute()))
 
-    return sorted(image_files)
+def _iter_image_files(directory: str, recursive: bool) -> Iterator[str]:
+    """
+    Yield supported image files under a directory using os.scandir.
+
+    DirEntry caches the file type from the directory listing, so this avoids
+    a stat() and a Path object per entry.
 
+    Args:
+        directory: Absolute directory path
+        recursive: Whether to descend into subdirectories
 
+    Yields:
+        Absolute image file paths
+    """
+    try:
+        entries = os.scandir(directory)
+    except OSError as e:
+        # Unreadable directories (e.g. .Trashes on camera cards) are skipped
+        print(f"Warning: Skipping {directory}: {e}")
+        return
+
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    yield from _iter_image_files(entry.path, recursive)
+            elif (entry.is_file()
+                    and entry.name.lower().endswith(_SUPPORTED_SUFFIXES)
+                    and not should_skip_file(entry.name)):
+                yield entry.path
+
+
+@lru_cache(maxsize=None)
 def sanitize_directory_name(name: str) -> str:
     """
     Convert name to safe directory name.
 
+    Memoized, since the same few names are sanitized for every photo group.
+
     Args:
         name: Name to sanitize
 
@@ -95,7 +171,7 @@ def sanitize_directory_name(name: str) -> str:
     safe_name = name.replace(' ', '_')
 
     # Remove or replace unsafe characters
-    safe_name = re.sub(r'[<>:"/\\|?*]', '', safe_name)
+    safe_name = _UNSAFE_CHARS_RE.sub('', safe_name)
 
     # Remove leading/trailing dots and spaces
     safe_name = safe_name.strip('. ')
@@ -107,31 +183,109 @@ def sanitize_directory_name(name: str) -> str:
     return safe_name
 
 
-def handle_duplicate_filename(target_path: str) -> str:
+def handle_duplicate_filename(target_path: str, used_names: Optional[Set[str]] = None) -> str:
     """
     Add numeric suffix if file already exists.
 
     Args:
         target_path: Desired target file path
+        used_names: Filenames already present or claimed in the target
+            directory. When given, it is checked instead of the filesystem
+            and the chosen filename is added to it.
 
     Returns:
         Available file path (may have numeric suffix)
     """
-    if not os.path.exists(target_path):
-        return target_path
+    if used_names is None:
+        def is_taken(candidate: str) -> bool:
+            return os.path.exists(candidate)
+    else:
+        def is_taken(candidate: str) -> bool:
+            return os.path.basename(candidate) in used_names
 
     path = Path(target_path)
-    stem = path.stem
-    suffix = path.suffix
-    parent = path.parent
-
+    new_path = target_path
     counter = 1
-    while True:
-        new_path = parent / f"{stem}_{counter:03d}{suffix}"
-        if not os.path.exists(new_path):
-            return str(new_path)
+    while is_taken(new_path):
+        new_path = str(path.parent / f"{path.stem}_{counter:03d}{path.suffix}")
         counter += 1
 
+    if used_names is not None:
+        used_names.add(os.path.basename(new_path))
+    return new_path
+
+
+def fast_copy(src: str, dst: str) -> str:
+    """
+    Copy a file with data and metadata, using the cheapest kernel path.
+
+    Tries a copy-on-write clone (FICLONE, Btrfs/XFS), then an in-kernel
+    copy_file_range; otherwise falls back to shutil.copyfile, which uses
+    sendfile/fcopyfile where available. Metadata is copied once afterwards.
+
+    Args:
+        src: Source file path
+        dst: Destination file path
+
+    Returns:
+        Destination path (so it can be used as shutil.move's copy_function)
+    """
+    copied = False
+
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                try:
+                    import fcntl
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                    copied = True
+                except (ImportError, OSError):
+                    remaining = os.fstat(fsrc.fileno()).st_size
+                    while remaining > 0:
+                        sent = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                        if sent == 0:
+                            break
+                        remaining -= sent
+                    copied = remaining == 0
+        except OSError:
+            copied = False
+
+    if not copied:
+        shutil.copyfile(src, dst)
+
+    shutil.copystat(src, dst)
+    return dst
+
+
+def transfer_file(src: str, dst: str, mode: str) -> None:
+    """
+    Copy, move or hard-link a file into the organized directory.
+
+    Args:
+        src: Source file path
+        dst: Destination file path
+        mode: 'copy', 'move' or 'link'
+    """
+    if mode == 'copy':
+        fast_copy(src, dst)
+    elif mode == 'link':
+        # A hard link shares the data and metadata; copy across filesystems
+        try:
+            os.link(src, dst)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            fast_copy(src, dst)
+    else:
+        # Same-filesystem moves are a single rename; shutil.move (and
+        # fast_copy) only runs across devices
+        try:
+            os.replace(src, dst)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(src, dst, copy_function=fast_copy)
+
 
 def identify_all_faces_in_image(image_path: str, face_db: Dict[str, str], confidence_threshold: float = 0.7) -> List[Dict]:
     """
@@ -147,35 +301,190 @@ def identify_all_faces_in_image(image_path: str, face_db: Dict[str, str], confid
         Name is None for unknown faces
     """
     try:
-        # Detect all faces in image
-        faces_json = detect_and_describe_all_faces(image_path)
+        # Detect all faces in image, reusing the response for unchanged content
+        model = get_model_name()
+        content_hash = hash_file(image_path)
+        faces_json = get_detection(model, content_hash)
+        if faces_json is None:
+            faces_json = detect_and_describe_all_faces(image_path)
+            _remember_detection(model, content_hash, faces_json)
 
-        # Parse response
+    except Exception as e:
+        print(f"Error identifying faces in {image_path}: {e}")
+        return []
+
+    return match_detected_faces(image_path, faces_json, face_db, confidence_threshold)
+
+
+def identify_faces_in_images(image_paths: List[str], face_db: Dict[str, str],
+                             confidence_threshold: float = 0.7) -> List[List[Dict]]:
+    """
+    Detect faces in several images with one API request and match them.
+
+    Images with a cached detection are not sent again. Images the batched
+    reply did not cover fall back to a single-image request.
+
+    Args:
+        image_paths: Paths to images
+        face_db: Dictionary mapping names to facial descriptions
+        confidence_threshold: Minimum similarity score to consider a match
+
+    Returns:
+        Face matches for each image, in input order (see identify_all_faces_in_image)
+
+    Raises:
+        Exception: If detection fails, so the caller can report every photo in
+                   the batch as an error rather than as having no faces
+    """
+    if len(image_paths) == 1:
+        return [identify_all_faces_in_image(image_paths[0], face_db, confidence_threshold)]
+
+    model = get_model_name()
+    content_hashes = [hash_file(image_path) for image_path in image_paths]
+    responses = [get_detection(model, content_hash) for content_hash in content_hashes]
+    missing = [i for i, response in enumerate(responses) if response is None]
+
+    if missing:
+        fresh = detect_and_describe_all_faces_batch([image_paths[i] for i in missing])
+        for i, response in zip(missing, fresh):
+            if response is None:
+                response = detect_and_describe_all_faces(image_paths[i])
+            responses[i] = response
+            _remember_detection(model, content_hashes[i], response)
+
+    return [
+        match_detected_faces(image_path, faces_json, face_db, confidence_threshold)
+        for image_path, faces_json in zip(image_paths, responses)
+    ]
+
+
+def identify_faces_concurrently(image_paths: List[str], face_db: Dict[str, str],
+                                confidence_threshold: float = 0.7,
+                                workers: int = DEFAULT_WORKERS) -> List[List[Dict]]:
+    """
+    Detect faces in many images with concurrent async requests and match them.
+
+    Uncached images are sent one per request from a single event loop and
+    connection pool, with at most `workers` requests in flight. Matching
+    against the database then runs on a thread pool.
+
+    Args:
+        image_paths: Paths to images
+        face_db: Dictionary mapping names to facial descriptions
+        confidence_threshold: Minimum similarity score to consider a match
+        workers: Number of requests to run concurrently
+
+    Returns:
+        Face matches for each image, in input order (see identify_all_faces_in_image)
+    """
+    model = get_model_name()
+
+    def hash_image(image_path: str) -> Optional[str]:
         try:
-            # Try to extract JSON from response
-            if "```json" in faces_json:
-                start = faces_json.find("```json") + 7
-                end = faces_json.find("```", start)
-                faces_json = faces_json[start:end].strip()
-            elif "```" in faces_json:
-                start = faces_json.find("```") + 3
-                end = faces_json.find("```", start)
-                faces_json = faces_json[start:end].strip()
-
-            faces_data = json.loads(faces_json)
-
-            # Handle different response formats
-            if isinstance(faces_data, dict) and 'faces' in faces_data:
-                faces = faces_data['faces']
-            elif isinstance(faces_data, list):
-                faces = faces_data
-            else:
-                faces = []
+            return hash_file(image_path)
+        except Exception as e:
+            print(f"Error identifying faces in {image_path}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        content_hashes = list(executor.map(hash_image, image_paths))
+        responses = [
+            get_detection(model, content_hash) if content_hash is not None else None
+            for content_hash in content_hashes
+        ]
+        missing = [
+            i for i, response in enumerate(responses)
+            if response is None and content_hashes[i] is not None
+        ]
+
+        if missing:
+            print(f"Detecting faces in {len(missing)} uncached photos...")
+            try:
+                fresh = detect_and_describe_all_faces_concurrently(
+                    [image_paths[i] for i in missing], max(1, workers)
+                )
+            except Exception as e:
+                print(f"Error identifying faces: {e}")
+                fresh = [e] * len(missing)
+
+            for i, response in zip(missing, fresh):
+                if isinstance(response, Exception):
+                    print(f"Error identifying faces in {image_paths[i]}: {response}")
+                    continue
+                responses[i] = response
+                _remember_detection(model, content_hashes[i], response)
 
-        except json.JSONDecodeError:
-            # If JSON parsing fails, check for NO_FACES_DETECTED
-            if "NO_FACES_DETECTED" in faces_json:
+        def match(index: int) -> List[Dict]:
+            if responses[index] is None:
                 return []
+            return match_detected_faces(image_paths[index], responses[index], face_db, confidence_threshold)
+
+        return list(tqdm(
+            executor.map(match, range(len(image_paths))),
+            total=len(image_paths), desc="Identifying faces", unit="photo"
+        ))
+
+
+def _parse_detection(faces_json: str) -> Optional[List[Dict]]:
+    """
+    Parse a face detection response into its list of faces.
+
+    Args:
+        faces_json: Raw detection response text
+
+    Returns:
+        List of face dictionaries (empty for NO_FACES_DETECTED), or None if
+        the response is malformed (e.g. a refusal or a truncated reply)
+    """
+    try:
+        # Extract JSON from response (strip any markdown code fence)
+        faces_data = json_loads(extract_json_text(faces_json))
+    except json.JSONDecodeError:
+        faces_data = None
+
+    # Handle different response formats
+    if isinstance(faces_data, dict) and isinstance(faces_data.get('faces'), list):
+        return faces_data['faces']
+    if isinstance(faces_data, list):
+        return faces_data
+    if "NO_FACES_DETECTED" in faces_json:
+        return []
+    return None
+
+
+def _remember_detection(model: str, content_hash: str, faces_json: str) -> None:
+    """
+    Cache a detection response unless it is malformed, so a bad reply is
+    requested again on the next run instead of meaning "no faces" forever.
+
+    Args:
+        model: Model identifier
+        content_hash: Image content hash from hash_file()
+        faces_json: Raw detection response text
+    """
+    if _parse_detection(faces_json) is not None:
+        set_detection(model, content_hash, faces_json)
+
+
+def match_detected_faces(image_path: str, faces_json: str, face_db: Dict[str, str],
+                         confidence_threshold: float = 0.7) -> List[Dict]:
+    """
+    Parse a face detection response and match each face against database.
+
+    Args:
+        image_path: Path to the image the response describes
+        faces_json: Raw detection response text
+        face_db: Dictionary mapping names to facial descriptions
+        confidence_threshold: Minimum similarity score to consider a match
+
+    Returns:
+        List of face matches: [{'name': 'John', 'confidence': 0.95}, ...]
+        Name is None for unknown faces
+    """
+    try:
+        # Parse response
+        faces = _parse_detection(faces_json)
+        if faces is None:
             print(f"Warning: Could not parse face detection response for {image_path}")
             return []
 
@@ -183,29 +492,35 @@ def identify_all_faces_in_image(image_path: str, face_db: Dict[str, str], confid
         if not faces:
             return []
 
-        # Match each face against database
-        matches = []
-
-        for face in faces:
-            face_description = face.get('description', '')
-            if not face_description:
-                continue
-
-            best_match = None
-            best_score = 0.0
+        # Match each face against database. All face/person pairs of the
+        # image are scored together, so the comparisons share as few API
+        # requests as possible instead of one round-trip per person
+        face_descriptions = [face.get('description', '') for face in faces]
+        face_descriptions = [d for d in face_descriptions if d]
+        known_names = list(face_db.keys())
+        known_descriptions = list(face_db.values())
+
+        pairs = [
+            (known_description, face_description)
+            for face_description in face_descriptions
+            for known_description in known_descriptions
+        ]
+        scores = compare_face_descriptions_batch(pairs) if pairs else []
 
-            # Compare against all known people
-            for name, known_description in face_db.items():
-                similarity = compare_face_descriptions(known_description, face_description)
+        matches = []
+        people_count = len(known_names)
 
-                if similarity > best_score:
-                    best_score = similarity
-                    best_match = name
+        for i in range(len(face_descriptions)):
+            # Pick the best-scoring known person for this face (the first
+            # one on ties) with a single C-level max over the score row
+            row = scores[i * people_count:(i + 1) * people_count]
+            best_index = max(range(people_count), key=row.__getitem__, default=None)
+            best_score = row[best_index] if best_index is not None else 0.0
 
             # Add match if above threshold
-            if best_score >= confidence_threshold:
+            if best_score > 0.0 and best_score >= confidence_threshold:
                 matches.append({
-                    'name': best_match,
+                    'name': known_names[best_index],
                     'confidence': best_score
                 })
             else:
@@ -222,14 +537,60 @@ def identify_all_faces_in_image(image_path: str, face_db: Dict[str, str], confid
         return []
 
 
-def create_organization_plan(image_paths: List[str], face_db: Dict[str, str], confidence_threshold: float = 0.7) -> Dict:
+def _categorize(matches: List[Dict]) -> Tuple[str, Union[str, Tuple[str, ...]]]:
+    """
+    Categorize one image for the organization plan from its face matches.
+
+    Args:
+        matches: Face matches from identify_all_faces_in_image
+
+    Returns:
+        Tuple of (plan category, group key). The key is the person's name for
+        'single_person', a sorted tuple of names for 'multiple_people', and
+        an empty string for 'unknown' and 'no_faces'
+    """
+    if not matches:
+        # No faces detected
+        return 'no_faces', ''
+
+    # Extract names (filter out None for unknowns)
+    identified_names = [m['name'] for m in matches if m['name'] is not None]
+    has_unknown = any(m['name'] is None for m in matches)
+
+    if not identified_names:
+        # Only unknown faces
+        return 'unknown', ''
+    elif len(identified_names) == 1 and not has_unknown:
+        # Single known person
+        return 'single_person', identified_names[0]
+    elif len(identified_names) > 1:
+        # Multiple known people
+        # Sort names for consistent directory naming
+        return 'multiple_people', tuple(sorted(identified_names))
+    else:
+        # One known person and unknown faces - put in multiple people with "Unknown"
+        return 'multiple_people', tuple(sorted(identified_names) + ['Unknown'])
+
+
+def create_organization_plan(image_paths: List[str], face_db: Dict[str, str], confidence_threshold: float = 0.7,
+                             workers: int = DEFAULT_WORKERS, batch_size: int = DEFAULT_BATCH_SIZE,
+                             use_async: bool = False) -> Dict:
     """
     Process all images and create organization plan.
 
+    Images are identified concurrently by a thread pool, since each one is
+    dominated by API latency. Results are merged into the plan in input
+    order, so the plan is the same as a sequential run.
+
     Args:
         image_paths: List of image file paths
         face_db: Dictionary mapping names to facial descriptions
         confidence_threshold: Minimum similarity score
+        workers: Number of requests to run concurrently
+        batch_size: Number of images sent per face detection request
+        use_async: Send detection requests from one async client instead of
+            the thread pool (see identify_faces_concurrently); only used
+            with a batch size of 1
 
     Returns:
         Organization plan dictionary with categorized file mappings
@@ -244,42 +605,45 @@ def create_organization_plan(image_paths: List[str], face_db: Dict[str, str], co
 
     print("\nAnalyzing photos...")
 
-    for image_path in tqdm(image_paths, desc="Identifying faces", unit="photo"):
-        try:
-            matches = identify_all_faces_in_image(image_path, face_db, confidence_threshold)
-
-            if not matches:
-                # No faces detected
-                plan['no_faces'].append(image_path)
-                continue
-
-            # Extract names (filter out None for unknowns)
-            identified_names = [m['name'] for m in matches if m['name'] is not None]
-            has_unknown = any(m['name'] is None for m in matches)
-
-            if not identified_names and has_unknown:
-                # Only unknown faces
-                plan['unknown'].append(image_path)
-            elif len(identified_names) == 1 and not has_unknown:
-                # Single known person
-                plan['single_person'][identified_names[0]].append(image_path)
-            elif len(identified_names) > 1:
-                # Multiple known people
-                # Sort names for consistent directory naming
-                key = tuple(sorted(identified_names))
-                plan['multiple_people'][key].append(image_path)
-            elif identified_names and has_unknown:
-                # Mix of known and unknown - put in multiple people with "Unknown"
-                names = sorted(identified_names) + ['Unknown']
-                key = tuple(names)
-                plan['multiple_people'][key].append(image_path)
-
-        except Exception as e:
-            print(f"\nError processing {image_path}: {e}")
-            plan['errors'].append({
-                'path': image_path,
-                'error': str(e)
-            })
+    batch_size = max(1, batch_size)
+
+    if use_async and batch_size == 1:
+        results = dict(zip(image_paths, identify_faces_concurrently(
+            image_paths, face_db, confidence_threshold, workers
+        )))
+    else:
+        batches = [image_paths[i:i + batch_size] for i in range(0, len(image_paths), batch_size)]
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {
+                executor.submit(identify_faces_in_images, batch, face_db, confidence_threshold): batch
+                for batch in batches
+            }
+
+            with tqdm(total=len(image_paths), desc="Identifying faces", unit="photo") as progress:
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    try:
+                        results.update(zip(batch, future.result()))
+                    except Exception as e:
+                        for image_path in batch:
+                            print(f"\nError processing {image_path}: {e}")
+                            plan['errors'].append({
+                                'path': image_path,
+                                'error': str(e)
+                            })
+                    progress.update(len(batch))
+
+    save_detection_cache()
+
+    for image_path in image_paths:
+        if image_path in results:
+            category, key = _categorize(results[image_path])
+            if category in ('single_person', 'multiple_people'):
+                plan[category][key].append(image_path)
+            else:
+                plan[category].append(image_path)
 
     # Convert defaultdicts to regular dicts for JSON serialization
     plan['single_person'] = dict(plan['single_person'])
@@ -296,13 +660,13 @@ def execute_organization_plan(plan: Dict, source_dir: str, target_dir: str, mode
         plan: Organization plan from create_organization_plan
         source_dir: Source directory (for validation)
         target_dir: Target directory for organized photos
-        mode: 'copy' or 'move'
+        mode: 'copy', 'move' or 'link' (hard links, copying across filesystems)
 
     Returns:
         Dictionary with operation results and statistics
     """
-    if mode not in ('copy', 'move'):
-        raise ValueError(f"Invalid mode: {mode}. Must be 'copy' or 'move'")
+    if mode not in ('copy', 'move', 'link'):
+        raise ValueError(f"Invalid mode: {mode}. Must be 'copy', 'move' or 'link'")
 
     target_path = Path(target_dir)
     target_path.mkdir(parents=True, exist_ok=True)
@@ -317,129 +681,75 @@ def execute_organization_plan(plan: Dict, source_dir: str, target_dir: str, mode
 
     print(f"\n{mode.capitalize()}ing files to organized directories...")
 
-    # Process single person photos
+    # Assign every destination up front, serially, so duplicate filenames get
+    # distinct suffixes even though the copies themselves run concurrently
+    jobs = []  # (src_path, dst_path, category, label)
+    # Filenames taken in each destination directory, listed once per directory
+    used_names: Dict[Path, Set[str]] = {}
+
+    def add_jobs(paths: List[str], dest_dir: Path, category: str, label: str) -> None:
+        if dest_dir not in used_names:
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            used_names[dest_dir] = set(os.listdir(dest_dir))
+        names = used_names[dest_dir]
+        for src_path in paths:
+            filename = os.path.basename(src_path)
+            dst_path = handle_duplicate_filename(str(dest_dir / filename), names)
+            jobs.append((src_path, dst_path, category, label))
+
+    # Single person photos
     for name, paths in plan['single_person'].items():
-        person_dir = target_path / sanitize_directory_name(name)
-        person_dir.mkdir(parents=True, exist_ok=True)
-
-        for src_path in tqdm(paths, desc=f"Organizing {name}", unit="photo"):
-            stats['total_files'] += 1
-            try:
-                filename = os.path.basename(src_path)
-                dst_path = handle_duplicate_filename(str(person_dir / filename))
-
-                if mode == 'copy':
-                    shutil.copy2(src_path, dst_path)
-                else:
-                    shutil.move(src_path, dst_path)
-
-                operations.append({
-                    'source': src_path,
-                    'destination': dst_path,
-                    'category': 'single_person',
-                    'label': name
-                })
-                stats['successful'] += 1
-
-            except Exception as e:
-                print(f"\nError processing {src_path}: {e}")
-                stats['failed'] += 1
+        add_jobs(paths, target_path / sanitize_directory_name(name), 'single_person', name)
 
-    # Process multiple people photos
+    # Multiple people photos, in subdirectories under Multiple_People
     for names_tuple, paths in plan['multiple_people'].items():
-        # Create subdirectory under Multiple_People
-        multi_dir = target_path / "Multiple_People"
         names_str = "_".join(sanitize_directory_name(n) for n in names_tuple)
-        group_dir = multi_dir / names_str
-        group_dir.mkdir(parents=True, exist_ok=True)
-
-        for src_path in tqdm(paths, desc=f"Organizing {names_str}", unit="photo"):
-            stats['total_files'] += 1
-            try:
-                filename = os.path.basename(src_path)
-                dst_path = handle_duplicate_filename(str(group_dir / filename))
-
-                if mode == 'copy':
-                    shutil.copy2(src_path, dst_path)
-                else:
-                    shutil.move(src_path, dst_path)
+        add_jobs(paths, target_path / "Multiple_People" / names_str, 'multiple_people', names_str)
 
-                operations.append({
-                    'source': src_path,
-                    'destination': dst_path,
-                    'category': 'multiple_people',
-                    'label': names_str
-                })
-                stats['successful'] += 1
-
-            except Exception as e:
-                print(f"\nError processing {src_path}: {e}")
-                stats['failed'] += 1
-
-    # Process unknown faces
+    # Unknown faces
     if plan['unknown']:
-        unknown_dir = target_path / "Unknown_Faces"
-        unknown_dir.mkdir(parents=True, exist_ok=True)
-
-        for src_path in tqdm(plan['unknown'], desc="Organizing unknown faces", unit="photo"):
-            stats['total_files'] += 1
-            try:
-                filename = os.path.basename(src_path)
-                dst_path = handle_duplicate_filename(str(unknown_dir / filename))
-
-                if mode == 'copy':
-                    shutil.copy2(src_path, dst_path)
-                else:
-                    shutil.move(src_path, dst_path)
+        add_jobs(plan['unknown'], target_path / "Unknown_Faces", 'unknown', 'Unknown_Faces')
 
-                operations.append({
-                    'source': src_path,
-                    'destination': dst_path,
-                    'category': 'unknown',
-                    'label': 'Unknown_Faces'
-                })
-                stats['successful'] += 1
-
-            except Exception as e:
-                print(f"\nError processing {src_path}: {e}")
-                stats['failed'] += 1
-
-    # Process no faces
+    # No faces
     if plan['no_faces']:
-        no_faces_dir = target_path / "No_Faces_Detected"
-        no_faces_dir.mkdir(parents=True, exist_ok=True)
+        add_jobs(plan['no_faces'], target_path / "No_Faces_Detected", 'no_faces', 'No_Faces_Detected')
 
-        for src_path in tqdm(plan['no_faces'], desc="Organizing photos without faces", unit="photo"):
-            stats['total_files'] += 1
-            try:
-                filename = os.path.basename(src_path)
-                dst_path = handle_duplicate_filename(str(no_faces_dir / filename))
+    stats['total_files'] = len(jobs)
+    succeeded = [False] * len(jobs)
 
-                if mode == 'copy':
-                    shutil.copy2(src_path, dst_path)
-                else:
-                    shutil.move(src_path, dst_path)
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+        futures = {
+            executor.submit(transfer_file, src_path, dst_path, mode): index
+            for index, (src_path, dst_path, _, _) in enumerate(jobs)
+        }
 
-                operations.append({
-                    'source': src_path,
-                    'destination': dst_path,
-                    'category': 'no_faces',
-                    'label': 'No_Faces_Detected'
-                })
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Organizing photos", unit="photo"):
+            index = futures[future]
+            try:
+                future.result()
+                succeeded[index] = True
                 stats['successful'] += 1
-
             except Exception as e:
-                print(f"\nError processing {src_path}: {e}")
+                print(f"\nError processing {jobs[index][0]}: {e}")
                 stats['failed'] += 1
 
-    # Save backup mapping for undo
+    # Record operations in plan order for the undo log
+    for (src_path, dst_path, category, label), ok in zip(jobs, succeeded):
+        if ok:
+            operations.append({
+                'source': src_path,
+                'destination': dst_path,
+                'category': category,
+                'label': label
+            })
+
+    # Save backup mapping for undo (compact: one entry per file, machine-read)
     backup_file = target_path / ".original_paths.json"
-    with open(backup_file, 'w') as f:
-        json.dump({
-            'operations': operations,
-            'mode': mode,
-            'created': datetime.now().isoformat()
-        }, f, indent=2)
+    write_json(backup_file, {
+        'operations': operations,
+        'mode': mode,
+        'created': datetime.now().isoformat()
+    }, indent=False)
 
     return {
         'operations': operations,
@@ -476,8 +786,7 @@ def generate_organization_report(plan: Dict, result: Dict, target_dir: str) -> N
     }
 
     report_file = Path(target_dir) / "organization_log.json"
-    with open(report_file, 'w') as f:
-        json.dump(report, f, indent=2)
+    write_json(report_file, report)
 
     print(f"\nReport saved to: {report_file}")
 
@@ -523,8 +832,8 @@ def undo_organization(target_dir: str) -> bool:
                 # Ensure destination directory exists
                 os.makedirs(os.path.dirname(dst), exist_ok=True)
 
-                if mode == 'copy':
-                    # For copied files, just delete the copy
+                if mode in ('copy', 'link'):
+                    # For copied or linked files, just delete the copy
                     os.remove(src)
                 else:
                     # For moved files, move back
@@ -542,9 +851,11 @@ def undo_organization(target_dir: str) -> bool:
         try:
             for root, dirs, files in os.walk(target_dir, topdown=False):
                 for dir_name in dirs:
-                    dir_path = os.path.join(root, dir_name)
-                    if not os.listdir(dir_path):
-                        os.rmdir(dir_path)
+                    # rmdir refuses non-empty directories, so no listing is needed
+                    try:
+                        os.rmdir(os.path.join(root, dir_name))
+                    except OSError:
+                        pass
         except Exception as e:
             print(f"Warning: Error cleaning up directories: {e}")
 
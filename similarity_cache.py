@@ -0,0 +1,85 @@
+"""
+Persistent cache of description similarity scores.
+Scores are keyed by model and the content of both descriptions, so repeated
+comparisons against the same known faces skip the API on later runs.
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Optional
+
+from json_cache import JsonCache
+
+
+# Cache file path
+SIMILARITY_CACHE_FILE = "similarity_cache.json"
+
+_cache = JsonCache(SIMILARITY_CACHE_FILE)
+
+
+@lru_cache(maxsize=4096)
+def _description_digest(description: str) -> bytes:
+    """
+    Hash a description; memoized because the same known-person descriptions
+    appear in every comparison.
+
+    Args:
+        description: Facial description text
+
+    Returns:
+        SHA-256 digest bytes
+    """
+    return hashlib.sha256(description.encode('utf-8')).digest()
+
+
+def make_key(model: str, description1: str, description2: str) -> str:
+    """
+    Build an order-independent cache key for a description pair.
+
+    Args:
+        model: Model identifier that produced the score
+        description1: First facial description
+        description2: Second facial description
+
+    Returns:
+        Hex digest identifying (model, {description1, description2})
+    """
+    h1 = _description_digest(description1)
+    h2 = _description_digest(description2)
+    low, high = sorted((h1, h2))
+    return hashlib.sha256(model.encode('utf-8') + b'|' + low + b'|' + high).hexdigest()
+
+
+def save_cache() -> None:
+    """
+    Write the similarity cache to disk if it has new entries.
+    """
+    _cache.save()
+
+
+def get_similarity(model: str, description1: str, description2: str) -> Optional[float]:
+    """
+    Look up a cached similarity score.
+
+    Args:
+        model: Model identifier
+        description1: First facial description
+        description2: Second facial description
+
+    Returns:
+        Cached score, or None if the pair has not been scored
+    """
+    return _cache.get(make_key(model, description1, description2))
+
+
+def set_similarity(model: str, description1: str, description2: str, score: float) -> None:
+    """
+    Store a similarity score; the cache is written on save_cache() or exit.
+
+    Args:
+        model: Model identifier
+        description1: First facial description
+        description2: Second facial description
+        score: Similarity score from 0.0 to 1.0
+    """
+    _cache.set(make_key(model, description1, description2), score)
@@ -3,27 +3,46 @@
 Test that .env configuration properly propagates through the code.
 """
 
+import ast
 import os
+import sys
+from pathlib import Path
+from typing import NamedTuple, Optional
+
 from dotenv import load_dotenv
 
+from console import SEPARATOR, print_header
+
 # Load environment
 load_dotenv()
 
-print("="*70)
-print("Configuration Propagation Test")
-print("="*70)
+
+class EnvConfig(NamedTuple):
+    """Claude settings read from the environment."""
+    use_vertex: bool
+    project_id: Optional[str]
+    region: Optional[str]
+    model_setting: Optional[str]
+
+
+# Read every setting once; the checks below only use these values
+env = os.environ
+cfg = EnvConfig(
+    use_vertex=env.get('USE_VERTEX_AI', 'false').lower() == 'true',
+    project_id=env.get('VERTEX_PROJECT_ID'),
+    region=env.get('VERTEX_REGION'),
+    model_setting=env.get('CLAUDE_MODEL'),
+)
+
+print_header("Configuration Propagation Test")
 
 # Check .env values
 print("\n1. Reading .env file:")
-use_vertex = os.getenv('USE_VERTEX_AI', 'false').lower() == 'true'
-project_id = os.getenv('VERTEX_PROJECT_ID')
-region = os.getenv('VERTEX_REGION')
-model_setting = os.getenv('CLAUDE_MODEL')
 
-print(f"   USE_VERTEX_AI: {use_vertex}")
-print(f"   VERTEX_PROJECT_ID: {project_id}")
-print(f"   VERTEX_REGION: {region}")
-print(f"   CLAUDE_MODEL: {model_setting}")
+print(f"   USE_VERTEX_AI: {cfg.use_vertex}")
+print(f"   VERTEX_PROJECT_ID: {cfg.project_id}")
+print(f"   VERTEX_REGION: {cfg.region}")
+print(f"   CLAUDE_MODEL: {cfg.model_setting}")
 
 # Check client initialization
 print("\n2. Testing get_claude_client():")
@@ -32,7 +51,7 @@ try:
     client = get_claude_client()
     print(f"   ✓ Client type: {type(client).__name__}")
 
-    if use_vertex:
+    if cfg.use_vertex:
         if "Vertex" in type(client).__name__:
             print(f"   ✓ Correctly using AnthropicVertex")
         else:
@@ -50,17 +69,17 @@ print("\n3. Testing get_model_name():")
 try:
     from claude_client import get_model_name
     resolved_model = get_model_name()
-    print(f"   Configured: {model_setting}")
+    print(f"   Configured: {cfg.model_setting}")
     print(f"   Resolved to: {resolved_model}")
 
-    if use_vertex:
+    if cfg.use_vertex:
         if '@' in resolved_model:
             print(f"   ✓ Correctly using Vertex AI format (contains '@')")
         else:
             print(f"   ✗ ERROR: Vertex AI models should contain '@'")
 
         expected = "claude-3-5-sonnet@20240620"
-        if model_setting == 'sonnet-3.5' and resolved_model == expected:
+        if cfg.model_setting == 'sonnet-3.5' and resolved_model == expected:
             print(f"   ✓ Correct mapping: sonnet-3.5 → {expected}")
         else:
             print(f"   ⚠ Warning: Expected {expected}, got {resolved_model}")
@@ -99,17 +118,19 @@ except Exception as e:
 
 print("\n   Checking compare_face_descriptions()...")
 try:
-    # Read the source to verify it calls get_model_name
-    with open('claude_client.py', 'r') as f:
-        source = f.read()
-
-    if 'def compare_face_descriptions' in source:
-        # Find the function and check if it calls get_model_name
-        start = source.find('def compare_face_descriptions')
-        end = source.find('\ndef ', start + 1)
-        function_code = source[start:end]
-
-        if 'get_model_name()' in function_code:
+    # Parse the source once and map each function to the names it calls
+    tree = ast.parse(Path('claude_client.py').read_text())
+    calls = {
+        node.name: {
+            call.func.id for call in ast.walk(node)
+            if isinstance(call, ast.Call) and isinstance(call.func, ast.Name)
+        }
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+
+    if 'compare_face_descriptions' in calls:
+        if 'get_model_name' in calls['compare_face_descriptions']:
             print(f"   ✓ Function calls get_model_name()")
         else:
             print(f"   ✗ Function does not call get_model_name()")
@@ -117,28 +138,30 @@ try:
 except Exception as e:
     print(f"   ✗ Error: {e}")
 
-# Summary
-print("\n" + "="*70)
-print("Configuration Flow Summary")
-print("="*70)
+# Summary, written in one call
+sys.stdout.write(f"""
+{SEPARATOR}
+Configuration Flow Summary
+{SEPARATOR}
 
-print(f"""
 .env file:
-  USE_VERTEX_AI={use_vertex}
-  VERTEX_PROJECT_ID={project_id}
-  VERTEX_REGION={region}
-  CLAUDE_MODEL={model_setting}
+  USE_VERTEX_AI={cfg.use_vertex}
+  VERTEX_PROJECT_ID={cfg.project_id}
+  VERTEX_REGION={cfg.region}
+  CLAUDE_MODEL={cfg.model_setting}
 
 Flow:
   1. dotenv loads .env → Environment variables
-  2. get_claude_client() → {'AnthropicVertex' if use_vertex else 'Anthropic'} client
+  2. get_claude_client() → {'AnthropicVertex' if cfg.use_vertex else 'Anthropic'} client
   3. get_model_name() → {resolved_model}
   4. API functions use get_model_name() → Consistent model everywhere
 
-Status: {'✓ Configuration properly propagates' if use_vertex else '✓ Configuration properly propagates'}
-""")
+Status: {'✓ Configuration properly propagates' if cfg.use_vertex else '✓ Configuration properly propagates'}
 
-print("="*70)
-print("\nTo test actual API connection, run:")
-print("  python test_vertex_connection.py")
-print("="*70 + "\n")
+{SEPARATOR}
+
+To test actual API connection, run:
+  python test_vertex_connection.py
+{SEPARATOR}
+
+""")
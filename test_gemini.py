@@ -7,11 +7,12 @@ import sys
 from dotenv import load_dotenv
 import os
 
+from console import SEPARATOR, print_header
+
 load_dotenv()
 
-print("="*70)
-print("Gemini Configuration Test")
-print("="*70)
+
+print_header("Gemini Configuration Test")
 
 # Check configuration
 print("\n1. Configuration:")
@@ -87,11 +88,12 @@ except Exception as e:
     print(f"   ✗ Error: {e}")
     sys.exit(1)
 
-# Summary
-print("\n" + "="*70)
-print("Summary")
-print("="*70)
-print(f"""
+# Summary, written in one call
+sys.stdout.write(f"""
+{SEPARATOR}
+Summary
+{SEPARATOR}
+
 Configuration:
   ✓ Using Gemini via Vertex AI
   ✓ Project: {project_id}
@@ -106,5 +108,7 @@ Next steps:
   1. python manage_database.py  # Add people
   2. python organize.py /path/to/photos --dry-run  # Test
   3. python organize.py /path/to/photos  # Organize!
+
+{SEPARATOR}
+
 """)
-print("="*70 + "\n")
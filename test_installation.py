@@ -5,121 +5,137 @@ Verifies that all dependencies are installed correctly.
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
 
+from console import SEPARATOR, print_header
 
-def test_imports():
-    """Test that all required packages can be imported."""
-    print("Testing package imports...")
+# Required third-party packages: (import name, display name)
+_PACKAGES = (
+    ("anthropic", "Anthropic SDK"),
+    ("PIL", "Pillow"),
+    ("dotenv", "python-dotenv"),
+    ("tqdm", "tqdm"),
+)
 
-    packages = [
-        ("anthropic", "Anthropic SDK"),
-        ("PIL", "Pillow"),
-        ("dotenv", "python-dotenv"),
-        ("tqdm", "tqdm"),
-    ]
+# Project modules that must import cleanly
+_MODULES = (
+    "claude_client",
+    "face_database",
+    "photo_organizer",
+)
+
+
+def test_imports(log=print):
+    """
+    Test that all required packages are installed.
+
+    Packages are located with find_spec() rather than imported, so their
+    (large) module trees are not loaded just to confirm they exist. The
+    lookups run concurrently to overlap their filesystem stats.
+    """
+    log("Testing package imports...")
 
     all_ok = True
 
-    for package, name in packages:
-        try:
-            __import__(package)
-            print(f"  ✓ {name}")
-        except ImportError:
-            print(f"  ✗ {name} - NOT FOUND")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        # Optional pillow-heif is looked up along with the required packages
+        specs = list(executor.map(find_spec, [package for package, _ in _PACKAGES] + ["pillow_heif"]))
+    heif_spec = specs.pop()
+
+    for (package, name), spec in zip(_PACKAGES, specs):
+        if spec is not None:
+            log(f"  ✓ {name}")
+        else:
+            log(f"  ✗ {name} - NOT FOUND")
             all_ok = False
 
     # Optional: pillow-heif
-    try:
-        __import__("pillow_heif")
-        print(f"  ✓ pillow-heif (optional, for HEIC support)")
-    except ImportError:
-        print(f"  ⚠ pillow-heif - NOT FOUND (optional, install for HEIC support)")
+    if heif_spec is not None:
+        log(f"  ✓ pillow-heif (optional, for HEIC support)")
+    else:
+        log(f"  ⚠ pillow-heif - NOT FOUND (optional, install for HEIC support)")
 
     return all_ok
 
 
-def test_modules():
+def test_modules(log=print):
     """Test that project modules can be imported."""
-    print("\nTesting project modules...")
-
-    modules = [
-        "claude_client",
-        "face_database",
-        "photo_organizer",
-    ]
+    log("\nTesting project modules...")
 
     all_ok = True
 
-    for module in modules:
+    for module in _MODULES:
         try:
+            # Actually imported (unlike the packages above): what is checked
+            # here is that the module's own imports resolve
             __import__(module)
-            print(f"  ✓ {module}.py")
+            log(f"  ✓ {module}.py")
         except ImportError as e:
-            print(f"  ✗ {module}.py - ERROR: {e}")
+            log(f"  ✗ {module}.py - ERROR: {e}")
             all_ok = False
 
     return all_ok
 
 
-def test_env():
+def test_env(log=print):
     """Test environment configuration."""
-    print("\nTesting environment...")
+    log("\nTesting environment...")
 
     import os
-    from dotenv import load_dotenv
-
-    load_dotenv()
+    from dotenv import dotenv_values
 
-    use_vertex = os.getenv('USE_VERTEX_AI', 'false').lower() == 'true'
+    # Parse .env into a dict without writing it into os.environ; variables
+    # already set in the environment win, as they do with load_dotenv()
+    env = {**dotenv_values(), **os.environ}
+    use_vertex = env.get('USE_VERTEX_AI', 'false').lower() == 'true'
 
     if use_vertex:
         # Check Vertex AI configuration
-        project_id = os.getenv('VERTEX_PROJECT_ID')
-        region = os.getenv('VERTEX_REGION', 'us-east5')
+        project_id = env.get('VERTEX_PROJECT_ID')
+        region = env.get('VERTEX_REGION', 'us-east5')
 
-        print(f"  Authentication mode: Vertex AI")
+        log(f"  Authentication mode: Vertex AI")
 
         if project_id:
-            print(f"  ✓ VERTEX_PROJECT_ID found: {project_id}")
-            print(f"  ✓ VERTEX_REGION: {region}")
-            print(f"  Note: Make sure you're authenticated with gcloud:")
-            print(f"    gcloud auth application-default login")
+            log(f"  ✓ VERTEX_PROJECT_ID found: {project_id}")
+            log(f"  ✓ VERTEX_REGION: {region}")
+            log(f"  Note: Make sure you're authenticated with gcloud:")
+            log(f"    gcloud auth application-default login")
             return True
         else:
-            print(f"  ✗ VERTEX_PROJECT_ID not found in .env file")
-            print(f"    Set up Vertex AI configuration in .env:")
-            print(f"    USE_VERTEX_AI=true")
-            print(f"    VERTEX_PROJECT_ID=your-gcp-project-id")
-            print(f"    VERTEX_REGION=us-east5")
+            log(f"  ✗ VERTEX_PROJECT_ID not found in .env file")
+            log(f"    Set up Vertex AI configuration in .env:")
+            log(f"    USE_VERTEX_AI=true")
+            log(f"    VERTEX_PROJECT_ID=your-gcp-project-id")
+            log(f"    VERTEX_REGION=us-east5")
             return False
     else:
         # Check direct Anthropic API key
-        print(f"  Authentication mode: Anthropic API")
+        log(f"  Authentication mode: Anthropic API")
 
-        api_key = os.getenv('ANTHROPIC_API_KEY')
+        api_key = env.get('ANTHROPIC_API_KEY')
 
         if api_key:
             # Mask the key for security
             masked = api_key[:10] + "..." + api_key[-4:] if len(api_key) > 14 else "***"
-            print(f"  ✓ ANTHROPIC_API_KEY found: {masked}")
+            log(f"  ✓ ANTHROPIC_API_KEY found: {masked}")
             return True
         else:
-            print(f"  ✗ ANTHROPIC_API_KEY not found in .env file")
-            print(f"    Create a .env file with your API key:")
-            print(f"    cp .env.example .env")
-            print(f"    # Then edit .env and add your key")
-            print(f"    ")
-            print(f"    Or use Vertex AI by setting:")
-            print(f"    USE_VERTEX_AI=true")
-            print(f"    VERTEX_PROJECT_ID=your-gcp-project-id")
+            log(f"  ✗ ANTHROPIC_API_KEY not found in .env file")
+            log(f"    Create a .env file with your API key:")
+            log(f"    cp .env.example .env")
+            log(f"    # Then edit .env and add your key")
+            log(f"    ")
+            log(f"    Or use Vertex AI by setting:")
+            log(f"    USE_VERTEX_AI=true")
+            log(f"    VERTEX_PROJECT_ID=your-gcp-project-id")
             return False
 
 
 def main():
     """Run all tests."""
-    print("="*70)
-    print("Photo Organizer - Installation Test")
-    print("="*70)
+    print_header("Photo Organizer - Installation Test")
 
     tests = [
         ("Package imports", test_imports),
@@ -127,42 +143,57 @@ def main():
         ("Environment", test_env),
     ]
 
-    results = []
-
-    for test_name, test_func in tests:
+    def run_test(test_name, test_func):
+        # Buffer the test's output so concurrent tests don't interleave
+        output = []
         try:
-            result = test_func()
-            results.append((test_name, result))
+            result = test_func(log=output.append)
         except Exception as e:
-            print(f"\nError running {test_name}: {e}")
-            results.append((test_name, False))
+            output.append(f"\nError running {test_name}: {e}")
+            result = False
+        return result, output
 
-    # Summary
-    print("\n" + "="*70)
-    print("Summary")
-    print("="*70)
+    # The checks are independent, so run them concurrently and print each
+    # one's output in order afterwards
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = [(test_name, executor.submit(run_test, test_name, test_func)) for test_name, test_func in tests]
+
+    results = []
+    for test_name, future in futures:
+        result, output = future.result()
+        if output:
+            print("\n".join(output))
+        results.append((test_name, result))
+
+    # Summary, collected and written at once
+    lines = [f"\n{SEPARATOR}\n", "Summary\n", f"{SEPARATOR}\n"]
 
     all_passed = True
     for test_name, result in results:
         status = "✓ PASS" if result else "✗ FAIL"
-        print(f"{status}: {test_name}")
+        lines.append(f"{status}: {test_name}\n")
         if not result:
             all_passed = False
 
-    print()
+    lines.append("\n")
 
     if all_passed:
-        print("✓ All tests passed! Installation is complete.")
-        print("\nNext steps:")
-        print("  1. Run: python manage_database.py")
-        print("  2. Add people to the database")
-        print("  3. Run: python organize.py /path/to/photos --dry-run")
+        lines += [
+            "✓ All tests passed! Installation is complete.\n",
+            "\nNext steps:\n",
+            "  1. Run: python manage_database.py\n",
+            "  2. Add people to the database\n",
+            "  3. Run: python organize.py /path/to/photos --dry-run\n",
+        ]
     else:
-        print("✗ Some tests failed. Please fix the issues above.")
-        print("\nTo install missing packages:")
-        print("  pip install -r requirements.txt")
-
-    print()
+        lines += [
+            "✗ Some tests failed. Please fix the issues above.\n",
+            "\nTo install missing packages:\n",
+            "  pip install -r requirements.txt\n",
+        ]
+
+    lines.append("\n")
+    sys.stdout.writelines(lines)
 
     return 0 if all_passed else 1
 
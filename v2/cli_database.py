@@ -4,9 +4,11 @@ Interactive CLI for managing the face database.
 Allows adding, removing, and viewing registered people.
 """
 
+import atexit
 import sys
 from pathlib import Path
 
+from console import SEPARATOR, print_header
 from v2.database import (
     add_person,
     remove_person,
@@ -17,20 +19,77 @@ from v2.database import (
     validate_database
 )
 
+# Line editing and history for input() prompts (not available on Windows)
+try:
+    import readline
+except ImportError:
+    readline = None
+
+
+# Prompt history kept between sessions
+HISTORY_FILE = Path.home() / ".biborganizer_history"
+
+
+# Main menu text, built once
+_MENU = (
+    "\n" + SEPARATOR + "\n"
+    "Outfit Database Management\n"
+    + SEPARATOR + "\n"
+    "\n1. Add outfit type to database\n"
+    "2. Remove outfit type from database\n"
+    "3. List all outfit types\n"
+    "4. View outfit details\n"
+    "5. Database statistics\n"
+    "6. Validate database\n"
+    "7. Exit\n"
+    "\n"
+)
+
+# People list shown by the remove/view menus; reset after each change
+_people_cache = None
+
+
+def _people():
+    """
+    Get the list of people, reading the database only after a change.
+
+    Returns:
+        List of person dictionaries (see list_people)
+    """
+    global _people_cache
+
+    if _people_cache is None:
+        _people_cache = list_people()
+    return _people_cache
+
+
+def _invalidate_people():
+    """Forget the cached people list after the database changes."""
+    global _people_cache
+    _people_cache = None
+
+
+def _print_people(title, people):
+    """Print a numbered list of people under a title with a single write."""
+    listing = "\n".join(f"  {i}. {person['name']}" for i, person in enumerate(people, 1))
+    sys.stdout.write(f"{title}\n{listing}\n")
+
+
+def _setup_history():
+    """Load prompt history once and save it again on exit."""
+    if readline is None:
+        return
+
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass  # No history yet
+    atexit.register(readline.write_history_file, HISTORY_FILE)
+
 
 def print_menu():
     """Print the main menu."""
-    print("\n" + "="*70)
-    print("Outfit Database Management")
-    print("="*70)
-    print("\n1. Add outfit type to database")
-    print("2. Remove outfit type from database")
-    print("3. List all outfit types")
-    print("4. View outfit details")
-    print("5. Database statistics")
-    print("6. Validate database")
-    print("7. Exit")
-    print()
+    sys.stdout.write(_MENU)
 
 
 def add_person_interactive():
@@ -52,10 +111,11 @@ def add_person_interactive():
         return
 
     # Expand user home directory if needed
-    ref_image = str(Path(ref_image).expanduser())
+    ref_path = Path(ref_image).expanduser()
+    ref_image = str(ref_path)
 
-    # Check if file exists
-    if not Path(ref_image).exists():
+    # Check if file exists (a directory is not a usable reference image)
+    if not ref_path.is_file():
         print(f"Error: File not found: {ref_image}")
         return
 
@@ -78,6 +138,7 @@ def add_person_interactive():
     try:
         success = add_person(name, ref_image, notes)
         if success:
+            _invalidate_people()
             print(f"\nSuccessfully added {name} to database!")
     except ValueError as e:
         print(f"\nError: {e}")
@@ -92,14 +153,12 @@ def remove_person_interactive():
     print("\n--- Remove Person from Database ---\n")
 
     # Show current people
-    people = list_people()
+    people = _people()
     if not people:
         print("Database is empty.")
         return
 
-    print("Current people in database:")
-    for i, person in enumerate(people, 1):
-        print(f"  {i}. {person['name']}")
+    _print_people("Current people in database:", people)
 
     # Get name
     name = input("\nEnter name to remove: ").strip()
@@ -116,6 +175,7 @@ def remove_person_interactive():
     # Remove person
     success = remove_person(name)
     if success:
+        _invalidate_people()
         print(f"\nSuccessfully removed {name} from database!")
 
 
@@ -124,14 +184,12 @@ def view_person_details_interactive():
     print("\n--- View Person Details ---\n")
 
     # Show current people
-    people = list_people()
+    people = _people()
     if not people:
         print("Database is empty.")
         return
 
-    print("People in database:")
-    for i, person in enumerate(people, 1):
-        print(f"  {i}. {person['name']}")
+    _print_people("People in database:", people)
 
     # Get name
     name = input("\nEnter name to view: ").strip()
@@ -147,9 +205,7 @@ def show_database_stats():
     """Show database statistics."""
     stats = database_stats()
 
-    print("\n" + "="*70)
-    print("Database Statistics")
-    print("="*70)
+    print_header("Database Statistics", blank_line_before=True)
 
     if stats['total_people'] == 0:
         print("\nDatabase is empty.")
@@ -173,36 +229,39 @@ def validate_database_interactive():
             print(f"  {i}. {issue}")
 
 
+# Menu choice -> handler (choice '7' exits)
+_ACTIONS = {
+    '1': add_person_interactive,
+    '2': remove_person_interactive,
+    '3': display_all_people,
+    '4': view_person_details_interactive,
+    '5': show_database_stats,
+    '6': validate_database_interactive,
+}
+
+
 def main():
     """Main interactive loop."""
-    print("\n" + "="*70)
-    print("Photo Organizer V2 - Outfit Database Management")
-    print("="*70)
+    print_header("Photo Organizer V2 - Outfit Database Management", blank_line_before=True)
     print("\nThis tool manages the database of outfit types.")
     print("Add outfit types with reference photos for database mode organization.")
     print("\nNOTE: For auto-cluster mode, you don't need a database!")
     print("      Just run: python -m v2.cli_organize /path/to/photos --mode auto-cluster")
 
+    _setup_history()
+
     while True:
         print_menu()
 
         choice = input("Enter choice (1-7): ").strip()
 
-        if choice == '1':
-            add_person_interactive()
-        elif choice == '2':
-            remove_person_interactive()
-        elif choice == '3':
-            display_all_people()
-        elif choice == '4':
-            view_person_details_interactive()
-        elif choice == '5':
-            show_database_stats()
-        elif choice == '6':
-            validate_database_interactive()
-        elif choice == '7':
+        if choice == '7':
             print("\nGoodbye!")
             sys.exit(0)
+
+        handler = _ACTIONS.get(choice)
+        if handler:
+            handler()
         else:
             print("\nInvalid choice. Please enter 1-7.")
 
@@ -11,6 +11,9 @@ import os
 from pathlib import Path
 
 from v2.organizer import (
+    DEFAULT_API_WORKERS,
+    DEFAULT_SIMILAR_DISTANCE,
+    MAX_DATABASE_SIMILAR_DISTANCE,
     scan_directory_for_images,
     create_organization_plan,
     auto_cluster_photos,
@@ -20,6 +23,8 @@ from v2.organizer import (
 )
 from v2.database import load_database, get_all_facial_descriptions, validate_database
 from v2.config import load_config
+from v2.similarity_cache import disable_cache as disable_similarity_cache
+from v2.image_utils import disable_prepared_cache, prune_prepared_cache
 
 
 def validate_inputs(args):
@@ -48,9 +53,21 @@ def validate_inputs(args):
         print(f"Error: Not a directory: {args.source_dir}")
         return False
 
+    # Check worker counts (pools need at least one worker)
+    if args.api_workers < 1:
+        print(f"Error: --api-workers must be at least 1, got {args.api_workers}")
+        return False
+
+    if args.prep_workers is not None and args.prep_workers < 1:
+        print(f"Error: --prep-workers must be at least 1, got {args.prep_workers}")
+        return False
+
     # Check if output directory exists and is not empty (warn)
     if os.path.exists(args.output):
-        if os.listdir(args.output):
+        # Stop at the first entry instead of listing the whole directory
+        with os.scandir(args.output) as entries:
+            not_empty = next(entries, None) is not None
+        if not_empty:
             print(f"Warning: Output directory is not empty: {args.output}")
             if not args.dry_run:
                 confirm = input("Continue anyway? (y/n): ").strip().lower()
@@ -88,6 +105,26 @@ def validate_inputs(args):
     return True
 
 
+def _summarize_groups(groups, format_key):
+    """
+    Count the photos in a plan section and build its per-group lines, sorted by name.
+
+    Args:
+        groups: Dictionary mapping group keys to photo path lists
+        format_key: Function turning a group key into its display name
+
+    Returns:
+        Tuple of (total photo count, list of lines to print)
+    """
+    total = 0
+    lines = []
+    for key, paths in sorted(groups.items()):
+        total += len(paths)
+        lines.append(f"  - {format_key(key)}: {len(paths)} photos")
+
+    return total, lines
+
+
 def print_plan_summary(plan):
     """
     Display organization plan summary.
@@ -100,17 +137,16 @@ def print_plan_summary(plan):
     print("="*70 + "\n")
 
     # Single outfit photos
-    single_total = sum(len(paths) for paths in plan['single_person'].values())
+    single_total, single_lines = _summarize_groups(plan['single_person'], str)
     print(f"Similar outfit groups: {single_total}")
-    for name, paths in sorted(plan['single_person'].items()):
-        print(f"  - {name}: {len(paths)} photos")
+    if single_lines:
+        print("\n".join(single_lines))
 
     # Multiple people photos
-    multi_total = sum(len(paths) for paths in plan['multiple_people'].values())
+    multi_total, multi_lines = _summarize_groups(plan['multiple_people'], " & ".join)
     print(f"\nMultiple people in photo: {multi_total}")
-    for names, paths in sorted(plan['multiple_people'].items()):
-        names_str = " & ".join(names)
-        print(f"  - {names_str}: {len(paths)} photos")
+    if multi_lines:
+        print("\n".join(multi_lines))
 
     # Unknown outfits
     print(f"\nUnknown outfits: {len(plan['unknown'])} photos")
@@ -147,6 +183,9 @@ Examples:
   # Move files instead of copying
   python -m v2.cli_organize /path/to/photos --copy-or-move move
 
+  # Hard-link files instead of copying (no extra disk space on the same filesystem)
+  python -m v2.cli_organize /path/to/photos --copy-or-move link
+
   # Preview organization without making changes
   python -m v2.cli_organize /path/to/photos --dry-run
 
@@ -156,6 +195,12 @@ Examples:
   # Adjust confidence threshold (higher = stricter color matching)
   python -m v2.cli_organize /path/to/photos --confidence 0.8
 
+  # Limit concurrent Vertex AI requests and image preparation processes
+  python -m v2.cli_organize /path/to/photos --api-workers 4 --prep-workers 2
+
+  # Send only one photo of each near-duplicate burst to the API (opt-in)
+  python -m v2.cli_organize /path/to/photos --similar-distance 4
+
 Note: Use auto-cluster mode to automatically group by outfit colors!
       For database mode, run 'python -m v2.cli_database' first to register outfit types.
         """
@@ -183,9 +228,9 @@ Note: Use auto-cluster mode to automatically group by outfit colors!
 
     parser.add_argument(
         '--copy-or-move',
-        choices=['copy', 'move'],
+        choices=['copy', 'move', 'link'],
         default='copy',
-        help='Copy or move files (default: copy)'
+        help='Copy, move or hard-link files; link copies across filesystems (default: copy)'
     )
 
     parser.add_argument(
@@ -214,8 +259,44 @@ Note: Use auto-cluster mode to automatically group by outfit colors!
         help='Undo previous organization and restore original files'
     )
 
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the outfit comparison cache or the prepared image cache '
+             '(re-score every pair and re-encode every photo)'
+    )
+
+    parser.add_argument(
+        '--prep-workers',
+        type=int,
+        default=None,
+        help='Processes preparing images for the API (default: one per CPU)'
+    )
+
+    parser.add_argument(
+        '--api-workers', '--max-concurrency',
+        dest='api_workers',
+        type=int,
+        default=DEFAULT_API_WORKERS,
+        help=f'Concurrent Vertex AI requests (default: {DEFAULT_API_WORKERS})'
+    )
+
+    parser.add_argument(
+        '--similar-distance',
+        type=int,
+        default=DEFAULT_SIMILAR_DISTANCE,
+        help=f'Photos whose perceptual hashes differ in at most this many bits (of 64) from a burst\'s '
+             f'first photo share its outfit detection (and cluster); 0 disables, small values such as 4 '
+             f'are safest, database mode allows at most {MAX_DATABASE_SIMILAR_DISTANCE} (identical copies are '
+             f'always shared) (default: {DEFAULT_SIMILAR_DISTANCE})'
+    )
+
     args = parser.parse_args()
 
+    if args.no_cache:
+        disable_similarity_cache()
+        disable_prepared_cache()
+
     # Load config to get default confidence if not specified
     if args.confidence is None:
         config = load_config()
@@ -283,7 +364,8 @@ Note: Use auto-cluster mode to automatically group by outfit colors!
             print("\nThis may take a while depending on the number of photos...")
             print("Photos will be grouped by similar outfits (Outfit_1_Blue_Red, Outfit_2_Green, etc.)\n")
 
-            plan = auto_cluster_photos(image_files, args.confidence)
+            plan = auto_cluster_photos(image_files, args.confidence, args.prep_workers, args.api_workers,
+                                       args.similar_distance)
 
         else:
             # Database mode
@@ -299,7 +381,11 @@ Note: Use auto-cluster mode to automatically group by outfit colors!
             print("="*70)
             print("\nThis may take a while depending on the number of photos...")
 
-            plan = create_organization_plan(image_files, outfit_db, args.confidence)
+            plan = create_organization_plan(image_files, outfit_db, args.confidence, args.prep_workers, args.api_workers,
+                                            args.similar_distance)
+
+        # Keep the prepared image cache within its size limit
+        prune_prepared_cache()
 
         # Display plan summary
         print_plan_summary(plan)
@@ -336,7 +422,7 @@ Note: Use auto-cluster mode to automatically group by outfit colors!
         print(f"\nOrganized photos are in: {args.output}")
         print(f"Organization log: {args.output}/organization_log.json")
 
-        if args.copy_or_move == 'copy':
+        if args.copy_or_move in ('copy', 'link'):
             print(f"\nOriginal files remain in: {args.source_dir}")
         else:
             print(f"\nOriginal files have been moved from: {args.source_dir}")
@@ -5,14 +5,19 @@ Loads settings from .env file and provides validation.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
 
+@lru_cache(maxsize=1)
 def load_config():
     """
     Load configuration from .env file.
 
+    The .env file is read once per process; later calls return the same
+    dictionary, so callers must not modify it.
+
     Returns:
         dict: Configuration dictionary with the following keys:
             - project_id: GCP project ID (required)
@@ -21,6 +26,7 @@ def load_config():
             - confidence_threshold: Similarity threshold (default: 0.5)
             - timestamp_exact_match_seconds: Time window for automatic clustering (default: 10)
             - timestamp_high_priority_seconds: Time window for high priority clustering (default: 30)
+            - max_retries: Retries of rate-limited or failed API requests (default: 5)
 
     Raises:
         ValueError: If required configuration is missing
@@ -35,7 +41,8 @@ def load_config():
         'model': os.getenv('CLAUDE_MODEL', 'claude-3-5-sonnet@20240620'),
         'confidence_threshold': float(os.getenv('CONFIDENCE_THRESHOLD', '0.5')),
         'timestamp_exact_match_seconds': int(os.getenv('TIMESTAMP_EXACT_MATCH_SECONDS', '10')),
-        'timestamp_high_priority_seconds': int(os.getenv('TIMESTAMP_HIGH_PRIORITY_SECONDS', '30'))
+        'timestamp_high_priority_seconds': int(os.getenv('TIMESTAMP_HIGH_PRIORITY_SECONDS', '30')),
+        'max_retries': int(os.getenv('API_MAX_RETRIES', '5'))
     }
 
     validate_config(config)
@@ -87,3 +94,9 @@ def validate_config(config):
             f"TIMESTAMP_EXACT_MATCH_SECONDS ({exact_match}) cannot be greater than "
             f"TIMESTAMP_HIGH_PRIORITY_SECONDS ({high_priority})"
         )
+
+    max_retries = config.get('max_retries', 0)
+    if max_retries < 0 or max_retries > 20:
+        raise ValueError(
+            f"API_MAX_RETRIES must be between 0 and 20, got {max_retries}"
+        )
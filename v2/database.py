@@ -5,33 +5,72 @@ Uses JSON file for persistence with facial descriptions from Claude.
 
 import json
 import os
+from collections import Counter
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, List, Optional
 
-from v2.vertex_claude import generate_outfit_description
+# Prefer the faster orjson serializer when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # Database file path
 DATABASE_FILE = "face_database.json"
 
+# Last parsed database, the file version it was read from, and its
+# lowercase-name index (built on first lookup)
+_DB_CACHE = {'key': None, 'data': None, 'index': None}
+
+
+def _database_file_key() -> Optional[tuple]:
+    """
+    Identify the current version of the database file.
+
+    Returns:
+        (mtime_ns, size) of the file, or None if it does not exist
+    """
+    try:
+        stat = os.stat(DATABASE_FILE)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
 
 def load_database() -> Dict:
     """
     Load face database from JSON file.
 
+    The parsed database is cached and only re-read when the file changes.
+    The returned dictionary is shared, so callers that modify it must save
+    it with save_database().
+
     Returns:
         Database dictionary with 'people' list
     """
-    if not os.path.exists(DATABASE_FILE):
+    file_key = _database_file_key()
+    if file_key is None:
         return {"people": []}
 
+    if _DB_CACHE['key'] == file_key:
+        return _DB_CACHE['data']
+
     try:
-        with open(DATABASE_FILE, 'r') as f:
-            return json.load(f)
-    except json.JSONDecodeError:
+        if orjson is not None:
+            with open(DATABASE_FILE, 'rb') as f:
+                db = orjson.loads(f.read())
+        else:
+            with open(DATABASE_FILE, 'r') as f:
+                db = json.load(f)
+    except json.JSONDecodeError:  # also raised by orjson
         print(f"Warning: {DATABASE_FILE} is corrupted. Creating new database.")
-        return {"people": []}
+        db = {"people": []}
+
+    _DB_CACHE['key'] = file_key
+    _DB_CACHE['data'] = db
+    _DB_CACHE['index'] = None
+    return db
 
 
 def save_database(db: Dict) -> None:
@@ -41,8 +80,42 @@ def save_database(db: Dict) -> None:
     Args:
         db: Database dictionary to save
     """
-    with open(DATABASE_FILE, 'w') as f:
-        json.dump(db, f, indent=2)
+    if orjson is not None:
+        with open(DATABASE_FILE, 'wb') as f:
+            f.write(orjson.dumps(db, option=orjson.OPT_INDENT_2))
+    else:
+        with open(DATABASE_FILE, 'w') as f:
+            json.dump(db, f, indent=2)
+
+    # The saved dictionary is now the current version of the file
+    _DB_CACHE['key'] = _database_file_key()
+    _DB_CACHE['data'] = db
+    _DB_CACHE['index'] = None
+
+
+def _name_index(db: Dict) -> Dict[str, int]:
+    """
+    Map lowercase names to their position in db['people'].
+
+    The index is kept with the cached database and rebuilt after it is
+    reloaded or saved.
+
+    Args:
+        db: Database dictionary from load_database()
+
+    Returns:
+        Dictionary mapping lowercase names to list indices (first entry wins)
+    """
+    if _DB_CACHE['data'] is db and _DB_CACHE['index'] is not None:
+        return _DB_CACHE['index']
+
+    index = {}
+    for i, person in enumerate(db['people']):
+        index.setdefault(person['name'].lower(), i)
+
+    if _DB_CACHE['data'] is db:
+        _DB_CACHE['index'] = index
+    return index
 
 
 def add_person(name: str, reference_image_path: str, notes: str = "") -> bool:
@@ -69,12 +142,16 @@ def add_person(name: str, reference_image_path: str, notes: str = "") -> bool:
     db = load_database()
 
     # Check if outfit already exists
-    if any(p['name'].lower() == name.lower() for p in db['people']):
+    if name.lower() in _name_index(db):
         raise ValueError(f"Outfit '{name}' already exists in database")
 
     print(f"Generating outfit description for {name}...")
     print("This may take a few seconds...")
 
+    # Imported here so database commands that never call Claude do not load
+    # the API client
+    from v2.vertex_claude import generate_outfit_description
+
     try:
         # Generate outfit description using Claude
         outfit_description = generate_outfit_description(reference_image_path)
@@ -82,7 +159,7 @@ def add_person(name: str, reference_image_path: str, notes: str = "") -> bool:
         # Create outfit entry
         person = {
             "name": name,
-            "reference_image": str(Path(reference_image_path).absolute()),
+            "reference_image": os.path.abspath(reference_image_path),
             "facial_description": outfit_description,  # Keep key name for compatibility
             "notes": notes,
             "added_date": datetime.now().isoformat()
@@ -114,18 +191,16 @@ def remove_person(name: str) -> bool:
     """
     db = load_database()
 
-    # Find and remove person
-    original_count = len(db['people'])
-    db['people'] = [p for p in db['people'] if p['name'].lower() != name.lower()]
-
-    if len(db['people']) < original_count:
-        save_database(db)
-        print(f"Removed {name} from database.")
-        return True
-    else:
+    if name.lower() not in _name_index(db):
         print(f"Person '{name}' not found in database.")
         return False
 
+    # Remove every entry with this name
+    db['people'] = [p for p in db['people'] if p['name'].lower() != name.lower()]
+    save_database(db)
+    print(f"Removed {name} from database.")
+    return True
+
 
 def get_person(name: str) -> Optional[Dict]:
     """
@@ -139,11 +214,8 @@ def get_person(name: str) -> Optional[Dict]:
     """
     db = load_database()
 
-    for person in db['people']:
-        if person['name'].lower() == name.lower():
-            return person
-
-    return None
+    i = _name_index(db).get(name.lower())
+    return db['people'][i] if i is not None else None
 
 
 def list_people() -> List[Dict]:
@@ -291,9 +363,9 @@ def validate_database() -> List[str]:
                 issues.append(f"{prefix} ({person.get('name', 'Unknown')}): Reference image not found: {person['reference_image']}")
 
     # Check for duplicate names
-    names = [p.get('name', '').lower() for p in db['people']]
-    duplicates = [name for name in names if names.count(name) > 1]
+    name_counts = Counter(p.get('name', '').lower() for p in db['people'])
+    duplicates = [name for name, count in name_counts.items() if count > 1]
     if duplicates:
-        issues.append(f"Duplicate names found: {', '.join(set(duplicates))}")
+        issues.append(f"Duplicate names found: {', '.join(duplicates)}")
 
     return issues
@@ -4,31 +4,126 @@ Image processing utilities for Photo Organizer V2.
 Handles image loading, format conversion, resizing, and compression.
 """
 
-import base64
+import hashlib
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from io import BytesIO
 from pathlib import Path
 from datetime import datetime
 import subprocess
 import re
+import threading
 from PIL import Image
 from PIL.ExifTags import TAGS
-import pillow_heif
 
+# Prefer the SIMD-accelerated base64 encoder when available
+try:
+    from pybase64 import b64encode_as_string as _b64encode_as_string
+except ImportError:
+    import base64
 
-# Register HEIF opener with Pillow
-pillow_heif.register_heif_opener()
+    def _b64encode_as_string(data):
+        return base64.b64encode(data).decode('ascii')
+
+# Prefer libjpeg-turbo's SIMD encoder through PyTurboJPEG when available
+try:
+    import numpy as np
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
 
 
 # Supported image formats
 SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.heif'}
+_SUPPORTED_SUFFIXES = tuple(SUPPORTED_FORMATS)
+
+# Formats that need the pillow_heif opener
+_HEIF_SUFFIXES = ('.heic', '.heif')
+
+# Whether the HEIF opener has been registered with Pillow yet
+_HEIF_REGISTERED = False
+
+# Per-thread JPEG encode buffer, reused across encodes
+_tls = threading.local()
+
+# JPEG qualities tried when compressing for the API, best first
+JPEG_QUALITY_LADDER = [80, 70, 60, 50, 40, 30, 25]
+
+# Claude downscales images above about 1.15 megapixels before the model sees
+# them, so larger uploads only add transfer time and cost
+MAX_API_PIXELS = 1_150_000
+
+# Typical JPEG size per pixel at medium quality, used to pick a resize target
+ESTIMATED_JPEG_BYTES_PER_PIXEL = 0.25
+
+# Prepared API images are cached here across runs (override with BIBORGANIZER_CACHE_DIR)
+PREPARED_CACHE_DIR = Path(os.getenv('BIBORGANIZER_CACHE_DIR', Path.home() / ".cache" / "biborganizer"))
+
+# Total size of the prepared image cache; prune_prepared_cache() removes the
+# least recently used images beyond it
+PREPARED_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+# Environment variable that turns the prepared image cache off; an
+# environment variable also reaches the image preparation worker processes
+PREPARED_CACHE_DISABLE_ENV = 'BIBORGANIZER_NO_IMAGE_CACHE'
+
+# Prepared API images kept in memory per process
+PREPARED_IMAGE_CACHE_SIZE = 32
+
+# Side of the grayscale grid compared by compute_image_hash (hash bits = size**2)
+IMAGE_HASH_SIZE = 8
 
+# Bytes read from each end of a file by hash_file_sample
+FILE_SAMPLE_BYTES = 64 * 1024
 
-def load_image(file_path):
+# Read size used by hash_file
+FILE_HASH_CHUNK_BYTES = 1024 * 1024
+
+# Images prepared ahead of the consumer per worker process in
+# prepare_images_for_api (bounds memory held by finished results)
+PREPARE_PREFETCH_PER_WORKER = 2
+
+# Creation date line in `mdls` output (macOS timestamp fallback)
+_MDLS_DATE_RE = re.compile(r'kMDItemContentCreationDate\s*=\s*(.+)')
+
+
+def _ensure_heif(file_path):
+    """
+    Register the HEIF opener with Pillow before opening a HEIC/HEIF file.
+
+    pillow_heif is imported on first use so that commands which never open
+    HEIC files do not pay for loading it.
+
+    Args:
+        file_path: Path to the image about to be opened
+    """
+    global _HEIF_REGISTERED
+
+    if _HEIF_REGISTERED or not str(file_path).lower().endswith(_HEIF_SUFFIXES):
+        return
+
+    import pillow_heif
+    pillow_heif.register_heif_opener()
+    _HEIF_REGISTERED = True
+
+
+def load_image(file_path, target_dimension=None, target_pixels=None):
     """
     Load an image from file, handling HEIC/HEIF conversion.
 
+    With target_dimension or target_pixels, large images are decoded at
+    reduced size where the format allows it: JPEGs are scaled by 1/2, 1/4 or
+    1/8 inside libjpeg and HEIC files use an embedded thumbnail if one is big
+    enough. The result is never smaller than the target size.
+
     Args:
         file_path: Path to image file
+        target_dimension: Longest side the caller will resize to (default: full size)
+        target_pixels: Pixel count the caller will resize to (default: full size)
 
     Returns:
         PIL.Image: Loaded image object
@@ -37,20 +132,31 @@ def load_image(file_path):
         ValueError: If file format is not supported
         FileNotFoundError: If file does not exist
     """
-    path = Path(file_path)
+    suffix = os.path.splitext(file_path)[1]
 
-    if not path.exists():
+    if not os.path.exists(file_path):
         raise FileNotFoundError(f"Image file not found: {file_path}")
 
-    if path.suffix.lower() not in SUPPORTED_FORMATS:
+    if suffix.lower() not in SUPPORTED_FORMATS:
         raise ValueError(
-            f"Unsupported image format: {path.suffix}. "
+            f"Unsupported image format: {suffix}. "
             f"Supported formats: {', '.join(SUPPORTED_FORMATS)}"
         )
 
-    # Load image (HEIC/HEIF handled automatically by pillow_heif)
+    # Load image (HEIC/HEIF handled by the pillow_heif opener)
+    _ensure_heif(file_path)
     image = Image.open(file_path)
 
+    # Let the decoder skip detail that the caller's resize would discard
+    width, height = image.size
+    ratio = 1.0
+    if target_dimension:
+        ratio = min(ratio, target_dimension / width, target_dimension / height)
+    if target_pixels:
+        ratio = min(ratio, math.sqrt(target_pixels / (width * height)))
+    if ratio < 1.0:
+        image.draft('RGB', (max(1, int(width * ratio)), max(1, int(height * ratio))))
+
     # Convert to RGB if necessary (handles RGBA, P, L, etc.)
     if image.mode not in ('RGB', 'L'):
         image = image.convert('RGB')
@@ -58,15 +164,67 @@ def load_image(file_path):
     return image
 
 
-def prepare_image_for_api(image, max_dimension=3000, max_size_bytes=3.8 * 1024 * 1024):
+def _get_scratch_buffer():
+    """
+    Get this thread's reusable encode buffer, emptied and rewound.
+
+    Reusing one buffer keeps it at its largest size instead of growing a new
+    BytesIO from empty on every trial encode.
+
+    Returns:
+        BytesIO ready for writing
+    """
+    buffer = getattr(_tls, 'buffer', None)
+    if buffer is None:
+        buffer = _tls.buffer = BytesIO()
+    buffer.seek(0)
+    buffer.truncate()
+    return buffer
+
+
+def _jpeg_encoder(image):
+    """
+    Build a function that encodes an RGB image as JPEG at a given quality.
+
+    Uses PyTurboJPEG when installed, converting the pixels to an array once
+    so repeated encodes at different qualities share it; otherwise Pillow.
+    Both encode in a single pass, without Huffman table optimization.
+
+    Args:
+        image: PIL.Image object in RGB mode
+
+    Returns:
+        callable: quality -> JPEG bytes
+    """
+    if _turbo_jpeg is not None:
+        pixels = np.asarray(image)
+        return lambda quality: _turbo_jpeg.encode(
+            pixels, quality=quality, pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420
+        )
+
+    def encode(quality):
+        buffer = _get_scratch_buffer()
+        image.save(buffer, format='JPEG', quality=quality)
+        return buffer.getvalue()
+
+    return encode
+
+
+def prepare_image_for_api(image, max_dimension=3000, max_size_bytes=3.8 * 1024 * 1024, max_pixels=MAX_API_PIXELS):
     """
     Prepare image for API submission by resizing and compressing.
     GUARANTEED to return image under max_size_bytes.
 
+    The image is resized once, to a size estimated to fit the byte budget,
+    and then only the JPEG quality is tuned (by binary search over
+    JPEG_QUALITY_LADDER). It is shrunk further only if
+    even the lowest quality does not fit.
+
     Args:
         image: PIL.Image object
         max_dimension: Maximum width or height in pixels (default: 3000 for safety)
         max_size_bytes: Maximum file size in bytes (default: 3.8MB for safety margin)
+        max_pixels: Maximum width * height (default: MAX_API_PIXELS; None for no limit)
 
     Returns:
         bytes: JPEG-encoded image data, guaranteed under max_size_bytes
@@ -75,91 +233,359 @@ def prepare_image_for_api(image, max_dimension=3000, max_size_bytes=3.8 * 1024 *
     if image.mode != 'RGB':
         image = image.convert('RGB')
 
-    # Start with aggressive resize
+    # Scale to fit the dimension and pixel limits and the estimated byte budget
     width, height = image.size
-    if width > max_dimension or height > max_dimension:
-        # Calculate new dimensions maintaining aspect ratio
-        if width > height:
-            new_width = max_dimension
-            new_height = int(height * (max_dimension / width))
-        else:
-            new_height = max_dimension
-            new_width = int(width * (max_dimension / height))
-
-        image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-    # Helper function to compress
-    def compress_image(img, quality):
-        buffer = BytesIO()
-        img.save(buffer, format='JPEG', quality=quality, optimize=True)
-        size = buffer.tell()
-        buffer.seek(0)
-        return buffer.read(), size
-
-    # Try reducing quality first
-    for quality in [80, 70, 60, 50, 40, 30, 25]:
-        data, size = compress_image(image, quality)
-        if size <= max_size_bytes:
+    scale = min(
+        1.0,
+        max_dimension / width,
+        max_dimension / height,
+        math.sqrt(max_size_bytes / (width * height * ESTIMATED_JPEG_BYTES_PER_PIXEL)),
+    )
+    if max_pixels:
+        scale = min(scale, math.sqrt(max_pixels / (width * height)))
+
+    while True:
+        new_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        current_image = image if new_size == image.size else image.resize(new_size, Image.Resampling.LANCZOS)
+
+        # JPEG size grows with quality, so binary-search the ladder for the
+        # highest quality that fits instead of trying each level in turn
+        encode = _jpeg_encoder(current_image)
+        qualities = sorted(JPEG_QUALITY_LADDER)
+        best = None
+        low, high = 0, len(qualities) - 1
+        while low <= high:
+            mid = (low + high) // 2
+            data = encode(qualities[mid])
+            if len(data) <= max_size_bytes:
+                best = data
+                low = mid + 1
+            else:
+                high = mid - 1
+
+        if best is not None:
+            return best
+
+        if new_size == (1, 1):
+            # Cannot shrink further (never reached with realistic limits)
             return data
 
-    # Quality reduction wasn't enough - progressively shrink the image
-    current_image = image
-    width, height = image.size
+        # Even the lowest quality is too large - shrink and try again
+        scale *= 0.7
+
+
+def prepare_image_for_api_cached(file_path, max_dimension=3000, max_size_bytes=3.8 * 1024 * 1024):
+    """
+    Load and prepare an image file for the API, reusing earlier results.
+
+    Prepared bytes are stored in PREPARED_CACHE_DIR, keyed by the file's
+    path, modification time and size and the preparation limits, so
+    re-running on the same photos skips decoding and encoding. The cache is
+    bounded by prune_prepared_cache() and skipped entirely once
+    disable_prepared_cache() has been called.
+
+    Args:
+        file_path: Path to image file
+        max_dimension: Maximum width or height in pixels (default: 3000 for safety)
+        max_size_bytes: Maximum file size in bytes (default: 3.8MB for safety margin)
+
+    Returns:
+        bytes: JPEG-encoded image data, guaranteed under max_size_bytes
+
+    Raises:
+        ValueError: If file format is not supported
+        FileNotFoundError: If file does not exist
+    """
+    path = os.path.abspath(file_path)
+    if os.getenv(PREPARED_CACHE_DISABLE_ENV):
+        return prepare_image_for_api(load_image(path, max_dimension, MAX_API_PIXELS), max_dimension, max_size_bytes)
+
+    stat = os.stat(path)
+    key = hashlib.blake2b(
+        f"{path}|{stat.st_mtime_ns}|{stat.st_size}|{max_dimension}|{int(max_size_bytes)}|{MAX_API_PIXELS}".encode('utf-8'),
+        digest_size=16,
+    ).hexdigest()
+    cache_path = PREPARED_CACHE_DIR / f"{key}.jpg"
+
+    try:
+        data = cache_path.read_bytes()
+    except FileNotFoundError:
+        pass
+    else:
+        # Mark as recently used for prune_prepared_cache() (atime is often not updated)
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return data
+
+    data = prepare_image_for_api(load_image(path, max_dimension, MAX_API_PIXELS), max_dimension, max_size_bytes)
+
+    # The cache is best-effort: an unwritable cache directory only costs speed
+    try:
+        PREPARED_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
 
-    # Try progressively smaller sizes
-    for target_pixels in [2000, 1600, 1200, 1000, 800, 600]:
-        if width > height:
-            new_width = min(target_pixels, width)
-            new_height = int(height * (new_width / width))
-        else:
-            new_height = min(target_pixels, height)
-            new_width = int(width * (new_height / height))
-
-        current_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-        # Try multiple qualities at this size
-        for quality in [70, 60, 50, 40, 30]:
-            data, size = compress_image(current_image, quality)
-            if size <= max_size_bytes:
-                return data
-
-    # ABSOLUTE LAST RESORT: Keep shrinking until it fits
-    # This GUARANTEES we return something under the limit
-    current_width = 500
-    while current_width > 100:
-        if width > height:
-            new_width = current_width
-            new_height = int(height * (current_width / width))
-        else:
-            new_height = current_width
-            new_width = int(width * (current_width / height))
-
-        tiny_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-        for quality in [50, 40, 30, 20]:
-            data, size = compress_image(tiny_image, quality)
-            if size <= max_size_bytes:
-                return data
-
-        current_width -= 50
-
-    # If we got here, return the smallest possible (should never happen)
-    tiny = image.resize((200, int(200 * height / width)), Image.Resampling.LANCZOS)
-    data, _ = compress_image(tiny, 20)
     return data
 
 
+def disable_prepared_cache():
+    """
+    Turn the prepared image cache off for this process and its workers.
+    """
+    os.environ[PREPARED_CACHE_DISABLE_ENV] = '1'
+
+
+def prune_prepared_cache(max_bytes=PREPARED_CACHE_MAX_BYTES):
+    """
+    Remove the least recently used prepared images until the cache fits max_bytes.
+
+    Args:
+        max_bytes: Cache size limit in bytes
+
+    Returns:
+        int: Number of cached images removed
+    """
+    entries = []
+    total = 0
+    try:
+        with os.scandir(PREPARED_CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith('.jpg') and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+    except OSError:
+        return 0
+
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+
+    return removed
+
+
+def prepare_image_for_api_by_path(file_path, max_dimension=3000, max_size_bytes=3.8 * 1024 * 1024):
+    """
+    Load and prepare an image file for the API, memoized in this process.
+
+    Results are kept in memory keyed by path, modification time, size and
+    the preparation limits, on top of the on-disk cache of
+    prepare_image_for_api_cached().
+
+    Args:
+        file_path: Path to image file
+        max_dimension: Maximum width or height in pixels (default: 3000 for safety)
+        max_size_bytes: Maximum file size in bytes (default: 3.8MB for safety margin)
+
+    Returns:
+        bytes: JPEG-encoded image data, guaranteed under max_size_bytes
+
+    Raises:
+        ValueError: If file format is not supported
+        FileNotFoundError: If file does not exist
+    """
+    path = os.path.abspath(file_path)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Image file not found: {file_path}")
+
+    return _prepare_image_for_api_by_stat(path, stat.st_mtime_ns, stat.st_size, max_dimension, max_size_bytes)
+
+
+@lru_cache(maxsize=PREPARED_IMAGE_CACHE_SIZE)
+def _prepare_image_for_api_by_stat(path, mtime_ns, size, max_dimension, max_size_bytes):
+    """
+    Cached worker for prepare_image_for_api_by_path().
+
+    Args:
+        path: Absolute path to image file
+        mtime_ns: File modification time in nanoseconds (cache key only)
+        size: File size in bytes (cache key only)
+        max_dimension: Maximum width or height in pixels
+        max_size_bytes: Maximum file size in bytes
+
+    Returns:
+        bytes: JPEG-encoded image data
+    """
+    return prepare_image_for_api_cached(path, max_dimension, max_size_bytes)
+
+
+def _prepare_file_for_api(file_path, max_dimension, max_size_bytes):
+    """
+    Load and prepare one image file; runs in a worker process.
+
+    Args:
+        file_path: Path to image file
+        max_dimension: Maximum width or height in pixels
+        max_size_bytes: Maximum file size in bytes
+
+    Returns:
+        bytes: JPEG-encoded image data, or None if the image could not be prepared
+    """
+    try:
+        return prepare_image_for_api_by_path(file_path, max_dimension, max_size_bytes)
+    except Exception:
+        return None
+
+
+def prepare_images_for_api(paths, max_dimension=3000, max_size_bytes=3.8 * 1024 * 1024, workers=None):
+    """
+    Prepare many images for API submission in parallel worker processes.
+
+    Decoding, resizing and JPEG encoding are CPU-bound, so they run in a
+    process pool on all cores (images prepared on an earlier run are read
+    from the cache instead, see prepare_image_for_api_cached). Results are yielded in input order while later
+    images are still being prepared; only a few images per worker are kept
+    ahead of the consumer, so large photo sets do not pile up in memory.
+
+    Args:
+        paths: Image file paths
+        max_dimension: Maximum width or height in pixels (default: 3000 for safety)
+        max_size_bytes: Maximum file size in bytes (default: 3.8MB for safety margin)
+        workers: Number of worker processes (default: one per CPU)
+
+    Yields:
+        bytes: JPEG-encoded image data for each path, in order, or None if the
+               image could not be prepared (callers can retry with load_image
+               to get the error)
+    """
+    paths = list(paths)
+    if not paths:
+        return
+
+    workers = workers or os.cpu_count() or 1
+    worker = partial(_prepare_file_for_api, max_dimension=max_dimension, max_size_bytes=max_size_bytes)
+    window = workers * PREPARE_PREFETCH_PER_WORKER
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        pending = deque()
+        for path in paths:
+            pending.append(executor.submit(worker, path))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def compute_image_hash(file_path):
+    """
+    Compute a perceptual difference hash (dHash) of an image.
+
+    The image is reduced to a small grayscale grid and each bit records
+    whether a pixel is brighter than its right-hand neighbour, so
+    near-identical photos (burst shots, re-encodes, small crops) get hashes
+    that differ in only a few bits. Large JPEGs are decoded at reduced size.
+
+    Args:
+        file_path: Path to image file
+
+    Returns:
+        int: IMAGE_HASH_SIZE**2-bit hash, compared with hash_distance()
+
+    Raises:
+        ValueError: If file format is not supported
+        FileNotFoundError: If file does not exist
+    """
+    image = load_image(file_path, target_dimension=IMAGE_HASH_SIZE * 32)
+    grid = image.convert('L').resize((IMAGE_HASH_SIZE + 1, IMAGE_HASH_SIZE), Image.Resampling.BOX)
+    pixels = list(grid.getdata())
+
+    value = 0
+    for row in range(IMAGE_HASH_SIZE):
+        offset = row * (IMAGE_HASH_SIZE + 1)
+        for col in range(IMAGE_HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hash_file_sample(file_path):
+    """
+    Hash a file's size and the first and last FILE_SAMPLE_BYTES of its content.
+
+    A cheap first pass for finding exact copies (duplicated albums,
+    re-imports) without reading whole files. Equal sample hashes are only
+    candidates: files that differ solely in the middle also hash equal, so
+    confirm them with hash_file().
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        str: 128-bit BLAKE2b hex digest
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        digest.update(str(size).encode('ascii'))
+        digest.update(f.read(FILE_SAMPLE_BYTES))
+        if size > 2 * FILE_SAMPLE_BYTES:
+            f.seek(-FILE_SAMPLE_BYTES, os.SEEK_END)
+        digest.update(f.read(FILE_SAMPLE_BYTES))
+    return digest.hexdigest()
+
+
+def hash_file(file_path):
+    """
+    Hash a file's whole content.
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        str: 128-bit BLAKE2b hex digest
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(partial(f.read, FILE_HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_distance(hash1, hash2):
+    """
+    Count the bits that differ between two image hashes (Hamming distance).
+
+    Args:
+        hash1: Hash from compute_image_hash()
+        hash2: Hash from compute_image_hash()
+
+    Returns:
+        int: Number of differing bits (0 = identical)
+    """
+    return bin(hash1 ^ hash2).count('1')
+
+
 def encode_image_base64(image_bytes):
     """
     Encode image bytes to base64 string.
 
     Args:
-        image_bytes: Image data as bytes
+        image_bytes: Image data as bytes or any bytes-like object
+                     (e.g. a memoryview, which is encoded without copying)
 
     Returns:
         str: Base64-encoded string
     """
-    return base64.b64encode(image_bytes).decode('utf-8')
+    return _b64encode_as_string(image_bytes)
 
 
 def is_supported_image(file_path):
@@ -172,7 +598,7 @@ def is_supported_image(file_path):
     Returns:
         bool: True if file extension is supported
     """
-    return Path(file_path).suffix.lower() in SUPPORTED_FORMATS
+    return str(file_path).lower().endswith(_SUPPORTED_SUFFIXES)
 
 
 def get_image_timestamp(file_path):
@@ -193,6 +619,7 @@ def get_image_timestamp(file_path):
     """
     # Try EXIF DateTimeOriginal first (standard method)
     try:
+        _ensure_heif(file_path)
         image = Image.open(file_path)
         exif = image.getexif()
 
@@ -225,7 +652,7 @@ def get_image_timestamp(file_path):
 
         if result.returncode == 0 and result.stdout:
             # Parse output: "kMDItemContentCreationDate = 2026-02-01 19:00:31 +0000"
-            match = re.search(r'kMDItemContentCreationDate\s*=\s*(.+)', result.stdout)
+            match = _MDLS_DATE_RE.search(result.stdout)
             if match:
                 date_str = match.group(1).strip()
 
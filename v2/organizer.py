@@ -30,31 +30,102 @@ See CLUSTERING.md for comprehensive documentation.
 """
 
 import os
+import errno
 import json
 import shutil
 import re
+import hashlib
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Set
-from collections import defaultdict
+from typing import Callable, Iterator, List, Dict, Tuple, Optional, Set
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from datetime import datetime
 
 from tqdm import tqdm
 
-from v2.vertex_claude import detect_outfits, compare_outfits, extract_json
+# Prefer the faster orjson parser for cache files when available
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+from v2.vertex_claude import (
+    detect_outfits, detect_and_match_outfits, compare_outfits_batch, extract_json,
+    embed_outfit_descriptions
+)
 from v2.config import load_config
-from v2.image_utils import get_image_timestamp
+from v2.image_utils import (
+    get_image_timestamp, prepare_images_for_api, compute_image_hash, hash_distance, hash_file_sample,
+    hash_file
+)
 
 
 # Supported image formats
 SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic'}
+_SUPPORTED_SUFFIXES = tuple(SUPPORTED_FORMATS)
+
+# Concurrent Vertex AI requests during detection
+DEFAULT_API_WORKERS = 8
+
+# Concurrent file copies/moves when executing or undoing a plan
+COPY_WORKERS = os.cpu_count() or 4
+
+# Directories listed concurrently while scanning (overlaps I/O latency on
+# network and slow disks)
+SCAN_WORKERS = 8
+
+# Photos whose perceptual hashes differ in at most this many bits (of 64) from
+# a group's first photo are treated as near-duplicates: only that photo is sent
+# to the API and the others share its outfits (and, in auto-cluster mode, its
+# cluster). Off by default: a fixed camera's background dominates the hash, so
+# different racers at the same spot can hash close together
+DEFAULT_SIMILAR_DISTANCE = 0
+
+# Database mode copies a photo's identification to its near-duplicates without
+# any check, so it never groups photos further apart than this
+MAX_DATABASE_SIMILAR_DISTANCE = 4
+
+# Undo records written to the target directory: one JSON line per completed
+# file operation, plus the mode and creation time (older runs wrote a single
+# JSON file, which undo still reads)
+BACKUP_FILE = '.original_paths.jsonl'
+BACKUP_META_FILE = '.original_paths.meta.json'
+LEGACY_BACKUP_FILE = '.original_paths.json'
+
+# Outfit detections, cached across runs as JSON lines (one photo per line,
+# appended as photos are detected); the legacy whole-file JSON cache is
+# imported once if present
+OUTFIT_CACHE_FILE = '.outfit_detection_cache.jsonl'
+LEGACY_OUTFIT_CACHE_FILE = '.outfit_detection_cache.json'
+
+# Outfit description embeddings, cached across runs
+EMBEDDING_CACHE_FILE = '.outfit_embedding_cache.json'
 
-# Hidden/system file patterns to skip
-SKIP_PATTERNS = [
-    r'^\.',  # Hidden files
-    r'^~',   # Temporary files
-    r'Thumbs\.db$',
-    r'\.DS_Store$',
-]
+# Databases with at most this many outfits are sent inline with each image,
+# so detection and matching take one request
+MAX_INLINE_OUTFITS = 10
+
+# Similarity treated as a certain match: no further candidates are compared
+CERTAIN_MATCH_SCORE = 0.95
+
+# Clusters or database outfits (most similar by embedding) compared visually
+# against each detected outfit
+OUTFIT_EMBEDDING_CANDIDATES = 5
+
+# Embedding (cosine) similarity below which a candidate is not compared visually
+EMBEDDING_MIN_SIMILARITY = 0.5
+
+# Hidden/system file name prefixes and suffixes to skip
+SKIP_PREFIXES = (
+    '.',  # Hidden files
+    '~',  # Temporary files
+)
+SKIP_SUFFIXES = ('Thumbs.db', '.DS_Store')
+
+# Directory name sanitizing in one str.translate() pass: spaces become
+# underscores, characters not allowed in directory names (and '&') are removed
+_SANITIZE_TABLE = str.maketrans(' ', '_', '<>:"/\\|?*&')
 
 
 def should_skip_file(file_path: str) -> bool:
@@ -67,27 +138,57 @@ def should_skip_file(file_path: str) -> bool:
     Returns:
         True if file should be skipped
     """
-    filename = os.path.basename(file_path)
+    name = os.path.basename(file_path)
+    return name.startswith(SKIP_PREFIXES) or name.endswith(SKIP_SUFFIXES)
 
-    for pattern in SKIP_PATTERNS:
-        if re.search(pattern, filename):
-            return True
 
-    return False
+def _scan_one_directory(directory: str) -> Tuple[List[str], List[str]]:
+    """
+    List one directory with os.scandir: DirEntry caches the file type from
+    the directory listing, so entries need no stat() or Path object each.
 
+    Args:
+        directory: Directory to list
 
-def scan_directory_for_images(directory: str, recursive: bool = True) -> List[str]:
+    Returns:
+        Tuple of (supported image file paths, subdirectory paths); both empty
+        if the directory cannot be read
     """
-    Scan directory for supported image files.
+    try:
+        entries = os.scandir(directory)
+    except OSError as e:
+        # Unreadable directories (e.g. .Trashes on camera cards) are skipped
+        print(f"Warning: Skipping {directory}: {e}")
+        return [], []
+
+    image_files = []
+    subdirectories = []
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            elif (entry.name.lower().endswith(_SUPPORTED_SUFFIXES)
+                    and entry.is_file()
+                    and not should_skip_file(entry.name)):
+                image_files.append(entry.path)
+    return image_files, subdirectories
+
+
+def iter_directory_images(directory: str, recursive: bool = True) -> Iterator[str]:
+    """
+    Yield supported image files in a directory as they are found.
 
     Args:
         directory: Directory to scan
         recursive: Whether to scan subdirectories
 
-    Returns:
-        List of image file paths
+    Yields:
+        Image file paths (unordered)
+
+    Raises:
+        FileNotFoundError: If the directory does not exist
+        ValueError: If the path is not a directory
     """
-    image_files = []
     directory = Path(directory)
 
     if not directory.exists():
@@ -96,18 +197,38 @@ def scan_directory_for_images(directory: str, recursive: bool = True) -> List[st
     if not directory.is_dir():
         raise ValueError(f"Not a directory: {directory}")
 
-    # Use glob for recursive or non-recursive scanning
-    pattern = "**/*" if recursive else "*"
+    # Each directory is listed in a worker thread; subdirectories found are
+    # submitted back to the pool, so listings on slow storage overlap
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        pending = {executor.submit(_scan_one_directory, str(directory.absolute()))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                image_files, subdirectories = future.result()
+                if recursive:
+                    pending.update(executor.submit(_scan_one_directory, d) for d in subdirectories)
+                yield from image_files
 
-    for item in directory.glob(pattern):
-        if item.is_file():
-            if item.suffix.lower() in SUPPORTED_FORMATS:
-                if not should_skip_file(str(item)):
-                    image_files.append(str(item.absolute()))
 
-    return sorted(image_files)
+def scan_directory_for_images(directory: str, recursive: bool = True) -> List[str]:
+    """
+    Scan directory for supported image files.
+
+    Args:
+        directory: Directory to scan
+        recursive: Whether to scan subdirectories
 
+    Returns:
+        Sorted list of image file paths
 
+    Raises:
+        FileNotFoundError: If the directory does not exist
+        ValueError: If the path is not a directory
+    """
+    return sorted(iter_directory_images(directory, recursive))
+
+
+@lru_cache(maxsize=4096)
 def sanitize_directory_name(name: str) -> str:
     """
     Convert name to safe directory name.
@@ -118,11 +239,8 @@ def sanitize_directory_name(name: str) -> str:
     Returns:
         Safe directory name
     """
-    # Replace spaces with underscores
-    safe_name = name.replace(' ', '_')
-
-    # Remove or replace unsafe characters
-    safe_name = re.sub(r'[<>:"/\\|?*]', '', safe_name)
+    # Replace spaces with underscores and remove unsafe characters
+    safe_name = name.translate(_SANITIZE_TABLE)
 
     # Remove leading/trailing dots and spaces
     safe_name = safe_name.strip('. ')
@@ -134,6 +252,73 @@ def sanitize_directory_name(name: str) -> str:
     return safe_name
 
 
+class DuplicateResolver:
+    """
+    Picks collision-free file names in one target directory.
+
+    The directory is listed once; names handed out are remembered, so
+    resolving many files needs no per-candidate stat calls.
+    """
+
+    # Matches names already carrying a numeric suffix, e.g. "IMG_001_004.jpg"
+    _SUFFIXED_RE = re.compile(r'^(.*)_(\d+)(\.[^.]*)?$')
+
+    def __init__(self, target_dir: str):
+        """
+        Args:
+            target_dir: Directory the resolved names will be created in
+        """
+        self.target_dir = target_dir
+        self.existing: Optional[Set[str]] = None
+        self.next_counter: Dict[Tuple[str, str], int] = {}
+
+    def _load(self) -> Set[str]:
+        """
+        List the directory and seed the counters from names already in it.
+
+        Returns:
+            Set of names present in (or claimed for) the directory
+        """
+        if self.existing is None:
+            try:
+                self.existing = set(os.listdir(self.target_dir))
+            except FileNotFoundError:
+                self.existing = set()
+            for name in self.existing:
+                match = self._SUFFIXED_RE.match(name)
+                if match:
+                    key = (match.group(1), match.group(3) or '')
+                    counter = int(match.group(2)) + 1
+                    if counter > self.next_counter.get(key, 1):
+                        self.next_counter[key] = counter
+        return self.existing
+
+    def resolve(self, filename: str) -> str:
+        """
+        Claim a free path for a file, adding a numeric suffix on collision.
+
+        Args:
+            filename: Desired file name
+
+        Returns:
+            Available file path in the target directory
+        """
+        existing = self._load()
+
+        name = filename
+        if name in existing:
+            stem, suffix = os.path.splitext(filename)
+            counter = self.next_counter.get((stem, suffix), 1)
+            name = f"{stem}_{counter:03d}{suffix}"
+            while name in existing:
+                counter += 1
+                name = f"{stem}_{counter:03d}{suffix}"
+            self.next_counter[(stem, suffix)] = counter + 1
+
+        existing.add(name)
+        return os.path.join(self.target_dir, name)
+
+
 def handle_duplicate_filename(target_path: str) -> str:
     """
     Add numeric suffix if file already exists.
@@ -144,23 +329,368 @@ def handle_duplicate_filename(target_path: str) -> str:
     Returns:
         Available file path (may have numeric suffix)
     """
-    if not os.path.exists(target_path):
-        return target_path
+    return DuplicateResolver(os.path.dirname(target_path)).resolve(os.path.basename(target_path))
+
+
+def _transfer_file(src_path: str, dst_path: str, mode: str) -> None:
+    """
+    Copy, move or hard-link one file.
+
+    Args:
+        src_path: Source file path
+        dst_path: Destination file path
+        mode: 'copy', 'move' or 'link'
+    """
+    if mode == 'copy':
+        shutil.copy2(src_path, dst_path)
+    elif mode == 'link':
+        # A hard link shares the data and metadata; copy across filesystems
+        try:
+            os.link(src_path, dst_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.copy2(src_path, dst_path)
+    else:
+        shutil.move(src_path, dst_path)
+
+
+def _run_overlapped(image_paths: List[str], call: Callable, prep_workers: Optional[int] = None,
+                    api_workers: int = DEFAULT_API_WORKERS) -> Iterator[Tuple[str, object]]:
+    """
+    Run an API call on every image, overlapping image preparation and requests.
+
+    Images are prepared in worker processes (prepare_images_for_api) and each
+    prepared image is handed to a thread pool that runs call(image_path,
+    image_bytes). At most two requests per API worker are queued, which
+    bounds the prepared images held in memory.
+
+    Args:
+        image_paths: List of image file paths
+        call: Function taking (image_path, image_bytes)
+        prep_workers: Image preparation processes (default: one per CPU)
+        api_workers: Concurrent API calls
+
+    Yields:
+        (image_path, future) pairs in completion order; future.result()
+        returns the call's result or raises its exception
+    """
+    prepared = zip(image_paths, prepare_images_for_api(image_paths, workers=prep_workers))
+    max_pending = 2 * api_workers
 
-    path = Path(target_path)
-    stem = path.stem
-    suffix = path.suffix
-    parent = path.parent
+    with ThreadPoolExecutor(max_workers=api_workers) as executor:
+        pending = {}
+        for image_path, image_bytes in prepared:
+            pending[executor.submit(call, image_path, image_bytes)] = image_path
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future
 
-    counter = 1
-    while True:
-        new_path = parent / f"{stem}_{counter:03d}{suffix}"
-        if not os.path.exists(new_path):
-            return str(new_path)
-        counter += 1
+        for future in as_completed(pending):
+            yield pending[future], future
 
 
-def identify_all_outfits_in_image(image_path: str, outfit_db: Dict[str, str], confidence_threshold: float = 0.7) -> List[Dict]:
+def _hash_file_or_none(image_path: str, hash_func=hash_file_sample) -> Optional[str]:
+    """
+    Hash a file with hash_func, returning None if it cannot be read.
+
+    Args:
+        image_path: Path to image
+        hash_func: hash_file_sample (default) or hash_file
+
+    Returns:
+        Content hash, or None on error
+    """
+    try:
+        return hash_func(image_path)
+    except OSError:
+        return None
+
+
+def hash_images_parallel(image_paths: List[str], workers: Optional[int] = None,
+                         hash_func=hash_file_sample) -> Dict[str, Optional[str]]:
+    """
+    Hash the content of many image files concurrently.
+
+    Args:
+        image_paths: List of image file paths
+        workers: Hashing threads (default: one per CPU)
+        hash_func: hash_file_sample (default) or hash_file
+
+    Returns:
+        Dictionary mapping each path to its content hash (None if unreadable)
+    """
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        hashes = executor.map(partial(_hash_file_or_none, hash_func=hash_func), image_paths)
+        return dict(zip(image_paths, hashes))
+
+
+def group_identical_files(image_paths: List[str], workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    Group byte-identical image files (e.g. the same photo in two albums).
+
+    Files are first compared by a sampled hash; only files whose samples
+    collide are read in full to confirm they are identical.
+
+    Args:
+        image_paths: List of image file paths
+        workers: Hashing threads (default: one per CPU)
+
+    Returns:
+        Dictionary mapping each image path to the first path with the same
+        content; unreadable files represent themselves
+    """
+    sample_hashes = hash_images_parallel(image_paths, workers)
+
+    sample_counts = Counter(h for h in sample_hashes.values() if h is not None)
+    candidates = [path for path, h in sample_hashes.items() if sample_counts.get(h, 0) > 1]
+    full_hashes = hash_images_parallel(candidates, workers, hash_file) if candidates else {}
+
+    first_by_hash = {}
+    representatives = {}
+    for path in image_paths:
+        content_hash = full_hashes.get(path)
+        if content_hash is None:
+            representatives[path] = path
+        else:
+            representatives[path] = first_by_hash.setdefault(content_hash, path)
+    return representatives
+
+
+def _hash_image_or_none(image_path: str) -> Optional[int]:
+    """
+    Hash an image with compute_image_hash(), returning None if it cannot be read.
+
+    Args:
+        image_path: Path to image
+
+    Returns:
+        Perceptual hash, or None on error
+    """
+    try:
+        return compute_image_hash(image_path)
+    except Exception:
+        return None
+
+
+class _BKTree:
+    """
+    BK-tree over image hashes for radius queries under Hamming distance.
+
+    Each node's children are keyed by their distance to the node, so by the
+    triangle inequality a query only descends into children whose key is
+    within radius of the query's distance to the node.
+    """
+
+    def __init__(self):
+        # Node: [hash, indices with this hash, {distance: child node}]
+        self._root = None
+
+    def add(self, value: int, index: int) -> None:
+        """Insert a hash, remembering the index of the image it came from."""
+        if self._root is None:
+            self._root = [value, [index], {}]
+            return
+
+        node = self._root
+        while True:
+            distance = hash_distance(value, node[0])
+            if distance == 0:
+                node[1].append(index)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [index], {}]
+                return
+            node = child
+
+    def query(self, value: int, radius: int) -> List[int]:
+        """Return indices of all inserted hashes within radius of value."""
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hash_distance(value, node[0])
+            if distance <= radius:
+                found.extend(node[1])
+            for child_distance, child in node[2].items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+def group_similar_images(image_paths: List[str], max_distance: int,
+                         workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    Group near-duplicate images by perceptual hash.
+
+    Each image joins the group of the closest earlier representative whose
+    hash differs in at most max_distance bits, or else starts a new group
+    as its representative. Images are only compared against representatives,
+    so groups do not chain (A near B near C does not put A and C together
+    unless C is near A). Representatives are found with a BK-tree radius
+    query instead of comparing every pair. Images that cannot be hashed form
+    their own group.
+
+    Args:
+        image_paths: List of image file paths
+        max_distance: Maximum number of differing hash bits from the representative
+        workers: Hashing threads (default: one per CPU)
+
+    Returns:
+        Dictionary mapping each image path to its group's representative path
+    """
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        hashes = list(tqdm(executor.map(_hash_image_or_none, image_paths),
+                           total=len(image_paths), desc="Hashing photos", unit="photo"))
+
+    groups = {}
+    tree = _BKTree()  # representatives only
+    for i, hash_i in enumerate(hashes):
+        path = image_paths[i]
+        if hash_i is None:
+            groups[path] = path
+            continue
+
+        matches = tree.query(hash_i, max_distance)
+        if matches:
+            # Closest representative, earliest on ties
+            best = min(matches, key=lambda j: (hash_distance(hash_i, hashes[j]), j))
+            groups[path] = image_paths[best]
+        else:
+            groups[path] = path
+            tree.add(hash_i, i)
+
+    return groups
+
+
+def _load_outfit_cache() -> Dict[str, List[Dict]]:
+    """
+    Load cached outfit detections.
+
+    Later lines override earlier ones; a truncated final line (from an
+    interrupted run) is ignored. If only the legacy JSON cache exists, it is
+    converted to the JSON-lines format.
+
+    Returns:
+        Dictionary mapping absolute image paths to detected outfits
+    """
+    outfit_cache = {}
+
+    if os.path.exists(OUTFIT_CACHE_FILE):
+        line = ''
+        with open(OUTFIT_CACHE_FILE, 'r') as f:
+            for line in f:
+                try:
+                    entry = json_loads(line)
+                    outfit_cache[entry['key']] = entry['outfits']
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        # Terminate a truncated final line so new entries start on their own
+        if line and not line.endswith('\n'):
+            with open(OUTFIT_CACHE_FILE, 'a') as f:
+                f.write('\n')
+    elif os.path.exists(LEGACY_OUTFIT_CACHE_FILE):
+        try:
+            with open(LEGACY_OUTFIT_CACHE_FILE, 'r') as f:
+                outfit_cache = json.load(f)
+            with open(OUTFIT_CACHE_FILE, 'w') as f:
+                for key, outfits in outfit_cache.items():
+                    f.write(json.dumps({'key': key, 'outfits': outfits}) + '\n')
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Warning: Could not import {LEGACY_OUTFIT_CACHE_FILE}: {e}")
+
+    return outfit_cache
+
+
+def _load_embedding_cache() -> Dict[str, List[float]]:
+    """
+    Load cached outfit description embeddings.
+
+    Returns:
+        Dictionary mapping description hashes to normalized embeddings
+    """
+    if os.path.exists(EMBEDDING_CACHE_FILE):
+        try:
+            with open(EMBEDDING_CACHE_FILE, 'rb') as f:
+                return json_loads(f.read())
+        except json.JSONDecodeError:
+            pass
+    return {}
+
+
+def _save_embedding_cache(cache: Dict[str, List[float]]) -> None:
+    """
+    Write outfit description embeddings to disk.
+
+    Args:
+        cache: Embedding cache to save
+    """
+    if not cache:
+        return
+    try:
+        with open(EMBEDDING_CACHE_FILE, 'w') as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"Warning: Could not save embedding cache: {e}")
+
+
+def _embed_descriptions(descriptions: List[str], cache: Dict[str, List[float]]) -> Optional[Dict[str, List[float]]]:
+    """
+    Get unit-length embeddings for outfit descriptions.
+
+    Embeddings are cached by SHA-256 of the description; missing ones are
+    requested in batches.
+
+    Args:
+        descriptions: Outfit descriptions to embed
+        cache: Embedding cache (updated in place)
+
+    Returns:
+        Dictionary mapping each description to its normalized embedding, or
+        None if embeddings are unavailable
+    """
+    keys = {d: hashlib.sha256(d.encode('utf-8')).hexdigest() for d in descriptions}
+    missing = [d for d, key in keys.items() if key not in cache]
+
+    if missing:
+        try:
+            vectors = embed_outfit_descriptions(missing)
+        except Exception as e:
+            print(f"Warning: Outfit embeddings unavailable, comparing against every candidate ({e})")
+            return None
+
+        for description, vector in zip(missing, vectors):
+            norm = sum(x * x for x in vector) ** 0.5 or 1.0
+            cache[keys[description]] = [x / norm for x in vector]
+
+    return {d: cache[key] for d, key in keys.items()}
+
+
+def _embedding_shortlist(query: List[float], embeddings: Dict[str, List[float]]) -> List[str]:
+    """
+    Select the candidates worth a visual comparison by embedding similarity.
+
+    Args:
+        query: Normalized embedding of the outfit to match
+        embeddings: Normalized embeddings of the candidates by key
+
+    Returns:
+        Up to OUTFIT_EMBEDDING_CANDIDATES closest candidates with similarity
+        of at least EMBEDDING_MIN_SIMILARITY, closest first
+    """
+    similarities = {key: sum(a * b for a, b in zip(vector, query)) for key, vector in embeddings.items()}
+    ranked = sorted(similarities, key=similarities.get, reverse=True)
+
+    return [key for key in ranked[:OUTFIT_EMBEDDING_CANDIDATES]
+            if similarities[key] >= EMBEDDING_MIN_SIMILARITY]
+
+
+def identify_all_outfits_in_image(image_path: str, outfit_db: Dict[str, str], confidence_threshold: float = 0.7,
+                                  image_bytes: Optional[bytes] = None,
+                                  db_embeddings: Optional[Dict[str, List[float]]] = None,
+                                  embedding_cache: Optional[Dict[str, List[float]]] = None) -> List[Dict]:
     """
     Detect all outfits in image and match against database.
 
@@ -168,19 +698,42 @@ def identify_all_outfits_in_image(image_path: str, outfit_db: Dict[str, str], co
         image_path: Path to image
         outfit_db: Dictionary mapping outfit names to outfit descriptions
         confidence_threshold: Minimum similarity score to consider a match
+        image_bytes: Image already prepared for the API (optional)
+        db_embeddings: Normalized embeddings of the database outfits by name
+                       (optional); when given, each detected outfit is only
+                       compared against the OUTFIT_EMBEDDING_CANDIDATES closest
+                       (see _embedding_shortlist)
+        embedding_cache: Embedding cache used with db_embeddings
 
     Returns:
         List of outfit matches: [{'name': 'Blue Outfit', 'confidence': 0.95}, ...]
         Name is None for unknown outfits
     """
     try:
+        # Small databases: detect and match in one request
+        if outfit_db and len(outfit_db) <= MAX_INLINE_OUTFITS:
+            outfits = detect_and_match_outfits(image_path, outfit_db, image_bytes)
+            return [
+                {'name': o['match'], 'confidence': o['confidence']}
+                if o['match'] is not None and o['confidence'] >= confidence_threshold
+                else {'name': None, 'confidence': 0.0}
+                for o in outfits if o.get('outfit_description')
+            ]
+
         # Detect all outfits in image
-        outfits = detect_outfits(image_path)
+        outfits = detect_outfits(image_path, image_bytes)
 
         # If no outfits detected
         if not outfits:
             return []
 
+        # Embed all detected outfits of the image in one request
+        embeddings = None
+        if db_embeddings:
+            descriptions = [o.get('outfit_description', '') for o in outfits]
+            embeddings = _embed_descriptions([d for d in dict.fromkeys(descriptions) if d],
+                                             embedding_cache if embedding_cache is not None else {})
+
         # Match each outfit against database
         matches = []
 
@@ -192,10 +745,17 @@ def identify_all_outfits_in_image(image_path: str, outfit_db: Dict[str, str], co
             best_match = None
             best_score = 0.0
 
-            # Compare against all known outfits
-            for name, known_description in outfit_db.items():
-                similarity = compare_outfits(known_description, outfit_description)
-
+            # Shortlist database outfits by embedding similarity
+            candidates = list(outfit_db)
+            query = embeddings.get(outfit_description) if embeddings else None
+            if query is not None:
+                candidates = _embedding_shortlist(query, db_embeddings)
+
+            # Score against known outfits in batched requests, stopping once
+            # a batch contains a certain match
+            similarities = compare_outfits_batch(outfit_description, [outfit_db[name] for name in candidates],
+                                                 stop_at=CERTAIN_MATCH_SCORE) if candidates else []
+            for name, similarity in zip(candidates, similarities):
                 if similarity > best_score:
                     best_score = similarity
                     best_match = name
@@ -220,7 +780,9 @@ def identify_all_outfits_in_image(image_path: str, outfit_db: Dict[str, str], co
         return []
 
 
-def create_organization_plan(image_paths: List[str], outfit_db: Dict[str, str], confidence_threshold: float = 0.7) -> Dict:
+def create_organization_plan(image_paths: List[str], outfit_db: Dict[str, str], confidence_threshold: float = 0.7,
+                             prep_workers: Optional[int] = None, api_workers: int = DEFAULT_API_WORKERS,
+                             similar_distance: int = DEFAULT_SIMILAR_DISTANCE) -> Dict:
     """
     Process all images and create organization plan (database mode).
 
@@ -228,6 +790,11 @@ def create_organization_plan(image_paths: List[str], outfit_db: Dict[str, str],
         image_paths: List of image file paths
         outfit_db: Dictionary mapping outfit names to outfit descriptions
         confidence_threshold: Minimum similarity score
+        prep_workers: Image preparation processes (default: one per CPU)
+        api_workers: Concurrent API calls (default: DEFAULT_API_WORKERS)
+        similar_distance: Perceptual hash distance under which photos share one
+                          identification (default: off; at most MAX_DATABASE_SIMILAR_DISTANCE;
+                          identical copies always do)
 
     Returns:
         Organization plan dictionary with categorized file mappings
@@ -242,9 +809,58 @@ def create_organization_plan(image_paths: List[str], outfit_db: Dict[str, str],
 
     print("\nAnalyzing photos by outfit similarity...")
 
-    for image_path in tqdm(image_paths, desc="Identifying outfits", unit="photo"):
+    # Embed the database outfits once; each detected outfit is then compared
+    # visually only against the closest ones (small databases are matched
+    # inline with detection instead)
+    embedding_cache = _load_embedding_cache()
+    db_embeddings = None
+    if len(outfit_db) > max(MAX_INLINE_OUTFITS, OUTFIT_EMBEDDING_CANDIDATES):
+        by_description = _embed_descriptions(list(dict.fromkeys(outfit_db.values())), embedding_cache)
+        if by_description is not None:
+            db_embeddings = {name: by_description[d] for name, d in outfit_db.items()}
+
+    # Byte-identical copies of a photo are identified once
+    representatives = group_identical_files(image_paths)
+    unique_paths = [p for p in image_paths if representatives[p] == p]
+
+    # Near-duplicate photos (bursts of the same racer) share one identification
+    if similar_distance > MAX_DATABASE_SIMILAR_DISTANCE:
+        print(f"Limiting near-duplicate distance to {MAX_DATABASE_SIMILAR_DISTANCE} bits in database mode")
+        similar_distance = MAX_DATABASE_SIMILAR_DISTANCE
+    if similar_distance > 0 and len(unique_paths) > 1:
+        similar = group_similar_images(unique_paths, similar_distance, prep_workers)
+        representatives = {p: similar[representatives[p]] for p in image_paths}
+        unique_paths = [p for p in unique_paths if similar[p] == p]
+
+    if len(unique_paths) < len(image_paths):
+        print(f"Reusing results for {len(image_paths) - len(unique_paths)} duplicate or near-duplicate photos")
+
+    # Prepare images in worker processes while the API calls run in threads
+    def identify(image_path, image_bytes):
+        return identify_all_outfits_in_image(image_path, outfit_db, confidence_threshold, image_bytes,
+                                             db_embeddings, embedding_cache)
+
+    results = {}
+    overlapped = _run_overlapped(unique_paths, identify, prep_workers, api_workers)
+    for image_path, future in tqdm(overlapped, total=len(unique_paths), desc="Identifying outfits", unit="photo"):
         try:
-            matches = identify_all_outfits_in_image(image_path, outfit_db, confidence_threshold)
+            results[image_path] = future.result()
+        except Exception as e:
+            print(f"\nError processing {image_path}: {e}")
+            plan['errors'].append({
+                'path': image_path,
+                'error': str(e)
+            })
+
+    _save_embedding_cache(embedding_cache)
+
+    # Categorize in input order; duplicates share their representative's result
+    for image_path in image_paths:
+        if representatives[image_path] not in results:
+            continue
+
+        try:
+            matches = results[representatives[image_path]]
 
             if not matches:
                 # No people detected
@@ -286,7 +902,9 @@ def create_organization_plan(image_paths: List[str], outfit_db: Dict[str, str],
     return plan
 
 
-def auto_cluster_photos(image_paths: List[str], confidence_threshold: float = 0.5) -> Dict:
+def auto_cluster_photos(image_paths: List[str], confidence_threshold: float = 0.5,
+                        prep_workers: Optional[int] = None, api_workers: int = DEFAULT_API_WORKERS,
+                        similar_distance: int = DEFAULT_SIMILAR_DISTANCE) -> Dict:
     """
     Automatically cluster photos by multi-priority matching without database.
 
@@ -325,6 +943,11 @@ def auto_cluster_photos(image_paths: List[str], confidence_threshold: float = 0.
         image_paths: List of image file paths
         confidence_threshold: Minimum similarity for VISUAL matching (default: 0.5)
                             Note: Timestamp matches override this threshold
+        prep_workers: Image preparation processes (default: one per CPU)
+        api_workers: Concurrent outfit detection calls (default: DEFAULT_API_WORKERS)
+        similar_distance: Perceptual hash distance under which photos share one
+                          outfit detection and cluster (default: DEFAULT_SIMILAR_DISTANCE,
+                          i.e. off; byte-identical copies are always shared)
 
     Returns:
         Organization plan dictionary compatible with execute_organization_plan:
@@ -337,20 +960,81 @@ def auto_cluster_photos(image_paths: List[str], confidence_threshold: float = 0.
         }
     """
     # Load cache if it exists
-    cache_file = Path('.outfit_detection_cache.json')
-    outfit_cache = {}
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'r') as f:
-                outfit_cache = json.load(f)
-            print(f"Loaded {len(outfit_cache)} cached outfit detections")
-        except:
-            pass
+    outfit_cache = _load_outfit_cache()
+    if outfit_cache:
+        print(f"Loaded {len(outfit_cache)} cached outfit detections")
+
+    # Detect outfits in all uncached photos up front: images are prepared in
+    # worker processes while the API calls run in threads. Clustering below
+    # depends on photo order, so it then runs sequentially from the cache.
+    # Cache keys are absolute paths, computed once per photo
+    abs_paths = {p: os.path.abspath(p) for p in image_paths}
+
+    # Byte-identical copies (e.g. the same photo in two albums) share one
+    # detection and one cluster, whether or not they are cached
+    representatives = group_identical_files(image_paths, prep_workers) if len(image_paths) > 1 else {}
+
+    uncached = {}
+    for p in image_paths:
+        key = abs_paths[p]
+        if representatives.get(p, p) == p and key not in outfit_cache:
+            uncached.setdefault(key, p)
+
+    # Near-duplicate photos (bursts of the same racer) share one detection
+    to_detect = list(uncached.values())
+    if similar_distance > 0 and len(to_detect) > 1:
+        similar = group_similar_images(to_detect, similar_distance, prep_workers)
+        representatives = {p: similar.get(representatives.get(p, p), representatives.get(p, p))
+                           for p in image_paths}
+        to_detect = [p for p in to_detect if similar[p] == p]
+    api_calls_saved = len(image_paths) - len(to_detect)
+
+    skipped = sum(1 for p, rep in representatives.items() if p != rep)
+    if skipped:
+        print(f"Reusing outfit detections for {skipped} duplicate or near-duplicate photos")
+
+    # New detections are appended to the cache as they arrive
+    new_detections = 0
+    with open(OUTFIT_CACHE_FILE, 'a') as cache_file:
+        def remember(key: str, outfits: List[Dict]) -> None:
+            nonlocal new_detections
+            outfit_cache[key] = outfits
+            cache_file.write(json.dumps({'key': key, 'outfits': outfits}) + '\n')
+            new_detections += 1
+
+        if to_detect:
+            overlapped = _run_overlapped(to_detect, detect_outfits, prep_workers, api_workers)
+            for image_path, future in tqdm(overlapped, total=len(to_detect), desc="Detecting outfits", unit="photo"):
+                try:
+                    remember(abs_paths[image_path], future.result())
+                except Exception as e:
+                    print(f"\nError detecting outfits in {image_path}: {e}")
+
+    # Duplicates use their representative's outfits for this run only; they
+    # are not written to the cache, so a later run (e.g. with grouping off)
+    # detects them itself
+    cached_count = len(outfit_cache)
+    for image_path, representative in representatives.items():
+        if image_path != representative and abs_paths[image_path] not in outfit_cache:
+            outfits = outfit_cache.get(abs_paths[representative])
+            if outfits is not None:
+                outfit_cache[abs_paths[image_path]] = outfits
+
+    # Embed single-outfit descriptions up front; each photo is then compared
+    # visually only against the clusters whose embeddings are closest
+    embedding_cache = _load_embedding_cache()
+
+    single_descriptions = []
+    for image_path in image_paths:
+        outfits = outfit_cache.get(abs_paths[image_path], [])
+        if len(outfits) == 1 and outfits[0].get('outfit_description'):
+            single_descriptions.append(outfits[0]['outfit_description'])
+    embeddings = _embed_descriptions(list(dict.fromkeys(single_descriptions)), embedding_cache)
+    cluster_embeddings = {}  # cluster_id -> normalized embedding
 
     clusters = {}  # cluster_id -> {'description': str, 'colors': [], 'paths': []}
     next_id = 1
     comparison_count = 0
-    api_calls_saved = 0
 
     # Load timestamp clustering configuration
     config = load_config()
@@ -362,6 +1046,10 @@ def auto_cluster_photos(image_paths: List[str], confidence_threshold: float = 0.
     print("Tip: Lower threshold = more grouping, Higher threshold = more separate groups\n")
 
     for image_path in tqdm(image_paths, desc="Clustering by outfit", unit="photo"):
+        # Duplicates join their representative's cluster below
+        if representatives.get(image_path, image_path) != image_path:
+            continue
+
         try:
             # Get photo timestamp first
             photo_timestamp = get_image_timestamp(image_path)
@@ -373,20 +1061,8 @@ def auto_cluster_photos(image_paths: List[str], confidence_threshold: float = 0.
             else:
                 print(f"\n{filename}: Shot Date: [No EXIF timestamp]")
 
-            # Check cache first
-            cache_key = str(Path(image_path).absolute())
-            if cache_key in outfit_cache:
-                outfits = outfit_cache[cache_key]
-                api_calls_saved += 1
-            else:
-                # Call API and cache result
-                outfits = detect_outfits(image_path)
-                outfit_cache[cache_key] = outfits
-
-                # Save cache periodically (every 5 photos)
-                if len(outfit_cache) % 5 == 0:
-                    with open(cache_file, 'w') as f:
-                        json.dump(outfit_cache, f, indent=2)
+            # Outfits were detected (or cached) above
+            outfits = outfit_cache.get(abs_paths[image_path], [])
 
             if not outfits:
                 # No people
@@ -416,70 +1092,67 @@ def auto_cluster_photos(image_paths: List[str], confidence_threshold: float = 0.
                 best_match = None
                 best_score = 0.0
 
-                # Compare against all existing clusters
+                # Shortlist clusters for visual comparison by embedding similarity
+                visual_candidates = None
+                query = embeddings.get(outfit_desc) if embeddings else None
+                if query is not None:
+                    visual_candidates = set(_embedding_shortlist(query, cluster_embeddings))
+
+                # HIGHEST PRIORITY: TIMESTAMP MATCHING
+                # If both photos have timestamps and were taken within seconds, cluster immediately;
+                # photos a little further apart get a high baseline score
+                timestamp_scores = {}
                 for cluster_id, cluster_data in clusters.items():
-                    # Skip special clusters
-                    if cluster_id in ['No_People_Detected', 'Multiple_People']:
+                    # Only outfit clusters (dicts), not the special ones
+                    if not isinstance(cluster_data, dict):
                         continue
-
-                    # Only process dict clusters (outfit clusters)
-                    if isinstance(cluster_data, dict):
-                        # Enable debug for first 5 comparisons to see what's happening
-                        debug = comparison_count < 5
-
-                        # HIGHEST PRIORITY: TIMESTAMP MATCHING
-                        # If both photos have timestamps and were taken within seconds, cluster immediately
-                        if photo_timestamp and cluster_data.get('timestamp'):
-                            time_diff = abs((photo_timestamp - cluster_data['timestamp']).total_seconds())
-
-                            if time_diff <= timestamp_exact_match:
-                                # Photos within exact match window - AUTOMATIC MATCH
-                                if debug:
-                                    print(f"\n>>> Comparison #{comparison_count + 1}: {cluster_id}")
-                                    print(f"    ⏱️  TIMESTAMP MATCH: {time_diff:.1f}s apart (≤{timestamp_exact_match}s) - AUTOMATIC CLUSTER (1.0)")
-                                best_score = 1.0
-                                best_match = cluster_id
-                                comparison_count += 1
-                                break  # Immediate match - no need to check others
-
-                            elif time_diff <= timestamp_high_priority:
-                                # Photos within high priority window - VERY HIGH priority match
-                                if debug:
-                                    print(f"\n>>> Comparison #{comparison_count + 1}: {cluster_id}")
-                                    print(f"    ⏱️  TIMESTAMP NEAR-MATCH: {time_diff:.1f}s apart (≤{timestamp_high_priority}s) - HIGH PRIORITY (0.85)")
-                                score = 0.85
-                                comparison_count += 1
-
-                                # Still higher than visual, but check if visual similarity is even better
-                                visual_score = compare_outfits(cluster_data['description'], outfit_desc, debug=debug)
-                                score = max(score, visual_score)  # Take the higher of timestamp or visual
-
-                                if score > best_score:
-                                    best_score = score
-                                    best_match = cluster_id
-
-                                # If we have strong time+visual match, stop searching
-                                if score >= 0.95:
-                                    break
-
-                                continue  # Move to next cluster
-
-                        # No timestamp match - use VISUAL SIMILARITY ONLY
-                        if debug:
-                            print(f"\n>>> Comparison #{comparison_count + 1}: Comparing against {cluster_id}")
-                        score = compare_outfits(cluster_data['description'], outfit_desc, debug=debug)
-                        comparison_count += 1
-
-                        # Early termination: if we find a near-perfect match, use it
-                        if score >= 0.95:
-                            best_score = score
+                    if photo_timestamp and cluster_data.get('timestamp'):
+                        time_diff = abs((photo_timestamp - cluster_data['timestamp']).total_seconds())
+
+                        if time_diff <= timestamp_exact_match:
+                            # Photos within exact match window - AUTOMATIC MATCH
+                            if comparison_count < 5:
+                                print(f"\n>>> Comparison #{comparison_count + 1}: {cluster_id}")
+                                print(f"    ⏱️  TIMESTAMP MATCH: {time_diff:.1f}s apart (≤{timestamp_exact_match}s) - AUTOMATIC CLUSTER (1.0)")
+                            best_score = 1.0
                             best_match = cluster_id
-                            break  # No need to check other clusters
+                            comparison_count += 1
+                            break  # Immediate match - no need to check others
+
+                        elif time_diff <= timestamp_high_priority:
+                            # Photos within high priority window - VERY HIGH priority match
+                            if comparison_count < 5:
+                                print(f"\n>>> Comparison #{comparison_count + 1}: {cluster_id}")
+                                print(f"    ⏱️  TIMESTAMP NEAR-MATCH: {time_diff:.1f}s apart (≤{timestamp_high_priority}s) - HIGH PRIORITY (0.85)")
+                            timestamp_scores[cluster_id] = 0.85
+
+                if best_match is None:
+                    # VISUAL SIMILARITY: timestamp near-matches (which may score even higher
+                    # visually) and the embedding shortlist, all scored in one batched request
+                    candidates = [
+                        cluster_id for cluster_id, cluster_data in clusters.items()
+                        if isinstance(cluster_data, dict) and (
+                            cluster_id in timestamp_scores
+                            or visual_candidates is None
+                            or cluster_id not in cluster_embeddings
+                            or cluster_id in visual_candidates
+                        )
+                    ]
+                    if candidates and comparison_count < 5:
+                        print(f"\n>>> Comparison #{comparison_count + 1}: Comparing against {', '.join(candidates)}")
+                    visual_scores = compare_outfits_batch(
+                        outfit_desc, [clusters[cid]['description'] for cid in candidates],
+                        debug=comparison_count < 5, stop_at=CERTAIN_MATCH_SCORE
+                    ) if candidates else []
+                    comparison_count += len(candidates)
+
+                    for cluster_id, visual_score in zip(candidates, visual_scores):
+                        # Take the higher of timestamp or visual
+                        score = max(timestamp_scores.get(cluster_id, 0.0), visual_score)
 
                         # Debug output
-                        if score > 0.1:  # Show any non-zero comparisons
-                            filename = os.path.basename(image_path)
-                            print(f"\n  {filename} vs {cluster_id}: similarity = {score:.2f}")
+                        if visual_score > 0.1:  # Show any non-zero comparisons
+                            print(f"\n  {filename} vs {cluster_id}: similarity = {visual_score:.2f}")
 
                         if score > best_score:
                             best_score = score
@@ -487,7 +1160,6 @@ def auto_cluster_photos(image_paths: List[str], confidence_threshold: float = 0.
 
                 if best_score >= confidence_threshold and best_match:
                     # Add to existing cluster
-                    filename = os.path.basename(image_path)
                     print(f"  ✓ {filename} → {best_match} (score: {best_score:.2f})")
                     clusters[best_match]['paths'].append(image_path)
                 else:
@@ -500,7 +1172,6 @@ def auto_cluster_photos(image_paths: List[str], confidence_threshold: float = 0.
                     else:
                         new_id = f'Outfit_{next_id}'
 
-                    filename = os.path.basename(image_path)
                     if best_score > 0:
                         print(f"  + New cluster: {new_id} (best score was {best_score:.2f}, needed {confidence_threshold})")
                     else:
@@ -513,20 +1184,30 @@ def auto_cluster_photos(image_paths: List[str], confidence_threshold: float = 0.
                         'timestamp': photo_timestamp,  # Store first photo's timestamp
                         'paths': [image_path]
                     }
+                    if query is not None:
+                        cluster_embeddings[new_id] = query
                     next_id += 1
 
         except Exception as e:
             print(f"\nError processing {image_path}: {e}")
 
-    # Save final cache
-    try:
-        with open(cache_file, 'w') as f:
-            json.dump(outfit_cache, f, indent=2)
-        print(f"\n✓ Saved outfit detection cache ({len(outfit_cache)} images)")
-        if api_calls_saved > 0:
-            print(f"✓ API calls saved by caching: {api_calls_saved}")
-    except Exception as e:
-        print(f"Warning: Could not save cache: {e}")
+    # Place duplicate and near-duplicate photos without any comparisons
+    cluster_of = {}
+    for cluster_id, cluster_data in clusters.items():
+        for path in cluster_data if isinstance(cluster_data, list) else cluster_data['paths']:
+            cluster_of[path] = cluster_id
+    for image_path in image_paths:
+        representative = representatives.get(image_path, image_path)
+        if representative != image_path and representative in cluster_of:
+            cluster_data = clusters[cluster_of[representative]]
+            (cluster_data if isinstance(cluster_data, list) else cluster_data['paths']).append(image_path)
+
+    _save_embedding_cache(embedding_cache)
+
+    if new_detections:
+        print(f"\n✓ Saved {new_detections} new outfit detections ({cached_count} images cached)")
+    if api_calls_saved > 0:
+        print(f"✓ API calls saved by caching: {api_calls_saved}")
 
     # Convert to organization plan format
     plan = {
@@ -559,18 +1240,17 @@ def execute_organization_plan(plan: Dict, source_dir: str, target_dir: str, mode
         plan: Organization plan from create_organization_plan or auto_cluster_photos
         source_dir: Source directory (for validation)
         target_dir: Target directory for organized photos
-        mode: 'copy' or 'move'
+        mode: 'copy', 'move' or 'link' (hard links, copying across filesystems)
 
     Returns:
         Dictionary with operation results and statistics
     """
-    if mode not in ('copy', 'move'):
-        raise ValueError(f"Invalid mode: {mode}. Must be 'copy' or 'move'")
+    if mode not in ('copy', 'move', 'link'):
+        raise ValueError(f"Invalid mode: {mode}. Must be 'copy', 'move' or 'link'")
 
     target_path = Path(target_dir)
     target_path.mkdir(parents=True, exist_ok=True)
 
-    operations = []
     stats = {
         'total_files': 0,
         'successful': 0,
@@ -580,33 +1260,13 @@ def execute_organization_plan(plan: Dict, source_dir: str, target_dir: str, mode
 
     print(f"\n{mode.capitalize()}ing files to organized directories...")
 
+    # Collect (source, directory, category, label) for every photo
+    jobs = []
+
     # Process single person photos
     for name, paths in plan['single_person'].items():
         person_dir = target_path / sanitize_directory_name(name)
-        person_dir.mkdir(parents=True, exist_ok=True)
-
-        for src_path in tqdm(paths, desc=f"Organizing {name}", unit="photo"):
-            stats['total_files'] += 1
-            try:
-                filename = os.path.basename(src_path)
-                dst_path = handle_duplicate_filename(str(person_dir / filename))
-
-                if mode == 'copy':
-                    shutil.copy2(src_path, dst_path)
-                else:
-                    shutil.move(src_path, dst_path)
-
-                operations.append({
-                    'source': src_path,
-                    'destination': dst_path,
-                    'category': 'single_person',
-                    'label': name
-                })
-                stats['successful'] += 1
-
-            except Exception as e:
-                print(f"\nError processing {src_path}: {e}")
-                stats['failed'] += 1
+        jobs.extend((src_path, person_dir, 'single_person', name) for src_path in paths)
 
     # Process multiple people photos
     for names_tuple, paths in plan['multiple_people'].items():
@@ -614,95 +1274,59 @@ def execute_organization_plan(plan: Dict, source_dir: str, target_dir: str, mode
         multi_dir = target_path / "Multiple_People"
         names_str = "_".join(sanitize_directory_name(n) for n in names_tuple)
         group_dir = multi_dir / names_str
-        group_dir.mkdir(parents=True, exist_ok=True)
-
-        for src_path in tqdm(paths, desc=f"Organizing {names_str}", unit="photo"):
-            stats['total_files'] += 1
-            try:
-                filename = os.path.basename(src_path)
-                dst_path = handle_duplicate_filename(str(group_dir / filename))
-
-                if mode == 'copy':
-                    shutil.copy2(src_path, dst_path)
-                else:
-                    shutil.move(src_path, dst_path)
-
-                operations.append({
-                    'source': src_path,
-                    'destination': dst_path,
-                    'category': 'multiple_people',
-                    'label': names_str
-                })
-                stats['successful'] += 1
-
-            except Exception as e:
-                print(f"\nError processing {src_path}: {e}")
-                stats['failed'] += 1
+        jobs.extend((src_path, group_dir, 'multiple_people', names_str) for src_path in paths)
 
     # Process unknown faces
-    if plan['unknown']:
-        unknown_dir = target_path / "Unknown_Faces"
-        unknown_dir.mkdir(parents=True, exist_ok=True)
-
-        for src_path in tqdm(plan['unknown'], desc="Organizing unknown faces", unit="photo"):
-            stats['total_files'] += 1
-            try:
-                filename = os.path.basename(src_path)
-                dst_path = handle_duplicate_filename(str(unknown_dir / filename))
-
-                if mode == 'copy':
-                    shutil.copy2(src_path, dst_path)
-                else:
-                    shutil.move(src_path, dst_path)
-
-                operations.append({
-                    'source': src_path,
-                    'destination': dst_path,
-                    'category': 'unknown',
-                    'label': 'Unknown_Faces'
-                })
-                stats['successful'] += 1
-
-            except Exception as e:
-                print(f"\nError processing {src_path}: {e}")
-                stats['failed'] += 1
+    unknown_dir = target_path / "Unknown_Faces"
+    jobs.extend((src_path, unknown_dir, 'unknown', 'Unknown_Faces') for src_path in plan['unknown'])
 
     # Process no faces
-    if plan['no_faces']:
-        no_faces_dir = target_path / "No_Faces_Detected"
-        no_faces_dir.mkdir(parents=True, exist_ok=True)
-
-        for src_path in tqdm(plan['no_faces'], desc="Organizing photos without faces", unit="photo"):
-            stats['total_files'] += 1
+    no_faces_dir = target_path / "No_Faces_Detected"
+    jobs.extend((src_path, no_faces_dir, 'no_faces', 'No_Faces_Detected') for src_path in plan['no_faces'])
+
+    # Pick destination names up front, one resolver per directory, so that
+    # files transferred concurrently never collide
+    resolvers: Dict[Path, DuplicateResolver] = {}
+    transfers = []
+    for src_path, dst_dir, category, label in jobs:
+        stats['total_files'] += 1
+        if dst_dir not in resolvers:
+            dst_dir.mkdir(parents=True, exist_ok=True)
+            resolvers[dst_dir] = DuplicateResolver(str(dst_dir))
+        dst_path = resolvers[dst_dir].resolve(os.path.basename(src_path))
+        transfers.append((src_path, dst_path, category, label))
+
+    # Save backup mapping for undo: the mode first, then each operation as
+    # soon as it completes, so an interrupted run can still be undone
+    with open(target_path / BACKUP_META_FILE, 'w') as f:
+        json.dump({'mode': mode, 'created': datetime.now().isoformat()}, f)
+
+    # Copy/move concurrently; file transfers are I/O-bound
+    completed: List[Optional[Dict]] = [None] * len(transfers)
+    with open(target_path / BACKUP_FILE, 'w') as backup, ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+        futures = {executor.submit(_transfer_file, src_path, dst_path, mode): i
+                   for i, (src_path, dst_path, _, _) in enumerate(transfers)}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Organizing photos", unit="photo"):
+            src_path, dst_path, category, label = transfers[futures[future]]
             try:
-                filename = os.path.basename(src_path)
-                dst_path = handle_duplicate_filename(str(no_faces_dir / filename))
-
-                if mode == 'copy':
-                    shutil.copy2(src_path, dst_path)
-                else:
-                    shutil.move(src_path, dst_path)
-
-                operations.append({
-                    'source': src_path,
-                    'destination': dst_path,
-                    'category': 'no_faces',
-                    'label': 'No_Faces_Detected'
-                })
-                stats['successful'] += 1
-
+                future.result()
             except Exception as e:
                 print(f"\nError processing {src_path}: {e}")
                 stats['failed'] += 1
+                continue
+
+            operation = {
+                'source': src_path,
+                'destination': dst_path,
+                'category': category,
+                'label': label
+            }
+            backup.write(json.dumps(operation) + '\n')
+            completed[futures[future]] = operation
+            stats['successful'] += 1
 
-    # Save backup mapping for undo
-    backup_file = target_path / ".original_paths.json"
-    with open(backup_file, 'w') as f:
-        json.dump({
-            'operations': operations,
-            'mode': mode,
-            'created': datetime.now().isoformat()
-        }, f, indent=2)
+    # Report operations in plan order
+    operations = [op for op in completed if op is not None]
 
     return {
         'operations': operations,
@@ -745,59 +1369,108 @@ def generate_organization_report(plan: Dict, result: Dict, target_dir: str) -> N
     print(f"\nReport saved to: {report_file}")
 
 
+def _restore_file(src: str, dst: str, mode: str) -> None:
+    """
+    Undo one organize operation.
+
+    Args:
+        src: Organized file path
+        dst: Original file path
+        mode: Mode the plan was executed with ('copy', 'move' or 'link')
+
+    Raises:
+        FileNotFoundError: If the organized file no longer exists
+    """
+    if not os.path.exists(src):
+        raise FileNotFoundError(src)
+
+    if mode in ('copy', 'link'):
+        # For copied or linked files, just delete the copy
+        os.remove(src)
+    else:
+        # For moved files, move back
+        shutil.move(src, dst)
+
+
+def _load_backup(target_dir: str) -> Optional[Tuple[List[Dict], str]]:
+    """
+    Read the undo records written by execute_organization_plan.
+
+    Args:
+        target_dir: Target directory of the organization
+
+    Returns:
+        Tuple of (operations, mode), or None if no backup exists
+    """
+    backup_file = Path(target_dir) / BACKUP_FILE
+    meta_file = Path(target_dir) / BACKUP_META_FILE
+
+    if meta_file.exists():
+        with open(meta_file, 'r') as f:
+            mode = json.load(f)['mode']
+
+        operations = []
+        if backup_file.exists():
+            with open(backup_file, 'r') as f:
+                for line in f:
+                    try:
+                        operations.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # Truncated final line from an interrupted run
+                        continue
+        return operations, mode
+
+    legacy_file = Path(target_dir) / LEGACY_BACKUP_FILE
+    if legacy_file.exists():
+        with open(legacy_file, 'r') as f:
+            backup_data = json.load(f)
+        return backup_data['operations'], backup_data['mode']
+
+    return None
+
+
 def undo_organization(target_dir: str) -> bool:
     """
     Restore files to original locations using backup mapping.
 
     Args:
-        target_dir: Target directory containing .original_paths.json
+        target_dir: Target directory containing the .original_paths backup
 
     Returns:
         True if successful
     """
-    backup_file = Path(target_dir) / ".original_paths.json"
-
-    if not backup_file.exists():
-        print(f"Error: Backup file not found: {backup_file}")
-        return False
-
     try:
-        with open(backup_file, 'r') as f:
-            backup_data = json.load(f)
+        backup = _load_backup(target_dir)
+        if backup is None:
+            print(f"Error: Backup file not found: {Path(target_dir) / BACKUP_FILE}")
+            return False
 
-        operations = backup_data['operations']
-        mode = backup_data['mode']
+        operations, mode = backup
 
         print(f"\nRestoring {len(operations)} files...")
 
         success_count = 0
         fail_count = 0
 
-        for op in tqdm(operations, desc="Restoring files", unit="file"):
-            try:
-                src = op['destination']
-                dst = op['source']
-
-                if not os.path.exists(src):
+        # Ensure destination directories exist, once per directory
+        for parent_dir in {os.path.dirname(op['source']) for op in operations}:
+            os.makedirs(parent_dir, exist_ok=True)
+
+        # Restore concurrently; each restore is an independent file operation
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+            futures = {executor.submit(_restore_file, op['destination'], op['source'], mode): op['destination']
+                       for op in operations}
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Restoring files", unit="file"):
+                src = futures[future]
+                try:
+                    future.result()
+                    success_count += 1
+                except FileNotFoundError:
                     print(f"\nWarning: File not found: {src}")
                     fail_count += 1
-                    continue
-
-                # Ensure destination directory exists
-                os.makedirs(os.path.dirname(dst), exist_ok=True)
-
-                if mode == 'copy':
-                    # For copied files, just delete the copy
-                    os.remove(src)
-                else:
-                    # For moved files, move back
-                    shutil.move(src, dst)
-
-                success_count += 1
-
-            except Exception as e:
-                print(f"\nError restoring {src}: {e}")
-                fail_count += 1
+                except Exception as e:
+                    print(f"\nError restoring {src}: {e}")
+                    fail_count += 1
 
         print(f"\nRestore complete: {success_count} successful, {fail_count} failed")
 
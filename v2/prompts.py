@@ -76,6 +76,9 @@ Provide a detailed paragraph emphasizing:
 6. OTHER EQUIPMENT BRANDS - skis, poles (read visible brand names as supporting info)
 """
 
+# Sent with the reference image; OUTFIT_DESCRIPTION_PROMPT is the (cached) system prompt
+OUTFIT_DESCRIPTION_REQUEST = "Describe the gear and clothing in this image as instructed."
+
 
 DETECT_OUTFITS_PROMPT = """
 Identify all people visible in this image and describe their gear and clothing.
@@ -171,17 +174,26 @@ If no people are detected, return:
 Important: Return ONLY the JSON, no additional text or markdown formatting.
 """
 
+# Sent with each image; DETECT_OUTFITS_PROMPT is the (cached) system prompt
+DETECT_OUTFITS_REQUEST = "Identify all people visible in this image and describe their gear and clothing as instructed."
 
-COMPARE_OUTFITS_PROMPT = """
-Compare these two gear descriptions and determine how similar they are.
+# Sent with each image in database mode when the known outfits fit in one
+# request; DETECT_OUTFITS_PROMPT is the (cached) system prompt
+DETECT_AND_MATCH_OUTFITS_REQUEST = """Identify all people visible in this image and describe their gear and clothing as instructed.
 
-Description 1:
-{description1}
+Then match each person against the known outfits below. Compare visual appearance only: helmet and goggles first, then boots, clothing patterns, clothing colors, and equipment brands as supporting evidence. Do NOT use bib numbers for matching.
 
-Description 2:
-{description2}
+Known outfits:
+{known_outfits}
+
+Add two fields to each person's JSON object:
+- "match": the number of the most similar known outfit, or null if none is similar
+- "confidence": similarity to that outfit from 0.0 (completely different) to 1.0 (nearly identical)"""
 
-ANALYSIS PRIORITIES (in order of importance):
+
+# Scoring rules shared by the single and batch outfit comparison prompts;
+# sent once as the (cached) system prompt
+_OUTFIT_COMPARISON_CRITERIA = """ANALYSIS PRIORITIES (in order of importance):
 
 NOTE: Do NOT use bib numbers for matching. Even if both descriptions have bib numbers, IGNORE them.
 Only use visual similarity based on outfit appearance.
@@ -255,7 +267,22 @@ EXAMPLES:
 - Blue helmet + blue boots vs Navy helmet + navy boots = 0.65 (similar shades)
 - SMITH helmet + different colors/boots = 0.4 (brand match but visual differs)
 
-Provide a similarity score between 0.0 (completely different) and 1.0 (nearly identical).
+Provide a similarity score between 0.0 (completely different) and 1.0 (nearly identical)."""
+
+COMPARE_OUTFITS_SYSTEM_PROMPT = """You compare descriptions of ski racing gear and score how similar they are. Each request gives the descriptions to compare and the JSON format to answer in.
+
+""" + _OUTFIT_COMPARISON_CRITERIA
+
+COMPARE_OUTFITS_PROMPT = """
+Compare these two gear descriptions and determine how similar they are.
+
+Description 1:
+{description1}
+
+Description 2:
+{description2}
+
+Score them using the analysis priorities, scoring guidelines and matching rules in your instructions.
 
 Return your analysis as JSON with this exact structure:
 {{
@@ -265,3 +292,23 @@ Return your analysis as JSON with this exact structure:
 
 Important: Return ONLY the JSON, no additional text or markdown formatting.
 """
+
+COMPARE_OUTFITS_BATCH_PROMPT = """
+Compare the reference gear description below against each numbered candidate description and determine how similar each candidate is to the reference.
+
+Reference description:
+{query}
+
+Candidate descriptions:
+{candidates}
+
+Score each candidate independently against the reference, using the analysis priorities, scoring guidelines and matching rules in your instructions.
+
+Return your analysis as a JSON array with one object per candidate:
+[
+  {{"index": 0, "similarity": 0.0}},
+  {{"index": 1, "similarity": 0.0}}
+]
+
+Important: Return ONLY the JSON, no additional text or markdown formatting.
+"""
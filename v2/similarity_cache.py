@@ -0,0 +1,104 @@
+"""
+Persistent cache of outfit comparison scores.
+
+Scores are keyed by model and the content of both descriptions (in either
+order), so re-running the organizer, e.g. to tune the confidence threshold,
+skips comparisons that were already made.
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Optional
+
+from json_cache import JsonlCache
+
+
+# Cache file path (JSON lines, one appended per new score)
+SIMILARITY_CACHE_FILE = ".outfit_similarity_cache.jsonl"
+LEGACY_SIMILARITY_CACHE_FILE = ".outfit_similarity_cache.json"
+
+# New scores stored before they are appended to the cache file
+SAVE_EVERY = 50
+
+_cache = JsonlCache(SIMILARITY_CACHE_FILE, save_every=SAVE_EVERY, legacy_path=LEGACY_SIMILARITY_CACHE_FILE)
+_enabled = True
+
+
+def disable_cache() -> None:
+    """
+    Turn the cache off for this process: lookups miss and nothing is stored.
+    """
+    global _enabled
+    _enabled = False
+
+
+@lru_cache(maxsize=4096)
+def _description_digest(description: str) -> bytes:
+    """
+    Hash a description; memoized because the same cluster and database
+    descriptions appear in many comparisons.
+
+    Args:
+        description: Outfit description text
+
+    Returns:
+        SHA-256 digest bytes
+    """
+    return hashlib.sha256(description.encode('utf-8')).digest()
+
+
+def make_key(model: str, description1: str, description2: str) -> str:
+    """
+    Build an order-independent cache key for a description pair.
+
+    Args:
+        model: Model identifier that produced the score
+        description1: First outfit description
+        description2: Second outfit description
+
+    Returns:
+        Hex digest identifying (model, {description1, description2})
+    """
+    low, high = sorted((_description_digest(description1), _description_digest(description2)))
+    return hashlib.sha256(model.encode('utf-8') + b'|' + low + b'|' + high).hexdigest()
+
+
+def save_cache() -> None:
+    """
+    Write the similarity cache to disk if it has new entries.
+    """
+    _cache.save()
+
+
+def get_similarity(model: str, description1: str, description2: str) -> Optional[float]:
+    """
+    Look up a cached similarity score.
+
+    Args:
+        model: Model identifier
+        description1: First outfit description
+        description2: Second outfit description
+
+    Returns:
+        Cached score, or None if the pair has not been scored
+    """
+    if not _enabled:
+        return None
+    return _cache.get(make_key(model, description1, description2))
+
+
+def set_similarity(model: str, description1: str, description2: str, score: float) -> None:
+    """
+    Store a similarity score; new scores are appended to the cache file
+    every SAVE_EVERY scores and on exit.
+
+    Args:
+        model: Model identifier
+        description1: First outfit description
+        description2: Second outfit description
+        score: Similarity score from 0.0 to 1.0
+    """
+    if not _enabled:
+        return
+
+    _cache.set(make_key(model, description1, description2), score)
@@ -8,16 +8,21 @@ and basic organization workflows.
 import pytest
 import os
 from pathlib import Path
-from unittest.mock import Mock, patch
 
 from v2.config import load_config, validate_config
-from v2.image_utils import load_image, prepare_image_for_api, encode_image_base64, is_supported_image
+from v2.image_utils import (
+    load_image, prepare_image_for_api, encode_image_base64, is_supported_image, FILE_SAMPLE_BYTES
+)
 from v2.vertex_claude import get_client, extract_json
 from v2.database import load_database, add_person, list_people, get_person
+import v2.organizer as organizer
 from v2.organizer import (
     scan_directory_for_images,
     sanitize_directory_name,
-    should_skip_file
+    should_skip_file,
+    group_similar_images,
+    group_identical_files,
+    _BKTree
 )
 
 
@@ -135,23 +140,27 @@ class TestDatabase:
         assert isinstance(people, list)
 
 
+@pytest.fixture(scope="session")
+def scan_fixture_dir(tmp_path_factory):
+    """Directory of dummy files shared (read-only) by the scan tests."""
+    test_dir = tmp_path_factory.mktemp("test_photos")
+
+    # Create dummy image files
+    (test_dir / "photo1.jpg").touch()
+    (test_dir / "photo2.png").touch()
+    (test_dir / "document.pdf").touch()
+    (test_dir / ".hidden.jpg").touch()
+
+    return test_dir
+
+
 class TestOrganizer:
     """Test organization logic."""
 
-    def test_scan_directory_for_images(self, tmp_path):
+    def test_scan_directory_for_images(self, scan_fixture_dir):
         """Test directory scanning."""
-        # Create test directory with files
-        test_dir = tmp_path / "test_photos"
-        test_dir.mkdir()
-
-        # Create dummy image files
-        (test_dir / "photo1.jpg").touch()
-        (test_dir / "photo2.png").touch()
-        (test_dir / "document.pdf").touch()
-        (test_dir / ".hidden.jpg").touch()
-
         # Scan directory
-        images = scan_directory_for_images(str(test_dir))
+        images = scan_directory_for_images(str(scan_fixture_dir))
 
         # Should find only visible image files
         assert len(images) == 2
@@ -165,6 +174,87 @@ class TestOrganizer:
         with pytest.raises(FileNotFoundError):
             scan_directory_for_images("/nonexistent/path")
 
+    def test_scan_skips_unreadable_directory(self, tmp_path, monkeypatch):
+        """Test an unreadable subdirectory does not abort the scan."""
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / "x.jpg").touch()
+        (tmp_path / "b").mkdir()
+
+        scandir = os.scandir
+
+        def fake_scandir(path):
+            if os.path.basename(path) == "b":
+                raise PermissionError(13, "Permission denied", path)
+            return scandir(path)
+
+        monkeypatch.setattr(organizer.os, "scandir", fake_scandir)
+
+        images = scan_directory_for_images(str(tmp_path))
+
+        assert images == [str(tmp_path / "a" / "x.jpg")]
+
+    def test_bktree_query(self):
+        """Test BK-tree radius queries under Hamming distance."""
+        tree = _BKTree()
+        assert tree.query(0b0, 64) == []
+
+        for index, value in enumerate([0b0000, 0b0001, 0b0011, 0b1111, 0b0001]):
+            tree.add(value, index)
+
+        assert sorted(tree.query(0b0000, 0)) == [0]
+        assert sorted(tree.query(0b0000, 1)) == [0, 1, 4]
+        assert sorted(tree.query(0b0000, 2)) == [0, 1, 2, 4]
+        assert sorted(tree.query(0b1111, 1)) == [3]
+        assert sorted(tree.query(0b0111, 4)) == [0, 1, 2, 3, 4]
+
+    def test_group_similar_images_does_not_chain(self, monkeypatch):
+        """Test near-duplicates are grouped against representatives only."""
+        hashes = {
+            'a.jpg': 0b000000,
+            'b.jpg': 0b000111,  # 3 bits from a
+            'c.jpg': 0b111111,  # 3 bits from b, 6 from a
+            'd.jpg': 0b111110,  # 1 bit from c
+            'e.jpg': None,      # unreadable
+        }
+        monkeypatch.setattr(organizer, '_hash_image_or_none', hashes.get)
+
+        groups = group_similar_images(list(hashes), 4, workers=1)
+
+        assert groups == {
+            'a.jpg': 'a.jpg',
+            'b.jpg': 'a.jpg',
+            'c.jpg': 'c.jpg',
+            'd.jpg': 'c.jpg',
+            'e.jpg': 'e.jpg',
+        }
+
+    def test_group_similar_images_closest_representative(self, monkeypatch):
+        """Test an image joins the closest representative in range."""
+        hashes = {
+            'a.jpg': 0b00000000,
+            'b.jpg': 0b11110000,  # 4 bits from a: new group at distance 3
+            'c.jpg': 0b11100000,  # 3 bits from a, 1 from b
+        }
+        monkeypatch.setattr(organizer, '_hash_image_or_none', hashes.get)
+
+        groups = group_similar_images(list(hashes), 3, workers=1)
+
+        assert groups == {'a.jpg': 'a.jpg', 'b.jpg': 'b.jpg', 'c.jpg': 'b.jpg'}
+
+    def test_group_identical_files_confirms_full_content(self, tmp_path):
+        """Test files that differ only between the sampled ends are not grouped."""
+        head = b'h' * FILE_SAMPLE_BYTES
+        tail = b't' * FILE_SAMPLE_BYTES
+        paths = []
+        for name, middle in [('a.jpg', b'1'), ('b.jpg', b'2'), ('c.jpg', b'1')]:
+            path = tmp_path / name
+            path.write_bytes(head + middle + tail)
+            paths.append(str(path))
+
+        groups = group_identical_files(paths, workers=1)
+
+        assert groups == {paths[0]: paths[0], paths[1]: paths[1], paths[2]: paths[0]}
+
 
 # Integration tests (optional - require actual API access)
 class TestIntegration:
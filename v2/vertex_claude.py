@@ -6,35 +6,113 @@ Provides functions for facial recognition tasks using Claude models on GCP.
 
 import json
 import re
-from anthropic import AnthropicVertex
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# Prefer the faster orjson parser for model replies when available
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 from v2.config import load_config
-from v2.image_utils import load_image, prepare_image_for_api, encode_image_base64
+from v2.similarity_cache import get_similarity, set_similarity
+from v2.image_utils import prepare_image_for_api_by_path, encode_image_base64
 from v2.prompts import (
     OUTFIT_DESCRIPTION_PROMPT,
+    OUTFIT_DESCRIPTION_REQUEST,
     DETECT_OUTFITS_PROMPT,
-    COMPARE_OUTFITS_PROMPT
+    DETECT_OUTFITS_REQUEST,
+    DETECT_AND_MATCH_OUTFITS_REQUEST,
+    COMPARE_OUTFITS_SYSTEM_PROMPT,
+    COMPARE_OUTFITS_PROMPT,
+    COMPARE_OUTFITS_BATCH_PROMPT
 )
 
 
+# Vertex AI text embedding model used to rank outfit descriptions
+TEXT_EMBEDDING_MODEL = "text-embedding-004"
+
+# Texts per embedding request
+EMBEDDING_BATCH_SIZE = 100
+
+# Candidate descriptions scored per compare_outfits_batch request
+COMPARE_BATCH_SIZE = 50
+
+# compare_outfits_batch requests sent concurrently when there is no early
+# stop (with stop_at, batches are sent one at a time)
+COMPARE_WORKERS = 4
+
+# Markdown code fence around a JSON reply
+_FENCE_RE = re.compile(r'```(?:json)?\s*\n?(.*?)\n?```', re.DOTALL)
+
+# Last-resort match for a flat or once-nested JSON object or array
+_LOOSE_JSON_RE = re.compile(r'(\{[^{}]*\{[^{}]*\}[^{}]*\}|\{[^{}]+\}|\[[^\[\]]+\])', re.DOTALL)
+
+# Fallback for comparison replies that are not valid JSON: the number just
+# after the word "similarity", searched in a short window only
+_SIMILARITY_RE = re.compile(r'"?\s*[:=]?\s*(?:of\s+|is\s+)?([0-9]*\.?[0-9]+)')
+_SIMILARITY_WINDOW = 32
+
+# Parses the first JSON value at a given offset, ignoring trailing text
+_json_decoder = json.JSONDecoder()
+
+_embedding_model = None
+
+
+@lru_cache(maxsize=1)
 def get_client():
     """
     Initialize AnthropicVertex client from configuration.
 
+    The client is created once per process and shared by all requests (it
+    is thread-safe), so its HTTP connections and credentials are reused.
+    Rate-limited (429), overloaded and server-error responses and
+    connection failures are retried up to API_MAX_RETRIES times, with
+    exponential backoff and jitter that honours Retry-After headers, before
+    the request fails.
+
     Returns:
         AnthropicVertex: Configured client instance
 
     Raises:
         ValueError: If configuration is invalid
     """
+    # Imported here: the SDK takes most of this package's import time, and
+    # commands such as --help or --undo never make a request
+    from anthropic import AnthropicVertex
+
     config = load_config()
     return AnthropicVertex(
         project_id=config['project_id'],
-        region=config['region']
+        region=config['region'],
+        max_retries=config['max_retries']
     )
 
 
-def analyze_image(image_path, prompt, max_tokens=2048):
+def _cached_system_prompt(text):
+    """
+    Build a system prompt marked for prompt caching.
+
+    The text must be identical across calls; requests sharing it then reuse
+    the cached prefix instead of paying for it again. Prefixes shorter than
+    the model's minimum cacheable length (1024 tokens for Sonnet and Opus)
+    are processed normally, without caching.
+
+    Args:
+        text: Static system prompt text
+
+    Returns:
+        list: System content blocks for messages.create
+    """
+    return [{
+        "type": "text",
+        "text": text,
+        "cache_control": {"type": "ephemeral"}
+    }]
+
+
+def analyze_image(image_path, prompt, max_tokens=2048, image_bytes=None, system_prompt=None):
     """
     Send an image with a prompt to Claude and return the response.
 
@@ -42,6 +120,9 @@ def analyze_image(image_path, prompt, max_tokens=2048):
         image_path: Path to image file
         prompt: Text prompt for analysis
         max_tokens: Maximum tokens in response (default: 2048)
+        image_bytes: Image already prepared with prepare_image_for_api
+                     (default: prepare image_path with prepare_image_for_api_by_path)
+        system_prompt: Static instructions sent as a cached system prompt (optional)
 
     Returns:
         str: Claude's text response
@@ -52,15 +133,21 @@ def analyze_image(image_path, prompt, max_tokens=2048):
     client = get_client()
     config = load_config()
 
-    # Load and prepare image
-    image = load_image(image_path)
-    image_bytes = prepare_image_for_api(image)
+    # Load and prepare image unless it was prepared ahead of time
+    if image_bytes is None:
+        image_bytes = prepare_image_for_api_by_path(image_path)
     image_b64 = encode_image_base64(image_bytes)
 
+    # Static instructions go first so they can be served from the prompt cache
+    extra = {}
+    if system_prompt:
+        extra['system'] = _cached_system_prompt(system_prompt)
+
     # Call Claude API
     response = client.messages.create(
         model=config['model'],
         max_tokens=max_tokens,
+        **extra,
         messages=[{
             "role": "user",
             "content": [
@@ -95,15 +182,16 @@ def generate_outfit_description(image_path):
     Returns:
         str: Detailed outfit and clothing description
     """
-    return analyze_image(image_path, OUTFIT_DESCRIPTION_PROMPT)
+    return analyze_image(image_path, OUTFIT_DESCRIPTION_REQUEST, system_prompt=OUTFIT_DESCRIPTION_PROMPT)
 
 
-def detect_outfits(image_path):
+def detect_outfits(image_path, image_bytes=None):
     """
     Detect all people in an image and return their outfit descriptions.
 
     Args:
         image_path: Path to image file
+        image_bytes: Image already prepared with prepare_image_for_api (optional)
 
     Returns:
         list: List of dicts with 'position', 'outfit_description', 'primary_colors', etc.
@@ -113,7 +201,8 @@ def detect_outfits(image_path):
         Exception: If API call fails or JSON parsing fails
     """
     try:
-        response_text = analyze_image(image_path, DETECT_OUTFITS_PROMPT)
+        response_text = analyze_image(image_path, DETECT_OUTFITS_REQUEST, image_bytes=image_bytes,
+                                      system_prompt=DETECT_OUTFITS_PROMPT)
         result = extract_json(response_text)
 
         # Handle both formats: {"outfits": [...]} or [...]
@@ -130,17 +219,111 @@ def detect_outfits(image_path):
         return []
 
 
+def detect_and_match_outfits(image_path, outfit_db, image_bytes=None):
+    """
+    Detect all people in an image and match them against known outfits in
+    a single request.
+
+    The known outfit descriptions are sent inline, so this suits small
+    databases; each detected outfit needs no separate comparison call.
+
+    Args:
+        image_path: Path to image file
+        outfit_db: Dictionary mapping outfit names to outfit descriptions
+        image_bytes: Image already prepared with prepare_image_for_api (optional)
+
+    Returns:
+        list: Detected outfit dicts as from detect_outfits, each with 'match'
+              (known outfit name or None) and 'confidence' (0.0 to 1.0),
+              or empty list if no people detected
+    """
+    names = list(outfit_db)
+    prompt = DETECT_AND_MATCH_OUTFITS_REQUEST.format(
+        known_outfits="\n\n".join(f"[{i}] {outfit_db[name]}" for i, name in enumerate(names))
+    )
+
+    try:
+        response_text = analyze_image(image_path, prompt, image_bytes=image_bytes,
+                                      system_prompt=DETECT_OUTFITS_PROMPT)
+        result = extract_json(response_text)
+
+        # Handle both formats: {"outfits": [...]} or [...]
+        if isinstance(result, dict) and 'outfits' in result:
+            outfits = result['outfits']
+        elif isinstance(result, list):
+            outfits = result
+        else:
+            print(f"Warning: Unexpected response format for {image_path}")
+            return []
+
+        for outfit in outfits:
+            try:
+                index = int(outfit.get('match'))
+            except (TypeError, ValueError):
+                index = -1
+            outfit['match'] = names[index] if 0 <= index < len(names) else None
+            outfit['confidence'] = float(outfit.get('confidence') or 0.0) if outfit['match'] else 0.0
+        return outfits
+
+    except Exception as e:
+        print(f"Warning: Error detecting outfits in {image_path}: {e}")
+        return []
+
+
 def compare_outfits(description1, description2, debug=False):
     """
     Compare two outfit descriptions and return similarity score.
 
+    Scores are cached on disk (v2.similarity_cache), so a pair already
+    compared in either order, in this or an earlier run, skips the API.
+    Identical descriptions score 1.0 and empty ones 0.0 without a request.
+
+    Args:
+        description1: First outfit description
+        description2: Second outfit description
+        debug: If True, print detailed debug info
+
+    Returns:
+        float: Similarity score between 0.0 and 1.0 (returns 0.0 on any error;
+               failed comparisons are not cached)
+    """
+    # Trivial pairs need no request
+    if not description1 or not description2:
+        return 0.0
+    if description1 == description2:
+        return 1.0
+
+    try:
+        model = load_config()['model']
+    except ValueError:
+        return 0.0
+
+    cached = get_similarity(model, description1, description2)
+    if cached is not None:
+        if debug:
+            print(f"Cached similarity: {cached}")
+        return cached
+
+    score = _compare_outfits_uncached(description1, description2, debug)
+    if score is None:
+        return 0.0
+
+    set_similarity(model, description1, description2, score)
+    return score
+
+
+def _compare_outfits_uncached(description1, description2, debug=False):
+    """
+    Ask Claude for the similarity of two outfit descriptions (no caching).
+
     Args:
         description1: First outfit description
         description2: Second outfit description
         debug: If True, print detailed debug info
 
     Returns:
-        float: Similarity score between 0.0 and 1.0 (returns 0.0 on any error)
+        float: Similarity score between 0.0 and 1.0, or None if the request
+               failed or no score could be parsed from the reply
     """
     response_text = None
     try:
@@ -155,6 +338,7 @@ def compare_outfits(description1, description2, debug=False):
         response = client.messages.create(
             model=config['model'],
             max_tokens=1024,
+            system=_cached_system_prompt(COMPARE_OUTFITS_SYSTEM_PROMPT),
             messages=[{
                 "role": "user",
                 "content": prompt
@@ -174,7 +358,7 @@ def compare_outfits(description1, description2, debug=False):
             print(f"Traceback:")
             traceback.print_exc()
             print(f"{'='*70}\n")
-        return 0.0
+        return None
 
     # Always show debug output if requested, even if parsing fails
     if debug:
@@ -187,86 +371,244 @@ def compare_outfits(description1, description2, debug=False):
         print(response_text)
         print(f"{'='*70}\n")
 
-    # Try to extract JSON with multiple strategies
-    try:
-        # Strategy 1: Direct JSON load
+    # Fast path: the prompt asks for a bare JSON object, which parses in one call
+    text = response_text.strip()
+    if text.startswith('{'):
         try:
-            result = json.loads(response_text.strip())
+            result = json_loads(text)
             if isinstance(result, dict) and 'similarity' in result:
                 score = float(result['similarity'])
                 if debug:
                     print(f"✓ Strategy 1 (direct JSON): {score}")
                 return score
-        except:
+        except (ValueError, TypeError):
             pass
 
-        # Strategy 2: Extract from code block
-        for pattern in [r'```json\s*\n?(.*?)\n?```', r'```\s*\n?(.*?)\n?```']:
-            match = re.search(pattern, response_text, re.DOTALL)
-            if match:
-                try:
-                    result = json.loads(match.group(1).strip())
-                    if isinstance(result, dict) and 'similarity' in result:
-                        score = float(result['similarity'])
-                        if debug:
-                            print(f"✓ Strategy 2 (code block): {score}")
-                        return score
-                except:
-                    pass
+    return _parse_similarity_fallback(response_text, debug)
 
-        # Strategy 3: Find JSON object with balanced braces
-        brace_count = 0
-        start_idx = response_text.find('{')
-        if start_idx != -1:
-            for i in range(start_idx, len(response_text)):
-                if response_text[i] == '{':
-                    brace_count += 1
-                elif response_text[i] == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        try:
-                            result = json.loads(response_text[start_idx:i+1])
-                            if isinstance(result, dict) and 'similarity' in result:
-                                score = float(result['similarity'])
-                                if debug:
-                                    print(f"✓ Strategy 3 (balanced braces): {score}")
-                                return score
-                        except:
-                            break
-
-        # Strategy 4: Search for "similarity": X.XX pattern
-        sim_match = re.search(r'"similarity":\s*([0-9.]+)', response_text)
-        if sim_match:
+
+def _parse_similarity_fallback(response_text, debug=False):
+    """
+    Extract a similarity score from a comparison reply that is not a bare
+    JSON object, trying progressively looser strategies.
+
+    Args:
+        response_text: Raw reply text
+        debug: If True, print which strategy succeeded
+
+    Returns:
+        float: Similarity score (None if no strategy finds one)
+    """
+    text = response_text.strip()
+
+    # Try to extract JSON with multiple strategies
+    try:
+        # Strategy 2: Extract from code block
+        match = _FENCE_RE.search(text) if '```' in text else None
+        if match:
             try:
-                score = float(sim_match.group(1))
-                if 0.0 <= score <= 1.0:
+                result = json_loads(match.group(1).strip())
+                if isinstance(result, dict) and 'similarity' in result:
+                    score = float(result['similarity'])
                     if debug:
-                        print(f"✓ Strategy 4 (similarity regex): {score}")
+                        print(f"✓ Strategy 2 (code block): {score}")
                     return score
-            except:
+            except (ValueError, TypeError):
                 pass
 
-        # Strategy 5: Any decimal number between 0 and 1
-        number_match = re.search(r'\b(0?\.\d+|1\.0+|0)\b', response_text)
-        if number_match:
+        # Strategy 3: First complete JSON object, ignoring surrounding text
+        start_idx = response_text.find('{')
+        if start_idx != -1:
             try:
-                score = float(number_match.group(1))
-                if 0.0 <= score <= 1.0:
+                result = _json_decoder.raw_decode(response_text, start_idx)[0]
+                if isinstance(result, dict) and 'similarity' in result:
+                    score = float(result['similarity'])
                     if debug:
-                        print(f"✓ Strategy 5 (any number): {score}")
+                        print(f"✓ Strategy 3 (first JSON object): {score}")
                     return score
-            except:
+            except (ValueError, TypeError):
                 pass
 
+        # Strategy 4: Number right after the word "similarity"
+        sim_idx = text.find('similarity')
+        if sim_idx != -1:
+            start = sim_idx + len('similarity')
+            sim_match = _SIMILARITY_RE.match(text[start:start + _SIMILARITY_WINDOW])
+            if sim_match:
+                try:
+                    score = float(sim_match.group(1))
+                    if 0.0 <= score <= 1.0:
+                        if debug:
+                            print(f"✓ Strategy 4 (similarity value): {score}")
+                        return score
+                except (ValueError, TypeError):
+                    pass
+
+        # Strategy 5: The reply is just a number
+        try:
+            score = float(text)
+            if 0.0 <= score <= 1.0:
+                if debug:
+                    print(f"✓ Strategy 5 (bare number): {score}")
+                return score
+        except ValueError:
+            pass
+
         # All strategies failed
         if debug:
-            print("✗ All extraction strategies failed, returning 0.0")
-        return 0.0
+            print("✗ All extraction strategies failed")
+        return None
 
     except Exception as e:
         if debug:
             print(f"✗ Exception during extraction: {e}")
-        return 0.0
+        return None
+
+
+def compare_outfits_batch(query, candidates, debug=False, stop_at=None):
+    """
+    Compare one outfit description against several candidates in one request.
+
+    Candidates are sent COMPARE_BATCH_SIZE at a time, so N candidates take
+    N / COMPARE_BATCH_SIZE round-trips instead of N; without stop_at, up to
+    COMPARE_WORKERS of them run concurrently. Pairs already in the
+    similarity cache, empty descriptions (0.0) and candidates identical to
+    the query (1.0) are not sent.
+
+    Args:
+        query: Outfit description to match
+        candidates: List of outfit descriptions to score against the query
+        debug: If True, print the raw responses
+        stop_at: Optional score; once any candidate reaches it, the remaining
+                 batches are not sent and their candidates score 0.0
+
+    Returns:
+        list: Similarity score between 0.0 and 1.0 per candidate, in order
+              (0.0 for candidates missing from a response or on any error;
+              those are not cached)
+    """
+    scores = [0.0] * len(candidates)
+
+    try:
+        model = load_config()['model']
+    except ValueError:
+        return scores
+
+    # Only candidates without a cached score go to the API; empty and
+    # identical descriptions are scored without one
+    uncached = []
+    for i, candidate in enumerate(candidates):
+        if not query or not candidate:
+            continue
+        if candidate == query:
+            scores[i] = 1.0
+            continue
+        cached = get_similarity(model, query, candidate)
+        if cached is None:
+            # Stays None unless a reply scores it
+            scores[i] = None
+            uncached.append(i)
+        else:
+            scores[i] = cached
+
+    batches = [uncached[start:start + COMPARE_BATCH_SIZE] for start in range(0, len(uncached), COMPARE_BATCH_SIZE)]
+    if not batches:
+        return scores
+
+    def score_batch(positions):
+        batch = [candidates[i] for i in positions]
+        prompt = COMPARE_OUTFITS_BATCH_PROMPT.format(
+            query=query,
+            candidates="\n\n".join(f"[{i}] {description}" for i, description in enumerate(batch))
+        )
+
+        try:
+            response = get_client().messages.create(
+                model=model,
+                max_tokens=256 + 32 * len(batch),
+                system=_cached_system_prompt(COMPARE_OUTFITS_SYSTEM_PROMPT),
+                messages=[{
+                    "role": "user",
+                    "content": prompt
+                }]
+            )
+            response_text = response.content[0].text
+
+            if debug:
+                print(f"\nBatch comparison response ({len(response_text)} chars):")
+                print(response_text)
+
+            result = extract_json(response_text)
+            if isinstance(result, dict):
+                result = result.get('scores', [])
+
+            for item in result:
+                index = int(item.get('index', -1))
+                if 0 <= index < len(batch) and item.get('similarity') is not None:
+                    score = float(item['similarity'])
+                    scores[positions[index]] = score
+                    set_similarity(model, query, batch[index], score)
+
+        except Exception as e:
+            print(f"Warning: Batch outfit comparison failed: {e}")
+
+    if stop_at is not None or len(batches) == 1:
+        for positions in batches:
+            if stop_at is not None and max((s for s in scores if s is not None), default=0.0) >= stop_at:
+                break
+            score_batch(positions)
+    else:
+        # Batches write to disjoint positions of scores
+        with ThreadPoolExecutor(max_workers=COMPARE_WORKERS) as executor:
+            list(executor.map(score_batch, batches))
+
+    # Candidates no reply scored (failed or skipped batches) count as no match
+    return [0.0 if score is None else score for score in scores]
+
+
+def get_embedding_model():
+    """
+    Initialize the Vertex AI text embedding model (once per process).
+
+    Returns:
+        TextEmbeddingModel: Embedding model in the configured project/region
+
+    Raises:
+        ImportError: If google-cloud-aiplatform is not installed
+    """
+    global _embedding_model
+
+    if _embedding_model is None:
+        import vertexai
+        from vertexai.language_models import TextEmbeddingModel
+
+        config = load_config()
+        vertexai.init(project=config['project_id'], location=config['region'])
+        _embedding_model = TextEmbeddingModel.from_pretrained(TEXT_EMBEDDING_MODEL)
+
+    return _embedding_model
+
+
+def embed_outfit_descriptions(descriptions):
+    """
+    Embed outfit descriptions with the Vertex AI text embedding model.
+
+    Args:
+        descriptions: List of outfit description strings
+
+    Returns:
+        list: One embedding vector (list of floats) per description
+
+    Raises:
+        ImportError: If google-cloud-aiplatform is not installed
+        Exception: If an API call fails
+    """
+    model = get_embedding_model()
+    vectors = []
+    for start in range(0, len(descriptions), EMBEDDING_BATCH_SIZE):
+        embeddings = model.get_embeddings(descriptions[start:start + EMBEDDING_BATCH_SIZE])
+        vectors.extend(list(embedding.values) for embedding in embeddings)
+    return vectors
 
 
 def extract_json(text):
@@ -285,12 +627,8 @@ def extract_json(text):
     original_text = text
 
     # Remove markdown code blocks if present
-    if "```json" in text:
-        match = re.search(r'```json\s*\n?(.*?)\n?```', text, re.DOTALL)
-        if match:
-            text = match.group(1)
-    elif "```" in text:
-        match = re.search(r'```\s*\n?(.*?)\n?```', text, re.DOTALL)
+    if "```" in text:
+        match = _FENCE_RE.search(text)
         if match:
             text = match.group(1)
 
@@ -299,48 +637,27 @@ def extract_json(text):
 
     # Try to parse directly
     try:
-        return json.loads(text)
-    except json.JSONDecodeError as e:
+        return json_loads(text)
+    except ValueError as e:
         # Try multiple strategies to extract JSON
 
-        # Strategy 1: Find complete JSON object with balanced braces
-        brace_count = 0
-        start_idx = text.find('{')
-        if start_idx != -1:
-            for i in range(start_idx, len(text)):
-                if text[i] == '{':
-                    brace_count += 1
-                elif text[i] == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        try:
-                            return json.loads(text[start_idx:i+1])
-                        except json.JSONDecodeError:
-                            break
-
-        # Strategy 2: Find complete JSON array with balanced brackets
-        bracket_count = 0
-        start_idx = text.find('[')
-        if start_idx != -1:
-            for i in range(start_idx, len(text)):
-                if text[i] == '[':
-                    bracket_count += 1
-                elif text[i] == ']':
-                    bracket_count -= 1
-                    if bracket_count == 0:
-                        try:
-                            return json.loads(text[start_idx:i+1])
-                        except json.JSONDecodeError:
-                            break
-
-        # Strategy 3: Simple regex (last resort)
-        json_match = re.search(r'(\{[^{}]*\{[^{}]*\}[^{}]*\}|\{[^{}]+\}|\[[^\[\]]+\])', text, re.DOTALL)
-        if json_match:
+        # Strategy 1: First complete JSON object or array (whichever starts
+        # first), ignoring any surrounding text
+        starts = sorted(idx for idx in (text.find('{'), text.find('[')) if idx != -1)
+        for start_idx in starts:
             try:
-                return json.loads(json_match.group(1))
+                return _json_decoder.raw_decode(text, start_idx)[0]
             except json.JSONDecodeError:
                 pass
 
+        # Strategy 2: Simple regex (last resort)
+        json_match = _LOOSE_JSON_RE.search(text)
+        if json_match:
+            try:
+                return json_loads(json_match.group(1))
+            except ValueError:
+                pass
+
         # If all else fails, provide more helpful error with full text
         print(f"\n=== JSON PARSING ERROR ===")
         print(f"Original response: {original_text[:500]}")
@@ -3,11 +3,23 @@ Vision client wrapper that automatically selects Claude or Gemini based on confi
 Provides a unified interface for face detection and analysis.
 """
 
+import importlib
 import os
+from types import ModuleType
+from typing import List, Optional, Tuple, Union
+
 from dotenv import load_dotenv
 
+from similarity_cache import get_similarity, set_similarity, save_cache
+
 load_dotenv()
 
+# Configured provider, read once: the environment does not change mid-run
+_PROVIDER = os.getenv('AI_PROVIDER', 'gemini').lower()
+
+# Client module of the configured provider, imported on first use
+_provider_impl: Optional[ModuleType] = None
+
 
 def get_provider() -> str:
     """
@@ -16,7 +28,24 @@ def get_provider() -> str:
     Returns:
         Provider name: 'claude' or 'gemini'
     """
-    return os.getenv('AI_PROVIDER', 'gemini').lower()
+    return _PROVIDER
+
+
+def _provider_module() -> ModuleType:
+    """
+    Get the client module of the configured provider.
+
+    The module is imported on first use (so importing this module does not
+    load a provider SDK) and reused afterwards.
+
+    Returns:
+        gemini_client or claude_client module
+    """
+    global _provider_impl
+
+    if _provider_impl is None:
+        _provider_impl = importlib.import_module('gemini_client' if _PROVIDER == 'gemini' else 'claude_client')
+    return _provider_impl
 
 
 def generate_facial_description(image_path: str) -> str:
@@ -30,14 +59,7 @@ def generate_facial_description(image_path: str) -> str:
     Returns:
         Detailed facial description text
     """
-    provider = get_provider()
-
-    if provider == 'gemini':
-        from gemini_client import generate_facial_description as gemini_gen
-        return gemini_gen(image_path)
-    else:
-        from claude_client import generate_facial_description as claude_gen
-        return claude_gen(image_path)
+    return _provider_module().generate_facial_description(image_path)
 
 
 def detect_and_describe_all_faces(image_path: str) -> str:
@@ -51,20 +73,57 @@ def detect_and_describe_all_faces(image_path: str) -> str:
     Returns:
         Description of all detected faces
     """
-    provider = get_provider()
+    return _provider_module().detect_and_describe_all_faces(image_path)
+
+
+def detect_and_describe_all_faces_batch(image_paths: List[str]) -> List[Optional[str]]:
+    """
+    Detect and describe faces in several images with a single request.
+    Automatically uses configured provider (Claude or Gemini).
+
+    Args:
+        image_paths: Paths to image files
+
+    Returns:
+        Per-image detection responses in input order; None for images the
+        reply did not cover
+    """
+    return _provider_module().detect_and_describe_all_faces_batch(image_paths)
+
+
+def detect_and_describe_all_faces_concurrently(
+    image_paths: List[str],
+    max_concurrency: int
+) -> List[Union[str, Exception]]:
+    """
+    Detect and describe faces in many images with concurrent async requests.
+    Automatically uses configured provider (Claude or Gemini).
+
+    Args:
+        image_paths: Paths to image files
+        max_concurrency: Maximum number of in-flight API requests
+
+    Returns:
+        List of detection responses (or the raised exception) in input order
+    """
+    return _provider_module().detect_and_describe_all_faces_concurrently(image_paths, max_concurrency)
+
 
-    if provider == 'gemini':
-        from gemini_client import detect_and_describe_all_faces as gemini_detect
-        return gemini_detect(image_path)
-    else:
-        from claude_client import detect_and_describe_all_faces as claude_detect
-        return claude_detect(image_path)
+def get_model_name() -> str:
+    """
+    Get the model identifier used by the configured provider.
+
+    Returns:
+        Model identifier string
+    """
+    return _provider_module().get_model_name()
 
 
 def compare_face_descriptions(description1: str, description2: str) -> float:
     """
     Compare two facial descriptions and return similarity score.
     Automatically uses configured provider (Claude or Gemini).
+    Scores are cached on disk, so a pair is only sent to the API once.
 
     Args:
         description1: First facial description
@@ -73,11 +132,46 @@ def compare_face_descriptions(description1: str, description2: str) -> float:
     Returns:
         Similarity score from 0.0 to 1.0
     """
-    provider = get_provider()
+    model = get_model_name()
+    cached = get_similarity(model, description1, description2)
+    if cached is not None:
+        return cached
+
+    score = _provider_module().compare_face_descriptions(description1, description2)
+    if score is None:
+        # Failed request: not cached, scored as no match
+        return 0.0
+
+    set_similarity(model, description1, description2, score)
+    return score
 
-    if provider == 'gemini':
-        from gemini_client import compare_face_descriptions as gemini_compare
-        return gemini_compare(description1, description2)
-    else:
-        from claude_client import compare_face_descriptions as claude_compare
-        return claude_compare(description1, description2)
+
+def compare_face_descriptions_batch(pairs: List[Tuple[str, str]]) -> List[float]:
+    """
+    Compare many pairs of facial descriptions in as few requests as possible.
+    Automatically uses configured provider (Claude or Gemini).
+    Only pairs missing from the similarity cache are sent to the API.
+
+    Args:
+        pairs: List of (description1, description2) tuples
+
+    Returns:
+        Similarity scores from 0.0 to 1.0, in the same order as pairs
+    """
+    model = get_model_name()
+    scores = [get_similarity(model, d1, d2) for d1, d2 in pairs]
+    missing = [i for i, score in enumerate(scores) if score is None]
+
+    if missing:
+        fresh = _provider_module().compare_face_descriptions_batch([pairs[i] for i in missing])
+
+        for i, score in zip(missing, fresh):
+            if score is None:
+                # Failed request: not cached, scored as no match
+                scores[i] = 0.0
+            else:
+                scores[i] = score
+                set_similarity(model, pairs[i][0], pairs[i][1], score)
+        save_cache()
+
+    return scores
@@ -0,0 +1,222 @@
+"""
+Prompts and reply parsing shared by the Claude and Gemini clients.
+"""
+
+import json
+import re
+from typing import List, Optional, Tuple
+
+# Prefer the faster orjson parser for model replies when available
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+# Markdown code fence around a JSON reply (closing fence optional)
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.S)
+
+FACIAL_DESCRIPTION_PROMPT = """Analyze this image and provide a detailed description of the person's facial features.
+
+Focus on permanent, distinctive characteristics:
+- Face shape (oval, round, square, heart-shaped, etc.)
+- Eye color, shape, and spacing
+- Eyebrow shape and thickness
+- Nose shape and size
+- Mouth and lip characteristics
+- Chin and jawline
+- Skin tone
+- Hair color, texture, and style (note this may change)
+- Distinctive features (dimples, freckles, scars, etc.)
+- Approximate age range
+- Any other notable facial characteristics
+
+Be specific and detailed. This description will be used to identify this person in other photos.
+If multiple people are in the image, describe only the most prominent person."""
+
+DETECT_FACES_PROMPT = """Analyze this image and identify all human faces present.
+
+For each face detected, provide:
+1. A brief description of their location in the image (e.g., "left side", "center", "background")
+2. Detailed facial features similar to a police description
+
+If no faces are detected, respond with "NO_FACES_DETECTED".
+
+Format your response as a JSON array:
+[
+  {
+    "position": "center of image",
+    "description": "detailed facial description..."
+  },
+  ...
+]
+
+If no faces found, return: {"faces": []}"""
+
+DETECT_FACES_BATCH_PROMPT = """The images above are numbered. Analyze each image separately and identify all human faces present in it.
+
+For each face detected, provide:
+1. A brief description of their location in the image (e.g., "left side", "center", "background")
+2. Detailed facial features similar to a police description
+
+Format your response as a JSON object with one entry per image, using the image numbers given above:
+{
+  "images": [
+    {
+      "image": 0,
+      "faces": [
+        {
+          "position": "center of image",
+          "description": "detailed facial description..."
+        }
+      ]
+    },
+    ...
+  ]
+}
+
+Use an empty "faces" list for images without faces."""
+
+
+def build_comparison_prompt(description1: str, description2: str) -> str:
+    """
+    Build a prompt asking whether two descriptions are the same person.
+
+    Args:
+        description1: First facial description
+        description2: Second facial description
+
+    Returns:
+        Prompt text requesting a JSON object with a similarity score
+    """
+    return f"""Compare these two facial descriptions and determine if they describe the same person.
+
+Description 1:
+{description1}
+
+Description 2:
+{description2}
+
+Analyze the permanent facial features (face shape, eye characteristics, nose, bone structure, etc.).
+Ignore temporary features like hair style, facial hair, or makeup unless they're very distinctive.
+
+Provide your response as a JSON object with:
+- "similarity": a number from 0.0 to 1.0 (0.0 = definitely different people, 1.0 = definitely same person)
+- "reasoning": brief explanation of your assessment
+
+Example: {{"similarity": 0.85, "reasoning": "Very similar face shape, eye color, and nose structure. Minor differences could be due to age or photo angle."}}"""
+
+
+def build_batch_comparison_prompt(pairs: List[Tuple[str, str]]) -> str:
+    """
+    Build a prompt asking for similarity scores of several description pairs.
+
+    Args:
+        pairs: List of (description1, description2) tuples
+
+    Returns:
+        Prompt text requesting a JSON array indexed by pair number
+    """
+    sections = []
+    for idx, (description1, description2) in enumerate(pairs):
+        sections.append(
+            f"Pair {idx}:\nDescription A:\n{description1}\n\nDescription B:\n{description2}"
+        )
+    pairs_text = "\n\n".join(sections)
+
+    return f"""For each numbered pair of facial descriptions below, determine if the two descriptions describe the same person.
+
+{pairs_text}
+
+Analyze the permanent facial features (face shape, eye characteristics, nose, bone structure, etc.).
+Ignore temporary features like hair style, facial hair, or makeup unless they're very distinctive.
+
+Provide your response as a JSON array with one object per pair:
+- "idx": the pair number
+- "similarity": a number from 0.0 to 1.0 (0.0 = definitely different people, 1.0 = definitely same person)
+
+Example: [{{"idx": 0, "similarity": 0.85}}, {{"idx": 1, "similarity": 0.1}}]"""
+
+
+def extract_json_text(result_text: str) -> str:
+    """
+    Strip a markdown code fence from a model reply, if present.
+
+    Args:
+        result_text: Raw model reply
+
+    Returns:
+        Text inside the first code fence, or the reply unchanged
+    """
+    match = _FENCE_RE.search(result_text)
+    if match:
+        return match.group(1).strip()
+    return result_text
+
+
+def parse_similarity(result_text: str) -> Optional[float]:
+    """
+    Parse a single comparison reply into its similarity score.
+
+    Args:
+        result_text: Raw model reply
+
+    Returns:
+        Similarity score from 0.0 to 1.0, or None if the reply has none
+
+    Raises:
+        ValueError: If the reply is not valid JSON
+    """
+    result = json_loads(extract_json_text(result_text))
+    similarity = result.get("similarity")
+    return float(similarity) if similarity is not None else None
+
+
+def parse_batch_scores(result_text: str, count: int) -> List[Optional[float]]:
+    """
+    Parse a batch comparison reply into scores ordered by pair index.
+
+    Args:
+        result_text: Raw model reply
+        count: Number of pairs in the request
+
+    Returns:
+        List of similarity scores; None for pairs missing from the reply
+
+    Raises:
+        ValueError: If the reply is not valid JSON
+    """
+    scores: List[Optional[float]] = [None] * count
+    for item in json_loads(extract_json_text(result_text)):
+        idx = int(item.get("idx", -1))
+        if 0 <= idx < count and item.get("similarity") is not None:
+            scores[idx] = float(item["similarity"])
+    return scores
+
+
+def split_batch_detection(result_text: str, count: int) -> List[Optional[str]]:
+    """
+    Split a multi-image detection reply into per-image responses.
+
+    Each per-image response is a JSON object with a "faces" list, the same
+    shape a single-image detection may return.
+
+    Args:
+        result_text: Raw model reply to DETECT_FACES_BATCH_PROMPT
+        count: Number of images in the request
+
+    Returns:
+        Per-image response text, None for images missing from the reply
+
+    Raises:
+        ValueError: If the reply is not valid JSON
+    """
+    result = json_loads(extract_json_text(result_text))
+    entries = result.get("images", []) if isinstance(result, dict) else result
+
+    responses: List[Optional[str]] = [None] * count
+    for entry in entries:
+        idx = int(entry.get("image", -1))
+        if 0 <= idx < count:
+            responses[idx] = json.dumps({"faces": entry.get("faces", [])})
+    return responses